@@ -0,0 +1,213 @@
+"""batch_clean.py
+
+Nettoie en parallèle tous les fichiers bruts de `data/raw/` (après un
+rafraîchissement nocturne par `batch_import.py`, ou après une modification
+des règles de `clean_data`).
+
+Chaque fichier passe par `clean_data.clean_file` dans un processus du pool :
+le nettoyage est surtout du calcul pandas, donc limité par le GIL dans des
+threads. Un fichier en échec n'interrompt pas le lot : l'erreur est notée
+dans le manifeste et les autres continuent. Les bruts dont le résultat en
+cache est à jour (`clean_cache`) sont servis sans être relus.
+
+Les gros fichiers partent en premier pour que le dernier worker ne finisse
+pas seul sur le plus long. Le manifeste `data/cleaned/manifest.json` donne,
+par fichier : statut, sortie, lignes lues / écrites, durée et pic de
+mémoire résidente du worker pendant ce fichier.
+
+Usage CLI :
+    python batch_clean.py                        # tout data/raw, un worker par cœur
+    python batch_clean.py --workers 4 --only data_18 data_34
+    python batch_clean.py --force --fmt feather  # ignore le cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+import workspace
+from payload import RAW_EXTS
+
+RAW_DIR = Path("data/raw")
+MANIFEST_PATH = Path("data/cleaned/manifest.json")
+DEFAULT_WORKERS = os.cpu_count() or 2
+
+# ─────────────────────────── Sources ────────────────────────────
+
+def discover_raw(raw_dir: str | Path = RAW_DIR) -> list[Path]:
+    """Fichiers bruts à nettoyer dans `raw_dir`, du plus gros au plus petit.
+
+    Les métadonnées StatCan extraites à l'import (`*_metadata.csv`), l'index
+    du magasin et les fichiers cachés sont ignorés.
+    """
+    files = [
+        p for p in Path(raw_dir).iterdir()
+        if p.is_file()
+        and p.suffix.lower() in RAW_EXTS
+        and not p.name.startswith(".")
+        and not p.stem.endswith("_metadata")
+    ]
+    return sorted(files, key=lambda p: p.stat().st_size, reverse=True)
+
+# ─────────────────────────── Mémoire ────────────────────────────
+
+def _reset_peak_rss() -> None:
+    """Remet à zéro le pic de mémoire du processus (Linux ≥ 4.0)."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass  # ailleurs : le pic reste cumulé depuis le démarrage du worker
+
+
+def _peak_rss_mb() -> float | None:
+    """Pic de mémoire résidente du processus courant, en Mo."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# ─────────────────────────── Worker ─────────────────────────────
+
+def _clean_one(path: str, fmt: str | None, use_cache: bool, memory_mb: int, sort: str | None) -> dict:
+    """Nettoie un fichier dans le worker et retourne sa ligne de manifeste."""
+    from clean_data import SORT_POLICY, clean_file, ensure_dirs  # importé une fois par worker
+
+    ensure_dirs()
+    _reset_peak_rss()
+    started = time.perf_counter()
+    stats: dict = {}
+    row = {"file": Path(path).name, "status": "ok", "output": None,
+           "rows_in": None, "rows_out": None, "error": None}
+    log = io.StringIO()  # les messages de clean_file se mélangeraient entre workers
+    try:
+        with contextlib.redirect_stdout(log):
+            out = clean_file(Path(path), fmt=fmt, use_cache=use_cache, memory_mb=memory_mb,
+                             sort=sort or SORT_POLICY, stats=stats)
+        row.update(output=str(out), rows_in=stats.get("rows_in"), rows_out=stats.get("rows_out"),
+                   status="cache" if stats.get("cached") else "ok")
+    except Exception as e:  # un fichier en échec ne doit pas faire tomber le lot
+        row.update(status="échec", error=f"{type(e).__name__}: {e}")
+    row["seconds"] = round(time.perf_counter() - started, 3)
+    row["peak_rss_mb"] = _peak_rss_mb()
+    return row
+
+# ─────────────────────────── Lot ────────────────────────────────
+
+def clean_many(
+    files: list[Path],
+    *,
+    workers: int = DEFAULT_WORKERS,
+    fmt: str | None = None,
+    use_cache: bool = True,
+    memory_mb: int | None = None,
+    sort: str | None = None,
+    manifest: str | Path | None = MANIFEST_PATH,
+) -> pd.DataFrame:
+    """Nettoie `files` sur `workers` processus et écrit le manifeste.
+
+    `memory_mb` est le budget du mode par blocs *par worker* ; par défaut
+    `clean_data.DEFAULT_MEMORY_MB`. `sort` : politique d'ordre des lignes
+    (défaut : `clean_data.SORT_POLICY`). Retourne le tableau du manifeste.
+    """
+    from clean_data import DEFAULT_MEMORY_MB
+
+    memory_mb = memory_mb or DEFAULT_MEMORY_MB
+    workers = max(1, min(workers, len(files) or 1))
+    started = time.perf_counter()
+    rows: list[dict] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_clean_one, str(p), fmt, use_cache, memory_mb, sort): p
+            for p in files
+        }
+        for fut in as_completed(futures):
+            try:
+                row = fut.result()
+            except Exception as e:  # worker tué (mémoire, signal…)
+                row = {"file": futures[fut].name, "status": "échec", "output": None,
+                       "rows_in": None, "rows_out": None, "error": f"{type(e).__name__}: {e}",
+                       "seconds": None, "peak_rss_mb": None}
+            icon = {"ok": "✅", "cache": "⚡"}.get(row["status"], "❌")
+            print(f"{icon} {row['file']} : {row['error'] or row['output']}")
+            rows.append(row)
+
+    report = pd.DataFrame(
+        rows,
+        columns=["file", "status", "output", "rows_in", "rows_out", "seconds", "peak_rss_mb", "error"],
+    ).sort_values("file", ignore_index=True)
+    report = report.astype({"rows_in": "Int64", "rows_out": "Int64"})
+    total = time.perf_counter() - started
+    ok = int((report["status"] != "échec").sum()) if len(report) else 0
+    print(f"🧼 {ok}/{len(report)} fichiers nettoyés en {total:.1f} s ({workers} processus)")
+
+    if manifest:
+        manifest = Path(manifest)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "workers": workers,
+            "seconds": round(total, 3),
+            "files": json.loads(report.to_json(orient="records", force_ascii=False)),
+        }
+        with workspace.atomic_write(manifest) as tmp:
+            tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📝 Manifeste → {manifest}")
+    return report
+
+# ──────────────────────────── CLI ───────────────────────────────
+
+def main(argv: list[str] | None = None) -> pd.DataFrame:
+    parser = argparse.ArgumentParser(description="Nettoyage parallèle de data/raw")
+    parser.add_argument("--raw-dir", default=str(RAW_DIR), help="dossier des bruts (défaut : data/raw)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"processus simultanés (défaut : {DEFAULT_WORKERS})")
+    parser.add_argument("--only", nargs="*", metavar="NOM", help="limiter à ces noms (sans extension)")
+    parser.add_argument("--fmt", choices=["parquet", "feather", "csv", "xlsx"],
+                        help="format de sortie (défaut : celui de clean_data)")
+    parser.add_argument("--memory-mb", type=int, help="budget mémoire par worker en mode par blocs")
+    parser.add_argument("--sort", choices=["none", "dimensions", "full"],
+                        help="ordre des lignes (défaut : celui de clean_data)")
+    parser.add_argument("--force", action="store_true", help="ignorer le cache et tout re-nettoyer")
+    parser.add_argument("--manifest", default=str(MANIFEST_PATH), help="chemin du manifeste JSON")
+    args = parser.parse_args(argv)
+
+    files = discover_raw(args.raw_dir)
+    if args.only:
+        files = [p for p in files if p.stem in set(args.only)]
+
+    report = clean_many(
+        files,
+        workers=args.workers,
+        fmt=args.fmt,
+        use_cache=not args.force,
+        memory_mb=args.memory_mb,
+        sort=args.sort,
+        manifest=args.manifest,
+    )
+    print(report.drop(columns=["output", "error"]).to_string(index=False))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""batch_import.py
+
+Importe en parallèle plusieurs sources dans `data/raw/` (rafraîchissement
+nocturne des tableaux StatCan).
+
+Les sources viennent du dictionnaire `data/dictionary.json` (nom → URL), de
+`data/dictionary.csv` (nom, URL) ou de n'importe quelle liste de couples
+(nom, source). Les téléchargements passent par `import_data.import_source`
+avec une seule `requests.Session` partagée : les connexions keep-alive du
+pool sont réutilisées d'un tableau à l'autre au lieu d'être rouvertes.
+Les tableaux déjà connus sont revalidés (ETag / Last-Modified) : un 304
+ne retélécharge rien.
+
+Usage CLI :
+    python batch_import.py                      # tout data/dictionary.json
+    python batch_import.py --workers 8 --only data_18 tv
+    python batch_import.py --dictionary data/dictionary.csv --report rapport.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from import_data import import_source, is_url, make_session
+
+DICTIONARY_JSON = Path("data/dictionary.json")
+DICTIONARY_CSV = Path("data/dictionary.csv")
+DEFAULT_WORKERS = 4
+
+# ─────────────────────────── Sources ────────────────────────────
+
+def load_dictionary(path: str | Path = DICTIONARY_JSON) -> dict[str, str]:
+    """Lit un dictionnaire de sources et retourne {nom: URL}.
+
+    - JSON : `{"nom": "url"}` ou `{"nom": {"source" | "src": "url", ...}}`.
+    - CSV  : une ligne par tableau, le nom en 1re colonne ; la première
+      cellule suivante qui ressemble à une URL est retenue.
+    Les entrées sans URL sont ignorées.
+    """
+    path = Path(path)
+    sources: dict[str, str] = {}
+    if path.suffix.lower() == ".json":
+        for name, entry in json.loads(path.read_text(encoding="utf-8")).items():
+            url = entry if isinstance(entry, str) else entry.get("source") or entry.get("src")
+            if url and is_url(url):
+                sources[name] = url
+    else:
+        with path.open(encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                url = next((cell for cell in row[1:] if is_url(cell.strip())), None)
+                if url:
+                    sources[row[0].strip()] = url.strip()
+    return sources
+
+# ─────────────────────────── Import ─────────────────────────────
+
+def import_many(
+    sources: dict[str, str] | Iterable[tuple[str, str]],
+    *,
+    workers: int = DEFAULT_WORKERS,
+    overwrite: bool = True,
+) -> pd.DataFrame:
+    """Importe toutes les `sources` avec `workers` téléchargements simultanés.
+
+    Retourne un tableau (une ligne par source) : name, source, status, path,
+    sha256, bytes, seconds, bytes_per_sec. `status` reprend celui de
+    `import_source` ("nouveau", "mis_a_jour", "inchange", "non_modifie")
+    ou vaut "échec".
+    """
+    items = list(sources.items() if isinstance(sources, dict) else sources)
+    session = make_session(pool_size=workers)
+    lock = threading.Lock()  # sérialise les messages des threads
+
+    def _one(name: str, source: str) -> dict:
+        started = time.perf_counter()
+        try:
+            result = import_source(
+                source,
+                final_name=name,
+                interactive=False,
+                session=session,
+                overwrite=overwrite,
+            )
+        except Exception as e:  # filet de sécurité : une source ne bloque pas le lot
+            with lock:
+                print(f"❌ {name} : {e}")
+            result = None
+        if result is None:
+            result = {"status": "échec", "path": None, "sha256": None,
+                      "bytes": 0, "bytes_per_sec": 0.0}
+        return {
+            "name": name,
+            "source": source,
+            "status": result["status"],
+            "path": result["path"],
+            "sha256": result["sha256"],
+            "bytes": result["bytes"],
+            "seconds": round(time.perf_counter() - started, 3),
+            "bytes_per_sec": result["bytes_per_sec"],
+        }
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            rows = list(pool.map(lambda item: _one(*item), items))
+    finally:
+        session.close()
+
+    report = pd.DataFrame(
+        rows,
+        columns=["name", "source", "status", "path", "sha256", "bytes", "seconds", "bytes_per_sec"],
+    )
+    total = time.perf_counter() - started
+    ok = int((report["status"] != "échec").sum()) if len(report) else 0
+    print(f"📦 {ok}/{len(report)} sources importées en {total:.1f} s ({workers} en parallèle)")
+    return report
+
+# ──────────────────────────── CLI ───────────────────────────────
+
+def main(argv: list[str] | None = None) -> pd.DataFrame:
+    parser = argparse.ArgumentParser(description="Import parallèle de sources dans data/raw")
+    parser.add_argument("--dictionary", default=str(DICTIONARY_JSON),
+                        help="dictionnaire JSON ou CSV nom → URL (défaut : data/dictionary.json)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"téléchargements simultanés (défaut : {DEFAULT_WORKERS})")
+    parser.add_argument("--only", nargs="*", metavar="NOM", help="limiter à ces noms")
+    parser.add_argument("--keep-existing", action="store_true",
+                        help="ne pas remplacer les fichiers déjà présents")
+    parser.add_argument("--report", help="écrit le tableau de résultats dans ce CSV")
+    args = parser.parse_args(argv)
+
+    sources = load_dictionary(args.dictionary)
+    if args.only:
+        sources = {name: url for name, url in sources.items() if name in set(args.only)}
+
+    report = import_many(sources, workers=args.workers, overwrite=not args.keep_existing)
+    print(report.drop(columns=["source", "sha256"]).to_string(index=False))
+    if args.report:
+        report.to_csv(args.report, index=False)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""clean_cache.py
+
+Cache persistant des nettoyages.
+
+Une clé de cache combine :
+    • l'empreinte SHA-256 du fichier brut ;
+    • les options de nettoyage (format de sortie, mode par blocs…) ;
+    • la version des règles de `clean_data` (`CLEANER_VERSION`).
+Si la clé est connue et que le fichier nettoyé est toujours sur disque, il
+est renvoyé tel quel : un second clic sur « Lancer le nettoyage » d'un
+tableau inchangé ne relit même pas le CSV.
+
+L'empreinte d'un brut est mémorisée avec (taille, mtime) ; pour un alias du
+magasin `raw_store`, elle est lue directement dans son index. Les fichiers
+nettoyés gérés par le cache sont évincés du moins récemment utilisé au plus
+récent dès que leur taille totale dépasse `BUDGET_MB`.
+
+L'index vit dans `data/cleaned/.clean_cache.json`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import raw_store
+import workspace
+
+CLEANED_DIR = Path("data/cleaned")
+INDEX_PATH = CLEANED_DIR / ".clean_cache.json"
+BUDGET_MB = 2048  # taille disque maximale des fichiers nettoyés suivis par le cache
+
+
+def _lock():
+    """Verrou sur l'index, valable entre threads et entre processus (batch_clean)."""
+    return workspace.file_lock(INDEX_PATH)
+
+
+# ──────────────────────────── Index ───────────────────────────────
+
+def _load() -> dict:
+    if INDEX_PATH.exists():
+        try:
+            return json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            pass  # index corrompu : on repart de zéro, les fichiers restent sur disque
+    return {"entries": {}, "digests": {}}
+
+
+def _save(index: dict) -> None:
+    with workspace.atomic_write(INDEX_PATH) as tmp:
+        tmp.write_text(json.dumps(index, indent=1), encoding="utf-8")
+
+# ─────────────────────────── Empreintes ───────────────────────────
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 d'un fichier brut, sans le relire s'il n'a pas changé."""
+    path = Path(path)
+    st = path.stat()
+
+    entry = raw_store.lookup(path)
+    if entry and entry.get("sha256") and entry.get("size") == st.st_size:
+        obj = raw_store.object_path(entry["sha256"])
+        if obj.exists() and os.path.samefile(obj, path):
+            return entry["sha256"]
+
+    stamp = [st.st_size, st.st_mtime_ns]
+    with _lock():
+        known = _load()["digests"].get(str(path.resolve()))
+    if known and known["stamp"] == stamp:
+        return known["sha256"]
+
+    sha = raw_store.hash_file(path)
+    with _lock():
+        index = _load()
+        index["digests"][str(path.resolve())] = {"stamp": stamp, "sha256": sha}
+        _save(index)
+    return sha
+
+
+def cache_key(raw_path: str | Path, options: dict, version: str) -> str:
+    payload = json.dumps(
+        {"raw": file_digest(raw_path), "options": options, "version": version},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# ─────────────────────────── Lecture / écriture ───────────────────
+
+def get(key: str) -> Path | None:
+    """Fichier nettoyé associé à `key`, s'il existe encore et n'a pas été modifié."""
+    with _lock():
+        index = _load()
+        entry = index["entries"].get(key)
+        if not entry:
+            return None
+        path = Path(entry["path"])
+        if not path.exists() or path.stat().st_size != entry["size"]:
+            del index["entries"][key]
+            _save(index)
+            return None
+        entry["last_used"] = time.time()
+        _save(index)
+    return path
+
+
+def meta(key: str) -> dict:
+    """Informations enregistrées avec `key` (ex. nombres de lignes)."""
+    with _lock():
+        return dict(_load()["entries"].get(key, {}).get("meta", {}))
+
+
+def put(key: str, path: str | Path, *, meta: dict | None = None, budget_mb: int = BUDGET_MB) -> None:
+    """Enregistre `path` comme résultat de `key`, puis applique le budget disque."""
+    path = Path(path)
+    with _lock():
+        index = _load()
+        # Un même fichier de sortie ne peut servir qu'une clé : l'ancienne est périmée
+        for k in [k for k, e in index["entries"].items() if e["path"] == str(path)]:
+            del index["entries"][k]
+        index["entries"][key] = {
+            "path": str(path),
+            "size": path.stat().st_size,
+            "last_used": time.time(),
+            "meta": meta or {},
+        }
+        _evict(index, budget_mb * 1024 * 1024, keep=key)
+        _save(index)
+
+
+def _evict(index: dict, budget: int, keep: str) -> None:
+    """Supprime les fichiers les moins récemment utilisés au-delà de `budget` octets."""
+    entries = index["entries"]
+    total = sum(e["size"] for e in entries.values())
+    for k in sorted(entries, key=lambda k: entries[k]["last_used"]):
+        if total <= budget:
+            break
+        if k == keep:
+            continue
+        Path(entries[k]["path"]).unlink(missing_ok=True)
+        total -= entries[k]["size"]
+        del entries[k]
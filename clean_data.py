@@ -11,40 +11,90 @@ Fonction principale :
             - Chaîne vide ou None  → on prend le **dernier fichier brut importé**
               (référencé dans `data/last_imported.txt`).
             - Nom *simple* sans extension (ex. "data_34")  → on cherche
-              automatiquement un `.csv` ou `.xlsx` dans `data/raw/`.
+              automatiquement un `.csv`, `.xlsx` ou `.zip` dans `data/raw/`.
             - Chemin complet (ex. "data/raw/data_34.csv")  → utilisé tel quel.
 
 Retourne le chemin du fichier nettoyé (Path) qui sera ensuite passé à la
-visualisation.
+visualisation. Pour re-nettoyer tout `data/raw/` d'un coup, voir
+`batch_clean.py`. Le format par défaut est Parquet (`CLEANED_FORMAT`) ; la
+version Excel n'est produite qu'à la demande (`export_excel`).
 
 Dépendances :
-    pip install pandas openpyxl pyjanitor chardet
+    pip install pandas openpyxl pyjanitor chardet pyarrow
+    (optionnel, classeurs Excel plus rapides : python-calamine)
 """
 
 from __future__ import annotations
 
-import csv
+import bisect
+import itertools
 import json
-import difflib
+import os
+import pickle
 import re
+import tempfile
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
-import chardet
+import numpy as np
 import pandas as pd
 import janitor  # <- pyjanitor
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_ARROW = True
+except ImportError:  # sans pyarrow : repli sur CSV
+    _HAS_ARROW = False
+
+import clean_cache
+import column_registry
+import excel_reader
+import statcan_model
+import workspace
+from file_probe import BLOCK_BYTES, Probe, probe, probe_bytes
+from payload import RAW_EXTS, SNIFF_BYTES, PayloadError, check_payload, statcan_zip_members
+
+# Version des règles de nettoyage : à incrémenter dès qu'une règle change,
+# pour que `clean_cache` ne resserve pas un résultat produit par l'ancienne.
+CLEANER_VERSION = "8"
+
 # ───────────────────────────── Chemins ──────────────────────────────
 RAW_DIR = Path("data/raw")
 CLEANED_DIR = Path("data/cleaned")
 LAST_FILE_PATH = Path("data/last_imported.txt")  # toujours écrit par import_data
 
-CANONICAL_COLS: dict[str, list[str]] = {
-    "annee": ["annee", "année", "an", "year"],
-    "mois": ["mois", "month"],
-    "region": ["region", "région", "reg"],
-    "revenu": ["revenu", "income", "revenu_menage"],
-}
+# Mode « par blocs » : plafond mémoire et bascule automatique
+DEFAULT_MEMORY_MB = 256       # budget des blocs en cours de nettoyage
+CHUNKED_THRESHOLD_MB = 200    # au-delà (taille sur disque), clean_file passe par blocs
+EXCEL_CHUNKED_THRESHOLD_MB = 25  # même bascule pour un classeur (.xlsx compressé : ~8× moins gros qu'un CSV)
+EXCEL_EXTS = {".xlsx", ".xls"}
+EXCEL_MAX_ROWS = 1_048_575     # lignes de données d'une feuille Excel (en-tête en plus)
+ROWS_OVERHEAD = 4             # copies intermédiaires pandas par bloc (clean_names, fillna…)
+
+# Avancement : progress(étape, pourcentage | None) ; étapes dans l'ordre de STAGES
+# (l'interface web s'en sert pour suivre un nettoyage lancé en arrière-plan, voir `jobs`)
+CleanProgressFn = Callable[[str, Optional[float]], None]
+STAGES = ("lecture", "chargé", "nettoyé", "écriture", "écrit")
+
+# Format de stockage entre nettoyage et visualisation : "parquet", "feather" ou "csv"
+CLEANED_FORMAT = "parquet"
+CLEANED_EXTS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv", "xlsx": ".xlsx"}
+
+# Ordre des lignes du fichier nettoyé :
+#   "none"       → ordre du fichier brut (doublons retirés) ;
+#   "dimensions" → tri stable sur les colonnes de temps / géographie présentes ;
+#   "keys"       → tri stable sur les colonnes passées dans `sort_keys` ;
+#   "full"       → tri sur toutes les colonnes (ancien comportement, coûteux).
+SORT_POLICY = "dimensions"
+SORT_POLICIES = ("none", "dimensions", "keys", "full")
+DIMENSION_COLS = ("annee", "mois", "ref_date", "periode_de_reference", "geo", "region")
+
+# Compactage des types : texte répétitif → catégoriel, dates StatCan → datetime
+CATEGORY_MAX_RATIO = 0.5      # valeurs distinctes / lignes sous lequel un texte devient catégoriel
+DATE_COLS = ("ref_date", "periode_de_reference", "date")
+DATE_FORMATS = ((r"\d{4}-\d{2}-\d{2}", "%Y-%m-%d"), (r"\d{4}-\d{2}", "%Y-%m"), (r"\d{4}", "%Y"))
 
 # ─────────────────────────── UTILITAIRES ────────────────────────────
 
@@ -54,31 +104,193 @@ def ensure_dirs() -> None:
 
 
 def detect_encoding(path: Path) -> str:
-    with path.open("rb") as f:
-        return chardet.detect(f.read(10000)).get("encoding", "utf-8")
-
-
-def detect_delimiter(csv_path: Path, encoding: str = "utf-8") -> str:
-    with csv_path.open(encoding=encoding) as f:
-        sample = f.read(2048)
-    return csv.Sniffer().sniff(sample).delimiter
+    return probe(path).encoding
+
+
+def detect_delimiter(csv_path: Path, encoding: str | None = None) -> str:
+    return probe(csv_path).delimiter
+
+
+def read_zip_csv(zip_path: Path) -> pd.DataFrame:
+    """Lit le CSV de données d'une archive StatCan sans l'extraire sur disque.
+
+    Le format est sondé sur les premiers octets du membre, puis pandas lit
+    le membre décompressé à la volée.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        member, fmt = _zip_csv_format(zf)
+        with zf.open(member) as stream:
+            return pd.read_csv(stream, **fmt.read_csv_kwargs())
+
+
+def _zip_csv_format(zf: zipfile.ZipFile) -> tuple[zipfile.ZipInfo, Probe]:
+    """(membre données, sondage du format) d'une archive StatCan."""
+    member, _ = statcan_zip_members(zf)
+    with zf.open(member) as stream:
+        head = stream.read(BLOCK_BYTES)
+    return member, probe_bytes(head)
+
+
+def iter_csv_chunks(file_path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Lit un CSV (ou le CSV d'une archive .zip) par blocs de `chunksize` lignes."""
+    if zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path) as zf:
+            member, fmt = _zip_csv_format(zf)
+            with zf.open(member) as stream:
+                yield from pd.read_csv(stream, chunksize=chunksize, **fmt.read_csv_kwargs())
+        return
+    with pd.read_csv(file_path, chunksize=chunksize, **probe(file_path).read_csv_kwargs()) as reader:
+        yield from reader
+
+
+def iter_raw_chunks(file_path: Path, chunksize: int, *, sheet: excel_reader.Sheet = 0,
+                    usecols: list[str | int] | None = None) -> Iterator[pd.DataFrame]:
+    """Blocs de `chunksize` lignes d'un brut : CSV, CSV d'un .zip, ou feuille `sheet` d'un classeur.
+
+    `usecols` (classeurs) : colonnes gardées, par nom ou position (voir `excel_reader`).
+    """
+    if file_path.suffix.lower() in EXCEL_EXTS:
+        return excel_reader.iter_chunks(file_path, sheet=sheet, usecols=usecols, chunksize=chunksize)
+    return iter_csv_chunks(file_path, chunksize)
+
+
+def _estimate_rows(file_path: Path, sheet: excel_reader.Sheet = 0) -> int | None:
+    """Nombre approximatif de lignes d'un brut (CSV : d'après son début ; classeur : ses dimensions)."""
+    if file_path.suffix.lower() in EXCEL_EXTS:
+        return excel_reader.row_count(file_path, sheet)
+    if zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path) as zf:
+            member, _ = statcan_zip_members(zf)
+            size = member.file_size
+            with zf.open(member) as stream:
+                head = stream.read(BLOCK_BYTES)
+    else:
+        size = file_path.stat().st_size
+        with file_path.open("rb") as f:
+            head = f.read(BLOCK_BYTES)
+    lines = head.count(b"\n")
+    return int(size * lines / len(head)) if lines else None
 
 
 def fuzzy_rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    rename_map: dict[str, str] = {}
-    for canon, variants in CANONICAL_COLS.items():
-        for col in df.columns:
-            if col in variants:
-                rename_map[col] = canon
-            else:
-                best = difflib.get_close_matches(col, variants, n=1, cutoff=0.8)
-                if best:
-                    rename_map[col] = canon
-    return df.rename(columns=rename_map)
-
-
-def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Nettoyage standard : clean_names, remove_empty, etc."""
+    """Noms canoniques (annee, mois, region…) via `column_registry` ; décisions dans `df.attrs["renamed"]`."""
+    return column_registry.rename_columns(df)
+
+
+def _report_renamed(renamed: dict[str, str]) -> None:
+    if renamed:
+        print("🔤 Colonnes renommées :", ", ".join(f"{a} → {b}" for a, b in renamed.items()))
+
+
+def _is_text(s: pd.Series) -> bool:
+    """Colonne composée uniquement de chaînes (hors valeurs manquantes)."""
+    if isinstance(s.dtype, pd.CategoricalDtype) or not (
+        s.dtype == object or pd.api.types.is_string_dtype(s.dtype)
+    ):
+        return False
+    return pd.api.types.infer_dtype(s, skipna=True) == "string"
+
+
+def parse_dates(s: pd.Series) -> pd.Series | None:
+    """Période StatCan ("2020", "2020-01", "2020-01-15") → datetime ; None sinon.
+
+    Un seul format pour toute la colonne, vérifié sur les valeurs distinctes ;
+    les années déjà numériques et les périodes du type "2019/2020" restent
+    telles quelles.
+    """
+    if not _is_text(s):
+        return None
+    values = pd.Series(s.dropna().unique(), dtype=str)
+    if values.empty:
+        return None
+    for pattern, fmt in DATE_FORMATS:
+        if values.str.fullmatch(pattern).all():
+            return pd.to_datetime(s, format=fmt)
+    return None
+
+
+def _float32_exact(s: pd.Series) -> bool:
+    """True si `s` tient en float32 sans perdre une seule valeur."""
+    values = s.to_numpy(dtype="float64")
+    return np.array_equal(values.astype("float32").astype("float64"), values, equal_nan=True)
+
+
+def optimize_dtypes(df: pd.DataFrame, *, category_ratio: float = CATEGORY_MAX_RATIO) -> pd.DataFrame:
+    """Types compacts : catégories, entiers/flottants réduits, dates analysées.
+
+    • colonnes de période (`DATE_COLS`) → datetime64 ;
+    • texte dont les valeurs distinctes font moins de `category_ratio` des
+      lignes (GEO, DGUID, UOM, SCALAR_FACTOR, STATUS…) → category ;
+    • entiers → plus petit type signé suffisant ; flottants → float32
+      seulement si aucune valeur n'est altérée.
+    Ces types sont conservés tels quels par Parquet et Feather.
+    """
+    n = len(df)
+    if not n:
+        return df
+    for col in df.columns:
+        s = df[col]
+        if col in DATE_COLS:
+            parsed = parse_dates(s)
+            if parsed is not None:
+                df[col] = parsed
+                continue
+        if pd.api.types.is_bool_dtype(s.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(s.dtype):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s.dtype):
+            if s.dtype != "float32" and _float32_exact(s):
+                df[col] = s.astype("float32")
+        elif _is_text(s) and s.nunique() <= category_ratio * n:
+            df[col] = s.astype("category")
+    return df
+
+
+def sort_columns(
+    columns: list[str],
+    policy: str = SORT_POLICY,
+    keys: list[str] | None = None,
+) -> list[str]:
+    """Colonnes de tri retenues par `policy` parmi `columns` (dans l'ordre du tri)."""
+    if policy not in SORT_POLICIES:
+        raise ValueError(f"Politique de tri inconnue : {policy} (attendu : {', '.join(SORT_POLICIES)})")
+    if policy == "full":
+        return list(columns)
+    if policy == "dimensions":
+        return [c for c in DIMENSION_COLS if c in columns]
+    if policy == "keys":
+        return [c for c in keys or [] if c in columns]
+    return []
+
+
+def order_rows(
+    df: pd.DataFrame,
+    policy: str = SORT_POLICY,
+    keys: list[str] | None = None,
+) -> pd.DataFrame:
+    """Trie `df` selon `policy` et note les colonnes de tri dans `df.attrs["sorted_by"]`.
+
+    L'attribut est conservé par Parquet et Feather : la visualisation s'en
+    sert pour ne pas retrier une série temporelle déjà dans l'ordre.
+    """
+    by = sort_columns(df.columns.to_list(), policy, keys)
+    if by:
+        df = df.sort_values(by=by, kind="stable", ignore_index=True)
+    df.attrs["sorted_by"] = by
+    return df
+
+
+def clean_dataframe(
+    df: pd.DataFrame,
+    *,
+    sort: str = SORT_POLICY,
+    sort_keys: list[str] | None = None,
+) -> pd.DataFrame:
+    """Nettoyage standard : clean_names, remove_empty, etc.
+
+    `sort` / `sort_keys` : politique d'ordre des lignes (voir `SORT_POLICY`).
+    """
     df = (
         df.clean_names()
         .remove_empty()
@@ -88,67 +300,683 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     # Renommage flou → colonnes canoniques
     df = fuzzy_rename_columns(df)
 
+    # Tableau StatCan : VALEUR ramenée aux unités (FACTEUR SCALAIRE appliqué)
+    df = statcan_model.apply_scalar_factor(df)
+
     # Valeurs manquantes
     num_cols = df.select_dtypes("number").columns
     obj_cols = df.select_dtypes("object").columns
     df[num_cols] = df[num_cols].fillna(0)
     df[obj_cols] = df[obj_cols].ffill()
 
-    return df.sort_values(by=df.columns.to_list())
+    # Types compacts avant le tri : trier des codes de catégorie coûte moins cher
+    df = optimize_dtypes(df)
+    return order_rows(df, sort, sort_keys)
+
+# ──────────────────────── FORMATS DE SORTIE ─────────────────────────
+
+def _resolve_format(fmt: str | None) -> str:
+    fmt = fmt or CLEANED_FORMAT
+    if fmt in {"parquet", "feather"} and not _HAS_ARROW:
+        print("⚠️ pyarrow absent : sortie CSV à la place de", fmt)
+        return "csv"
+    return fmt
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Convertit en texte les colonnes object aux types mêlés (refusées par Arrow)."""
+    mixed = [
+        c for c in df.select_dtypes("object").columns
+        if pd.api.types.infer_dtype(df[c], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for c in mixed:
+        df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df
+
+
+def output_path(stem: str, fmt: str | None = None, cleaned_dir: str | Path = CLEANED_DIR) -> Path:
+    """Chemin du fichier nettoyé de `stem` : `<cleaned_dir>/<stem>_cleaned.<ext>`."""
+    return Path(cleaned_dir) / f"{stem}_cleaned{CLEANED_EXTS[_resolve_format(fmt)]}"
+
+
+def write_cleaned(df: pd.DataFrame, stem: str, fmt: str | None = None,
+                  cleaned_dir: str | Path = CLEANED_DIR) -> Path:
+    """Écrit `<cleaned_dir>/<stem>_cleaned.<ext>` dans le format demandé (remplacement atomique)."""
+    fmt = _resolve_format(fmt)
+    path = output_path(stem, fmt, cleaned_dir)
+    with workspace.atomic_write(path) as tmp:
+        if fmt == "parquet":
+            _arrow_safe(df).to_parquet(tmp, index=False)
+        elif fmt == "feather":
+            _arrow_safe(df).reset_index(drop=True).to_feather(tmp)
+        elif fmt == "xlsx":
+            df.to_excel(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False)
+    return path
+
+
+def export_excel(cleaned_path: str | Path) -> Path:
+    """Version .xlsx d'un fichier nettoyé, produite seulement quand on la demande.
+
+    L'export est réutilisé tant qu'il est plus récent que la source.
+    """
+    cleaned_path = Path(cleaned_path)
+    if cleaned_path.suffix == ".xlsx":
+        return cleaned_path
+    xlsx_path = cleaned_path.with_suffix(".xlsx")
+    if xlsx_path.exists() and xlsx_path.stat().st_mtime >= cleaned_path.stat().st_mtime:
+        return xlsx_path
+    _to_excel(_read_cleaned(cleaned_path), xlsx_path)
+    return xlsx_path
+
+
+def _read_cleaned(path: Path, fmt: str | None = None) -> pd.DataFrame:
+    """Relit un fichier nettoyé Parquet, Feather ou CSV (format : `fmt` ou l'extension)."""
+    fmt = fmt or path.suffix.lstrip(".")
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def _to_excel(df: pd.DataFrame, xlsx_path: Path) -> None:
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"{len(df)} lignes : trop pour une feuille Excel ({EXCEL_MAX_ROWS} au plus) "
+            "– choisissez parquet, feather ou csv"
+        )
+    with workspace.atomic_write(xlsx_path) as tmp:
+        df.to_excel(tmp, index=False)
+
+
+class _IncrementalWriter:
+    """Écriture bloc par bloc d'un fichier nettoyé, dans chacun des formats de sortie.
+
+    Parquet et Feather : un schéma Arrow fixé par `dtypes`, commun à tous les
+    blocs, `attrs` enregistré comme `DataFrame.attrs` ; CSV : blocs ajoutés à
+    la suite, en-tête écrit une fois. Excel ne s'écrit pas par morceaux : les
+    blocs passent par un fichier Parquet (CSV sans pyarrow) intermédiaire,
+    converti par `close()`.
+    Les blocs vont dans un fichier temporaire voisin, renommé en `path` par
+    `close()` : un lecteur ne voit jamais de fichier partiel.
+    """
+
+    def __init__(self, path: Path, fmt: str, dtypes: dict[str, str], attrs: dict | None = None):
+        if fmt not in CLEANED_EXTS:
+            raise ValueError(f"Format de sortie inconnu : {fmt} (attendu : {', '.join(CLEANED_EXTS)})")
+        self.path, self.fmt, self.dtypes = path, fmt, dtypes
+        self._stage_fmt = ("parquet" if _HAS_ARROW else "csv") if fmt == "xlsx" else fmt
+        # nom distinct de celui qu'utilise `atomic_write(path)` pour la conversion Excel
+        self._tmp = workspace.temp_path(path.with_suffix(CLEANED_EXTS[self._stage_fmt]))
+        self.attrs = attrs or {}
+        self._writer = None
+        self._sink = None
+        self._schema = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        for col, dtype in self.dtypes.items():
+            if dtype in {"object", "category"}:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            elif dtype == "datetime":
+                df[col] = pd.to_datetime(df[col])
+            else:
+                df[col] = df[col].astype(dtype)
+        if self._stage_fmt == "csv":
+            df.to_csv(self._tmp, mode="w" if self._first else "a", header=self._first, index=False)
+            self._first = False
+            return
+        if self._writer is None:
+            df.attrs.update(self.attrs)  # métadonnées pandas du schéma : relues par read_feather
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            schema = pa.schema(
+                [pa.field(f.name, self._arrow_type(f)) for f in schema],
+                # même clé que DataFrame.to_parquet : relue dans df.attrs par read_parquet
+                metadata={**(schema.metadata or {}), b"PANDAS_ATTRS": json.dumps(self.attrs).encode()},
+            )
+            if self._stage_fmt == "parquet":
+                self._writer = pq.ParquetWriter(self._tmp, schema)
+            elif self._stage_fmt == "feather":
+                self._sink = pa.OSFile(str(self._tmp), "wb")
+                self._writer = pa.ipc.new_file(self._sink, schema)
+            self._schema = schema
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+
+    def _arrow_type(self, field: pa.Field) -> pa.DataType:
+        dtype = self.dtypes.get(field.name)
+        if dtype == "category" and self._stage_fmt == "parquet":
+            # dictionnaire propre à chaque bloc : relu en category par read_parquet
+            return pa.dictionary(pa.int32(), pa.string())
+        if dtype in {"object", "category"}:
+            # un fichier Feather n'admet qu'un dictionnaire par colonne : texte simple
+            return pa.string()
+        return field.type
+
+    def close(self, commit: bool = True) -> None:
+        """Termine le fichier ; `commit=False` (erreur en cours) l'abandonne."""
+        try:
+            if self._writer is not None:
+                self._writer.close()
+            if self._sink is not None:
+                self._sink.close()
+            if commit and self._tmp.exists():
+                if self.fmt == "xlsx":
+                    _to_excel(_read_cleaned(self._tmp, self._stage_fmt), self.path)
+                else:
+                    os.replace(self._tmp, self.path)
+        finally:
+            self._tmp.unlink(missing_ok=True)
+
+
+def _merge_dtype(prev: str | None, new: str) -> str:
+    """Type commun d'une colonne vue dans plusieurs blocs (désaccord → object)."""
+    if prev is None or prev == new:
+        return new
+    numeric = {"int64", "float64", "bool"}
+    if prev in numeric and new in numeric:
+        return "float64"
+    return "object"
+
+# ──────────────────────── NETTOYAGE PAR BLOCS ───────────────────────
+
+def _estimate_chunksize(file_path: Path, memory_mb: int, **read_opts) -> int:
+    """Nombre de lignes par bloc pour tenir dans `memory_mb` Mo."""
+    sample = next(iter_raw_chunks(file_path, 1000, **read_opts), None)
+    if sample is None or sample.empty:
+        return 1000
+    per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    return max(1000, int(memory_mb * 1024 * 1024 / (per_row * ROWS_OVERHEAD)))
+
+
+class _RowHashSet:
+    """Ensemble d'empreintes des lignes déjà écrites (2 × 64 bits, 16 octets/ligne).
+
+    Deux empreintes indépendantes par ligne : la principale, gardée dans un
+    tableau numpy trié (test d'appartenance par recherche dichotomique), et
+    une seconde, calculée sur les colonnes en ordre inverse et avec une
+    autre clé de hachage, vérifiée quand la principale coïncide. Deux lignes
+    distinctes ne sont confondues que si les 128 bits coïncident : pour
+    N lignes, probabilité de l'ordre de N² / 2¹²⁹ (≈ 10⁻²¹ pour un milliard
+    de lignes) — risque accepté, les lignes n'étant pas gardées en mémoire.
+    Les nouvelles empreintes, seules triées, sont insérées à leur place
+    (`np.searchsorted` + `np.insert`) : pas de retri de tout l'ensemble.
+    """
+
+    CHECK_HASH_KEY = "clean_data-rows2"  # 16 caractères, ≠ clé par défaut de pandas
+
+    def __init__(self) -> None:
+        self._seen = np.empty(0, dtype=np.uint64)   # empreinte principale, triée
+        self._check = np.empty(0, dtype=np.uint64)  # seconde empreinte, même ordre
+
+    def fingerprints(self, chunk: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        # int → float : une même valeur doit avoir la même empreinte d'un bloc à l'autre
+        num_cols = chunk.select_dtypes("number").columns
+        frame = chunk.astype({c: "float64" for c in num_cols})
+        main = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        check = pd.util.hash_pandas_object(frame[frame.columns[::-1]], index=False,
+                                           hash_key=self.CHECK_HASH_KEY).to_numpy()
+        return main, check
+
+    def _known(self, main: np.ndarray, check: np.ndarray) -> np.ndarray:
+        """Lignes dont le couple d'empreintes est déjà dans l'ensemble."""
+        known = np.zeros(len(main), dtype=bool)
+        if not len(self._seen):
+            return known
+        lo = np.searchsorted(self._seen, main, side="left")
+        hi = np.searchsorted(self._seen, main, side="right")
+        single = hi - lo == 1
+        known[single] = self._check[lo[single]] == check[single]
+        for i in np.flatnonzero(hi - lo > 1):  # empreinte principale partagée (collision gardée)
+            known[i] = bool((self._check[lo[i]:hi[i]] == check[i]).any())
+        return known
+
+    def keep_new(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        main, check = self.fingerprints(chunk)
+        fresh = ~pd.DataFrame({"main": main, "check": check}).duplicated().to_numpy()
+        fresh &= ~self._known(main, check)
+        new_main, new_check = main[fresh], check[fresh]
+        order = np.argsort(new_main, kind="stable")
+        new_main, new_check = new_main[order], new_check[order]
+        at = np.searchsorted(self._seen, new_main)
+        self._seen = np.insert(self._seen, at, new_main)
+        self._check = np.insert(self._check, at, new_check)
+        return chunk[fresh]
+
+
+def _sort_arrays(block: pd.DataFrame, by: list[str]) -> list[np.ndarray]:
+    """Clés de tri absolues de chaque ligne, colonne par colonne, pour `np.lexsort` et les comparaisons.
+
+    Pour chaque colonne de `by` : (manquant, texte, nombre haut, nombre bas,
+    texte) — NaN en dernier, nombres avant textes, comme un tri stable de
+    pandas. Une colonne peut être numérique dans un bloc et textuelle dans
+    un autre : les clés restent comparables d'un bloc à l'autre. Une date
+    (int64 en ns) est coupée en deux moitiés exactes en float64.
+    """
+    arrays: list[np.ndarray] = []
+    n = len(block)
+    for col in by:
+        s = block[col]
+        na = s.isna().to_numpy()
+        hi, lo = np.zeros(n), np.zeros(n)
+        text = np.full(n, "", dtype=object)
+        if pd.api.types.is_datetime64_any_dtype(s):
+            ns = s.to_numpy().view("int64")
+            hi[~na], lo[~na] = np.divmod(ns[~na], 2**32)
+            is_str = np.zeros(n, dtype=bool)
+        elif pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            hi[~na] = s.to_numpy(dtype="float64", na_value=np.nan)[~na]
+            is_str = np.zeros(n, dtype=bool)
+        else:
+            values = s.to_numpy(dtype=object)
+            is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n) & ~na
+            text[is_str] = values[is_str]
+            other = ~is_str & ~na
+            if other.any():
+                hi[other] = pd.to_numeric(pd.Series(values[other]), errors="coerce").fillna(0).to_numpy()
+        arrays += [na, is_str, hi, lo, text]
+    return arrays
+
+
+def _spill_run(df: pd.DataFrame, tmp_dir: Path, n: int, block_rows: int) -> Path:
+    """Écrit un bloc trié sur disque, découpé en sous-blocs relisibles un à un."""
+    path = tmp_dir / f"run_{n:05d}.pkl"
+    with path.open("wb") as f:
+        for start in range(0, len(df), block_rows):
+            pickle.dump(df.iloc[start:start + block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: Path) -> Iterator[pd.DataFrame]:
+    """Sous-blocs (non vides) d'un bloc déversé par `_spill_run`, dans l'ordre."""
+    with path.open("rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            if len(block):
+                yield block
+
+
+def _merge_runs(runs: list[Path], by: list[str]) -> Iterator[pd.DataFrame]:
+    """Fusion k-voies stable des blocs triés sur `by`, par paquets vectorisés.
+
+    Un sous-bloc de chaque bloc est en mémoire, avec ses clés de tri
+    (`_sort_arrays`, calculées une fois). Borne de chaque tour : la plus
+    petite des dernières lignes en mémoire (à égalité, le bloc le plus
+    ancien). Une recherche dichotomique donne, dans chaque bloc, le préfixe
+    qui ne la dépasse pas ; ces préfixes sont ordonnés ensemble par
+    `np.lexsort` (clés, puis bloc, puis position : même ordre qu'une fusion
+    ligne à ligne stable) et rendus d'un coup. Chaque ligne n'est triée
+    qu'une fois ; le bloc qui a fourni la borne recharge son sous-bloc suivant.
+    """
+    streams = [_read_run(r) for r in runs]
+
+    def load(i: int) -> tuple[pd.DataFrame, list[np.ndarray]] | None:
+        block = next(streams[i], None)
+        return None if block is None else (block, _sort_arrays(block, by))
+
+    def row_key(arrays: list[np.ndarray], j: int) -> tuple:
+        return tuple(a[j] for a in arrays)
+
+    buffers = [load(i) for i in range(len(runs))]
+    while True:
+        live = [i for i, b in enumerate(buffers) if b is not None]
+        if not live:
+            return
+        bound_run = min(live, key=lambda i: (row_key(buffers[i][1], len(buffers[i][0]) - 1), i))
+        bound = row_key(buffers[bound_run][1], len(buffers[bound_run][0]) - 1)
+        parts, keys, run_ids = [], [], []
+        for i in live:
+            block, arrays = buffers[i]
+            rows = range(len(block))
+            # à égalité avec la borne, un bloc plus ancien passe avant, un plus récent après
+            search = bisect.bisect_right if i <= bound_run else bisect.bisect_left
+            n = search(rows, bound, key=lambda j: row_key(arrays, j))
+            if not n:
+                continue
+            parts.append(block.iloc[:n])
+            keys.append([a[:n] for a in arrays])
+            run_ids.append(np.full(n, i))
+            if n < len(block):
+                buffers[i] = (block.iloc[n:], [a[n:] for a in arrays])
+            else:
+                buffers[i] = load(i)
+        frame = pd.concat(parts, ignore_index=True)
+        run = np.concatenate(run_ids)
+        pos = np.arange(len(frame))  # préfixes concaténés dans l'ordre : position dans chaque bloc respectée
+        merged = [np.concatenate([k[c] for k in keys]) for c in range(len(keys[0]))]
+        order = np.lexsort([pos, run, *reversed(merged)])
+        yield frame.iloc[order].reset_index(drop=True)
+
+
+def clean_file_chunked(
+    file_path: Path,
+    *,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    chunksize: int | None = None,
+    fmt: str | None = None,
+    sort: str = SORT_POLICY,
+    sort_keys: list[str] | None = None,
+    stats: dict | None = None,
+    cleaned_dir: str | Path = CLEANED_DIR,
+    progress: CleanProgressFn | None = None,
+    sheet: excel_reader.Sheet = 0,
+    usecols: list[str | int] | None = None,
+) -> Path:
+    """Nettoie un CSV (ou un classeur) volumineux par blocs, avec un plafond mémoire fixe.
+
+    Mêmes étapes que `clean_dataframe`, adaptées au flux :
+    • doublons : ensemble d'empreintes de lignes conservé d'un bloc à l'autre ;
+    • ffill : la dernière valeur connue de chaque colonne texte est reportée
+      sur le bloc suivant ;
+    • tri (selon `sort`) : chaque bloc trié est déversé sur disque puis les
+      blocs sont fusionnés (tri externe) ; sans colonne de tri, les blocs
+      sont simplement recopiés dans l'ordre ;
+    • seules les lignes vides sont retirées (une colonne vide dans tout le
+      fichier ne peut pas être connue avant la fin du flux) ;
+    • types : dates et catégories comme `optimize_dtypes` (catégories
+      choisies sur le premier bloc, en texte simple pour Feather) ; les
+      nombres restent en 64 bits, leur plage n'étant connue qu'à la fin.
+    La sortie `<cleaned_dir>/<stem>_cleaned.<ext>` (Parquet par défaut) est
+    écrite au fil de l'eau, puis renommée une fois complète. `stats`, s'il est fourni, reçoit rows_in/rows_out/renamed.
+    Un classeur est lu ligne à ligne (feuille `sheet`, colonnes `usecols`,
+    voir `excel_reader`) et nettoyé par les mêmes étapes.
+    `progress` est appelé à chaque bloc : lecture (0–50 %, d'après le nombre
+    de lignes estimé), nettoyé, puis écriture de la fusion (50–100 %).
+    """
+    report = progress or (lambda stage, percent: None)
+    read_opts = {"sheet": sheet, "usecols": usecols} if file_path.suffix.lower() in EXCEL_EXTS else {}
+    chunksize = chunksize or _estimate_chunksize(file_path, memory_mb, **read_opts)
+    fmt = _resolve_format(fmt)
+    out_path = output_path(file_path.stem, fmt, cleaned_dir)
+    dtypes: dict[str, str] = {}
+    seen = _RowHashSet()
+    carry: pd.Series | None = None  # dernières valeurs texte du bloc précédent
+    columns: list[str] | None = None
+    header: list[str] = []
+    by: list[str] = []
+    cat_cols: set[str] = set()
+    renamed: dict[str, str] = {}
+    layout: statcan_model.Layout | None = None
+    rows_in = rows_out = rows_kept = 0
+    est_rows = _estimate_rows(file_path, sheet) if progress else None
+
+    with tempfile.TemporaryDirectory(prefix="clean_runs_", dir=cleaned_dir) as tmp:
+        runs: list[Path] = []
+        for chunk in iter_raw_chunks(file_path, chunksize, **read_opts):
+            rows_in += len(chunk)
+            report("lecture", 50 * min(rows_in / est_rows, 0.99) if est_rows else None)
+            chunk = chunk.clean_names().dropna(how="all")
+            chunk = fuzzy_rename_columns(seen.keep_new(chunk))
+            header = header or chunk.columns.to_list()  # colonnes d'un fichier sans ligne de données
+            if chunk.empty:
+                continue
+            if columns is None:
+                columns = chunk.columns.to_list()
+                renamed = chunk.attrs.get("renamed", {})
+                _report_renamed(renamed)
+                by = sort_columns(columns, sort, sort_keys)
+                layout = statcan_model.detect(chunk)
+                # Catégories décidées sur le premier bloc (le seul vu en entier à ce stade)
+                cat_cols = {
+                    c for c in columns
+                    if c not in DATE_COLS and _is_text(chunk[c])
+                    and chunk[c].nunique() <= CATEGORY_MAX_RATIO * len(chunk)
+                }
+
+            if layout is not None:
+                chunk = statcan_model.apply_scalar_factor(chunk, layout)
+            num_cols = chunk.select_dtypes("number").columns
+            obj_cols = chunk.select_dtypes("object").columns
+            chunk[num_cols] = chunk[num_cols].fillna(0)
+            if carry is not None:
+                head = carry.reindex(obj_cols).to_frame().T
+                chunk[obj_cols] = pd.concat([head, chunk[obj_cols]]).ffill().iloc[1:].to_numpy()
+            else:
+                chunk[obj_cols] = chunk[obj_cols].ffill()
+            carry = chunk[obj_cols].iloc[-1] if len(obj_cols) else carry
+            for col in DATE_COLS:
+                parsed = parse_dates(chunk[col]) if col in chunk else None
+                if parsed is not None:
+                    chunk[col] = parsed
+            for col, dtype in chunk.dtypes.items():
+                if pd.api.types.is_datetime64_any_dtype(dtype):
+                    kind = "datetime"
+                elif str(dtype) in {"int64", "float64", "bool"}:
+                    kind = str(dtype)
+                else:
+                    kind = "category" if col in cat_cols else "object"
+                dtypes[col] = _merge_dtype(dtypes.get(col), kind)
+
+            if by:
+                chunk = chunk.sort_values(by=by, kind="stable")
+            runs.append(_spill_run(chunk, Path(tmp), len(runs), max(1000, chunksize // 8)))
+            rows_kept += len(chunk)
+            print(f"   … {rows_in} lignes lues, {len(runs)} blocs")
+
+        report("nettoyé", 50)
+        # Fusion k-voies (stable) : chaque bloc n'est relu que par petits morceaux
+        attrs = {"sorted_by": by, "renamed": renamed}
+        if layout is not None:
+            attrs[statcan_model.SCALED_ATTR] = True
+        writer = _IncrementalWriter(out_path, fmt, dtypes, attrs)
+        try:
+            if runs:
+                batch_rows = max(1000, chunksize // (len(runs) + 1))
+                if by:
+                    blocks = _merge_runs(runs, by)
+                else:
+                    blocks = itertools.chain.from_iterable(_read_run(r) for r in runs)
+                pending: list[pd.DataFrame] = []
+                waiting = 0
+                for block in itertools.chain(blocks, [None]):
+                    if block is not None:
+                        pending.append(block)
+                        waiting += len(block)
+                    if pending and (waiting >= batch_rows or block is None):
+                        writer.write(pd.concat(pending, ignore_index=True)[columns])
+                        rows_out += waiting
+                        pending, waiting = [], 0
+                        report("écriture", 50 + 50 * min(rows_out / rows_kept, 0.99))
+        except BaseException:
+            writer.close(commit=False)
+            raise
+        writer.close()
+        if not rows_out:
+            write_cleaned(pd.DataFrame(columns=columns or header), file_path.stem, fmt, cleaned_dir)
+    report("écrit", 100)
+
+    if stats is not None:
+        stats.update(rows_in=rows_in, rows_out=rows_out, renamed=renamed)
+    print(f"✅ Nettoyé par blocs ({chunksize} lignes/bloc) → {rows_in} lignes lues, {rows_out} écrites")
+    print(f"🎉 Exporté  → {out_path}")
+    return out_path
 
 # ──────────────────────────── COEUR ────────────────────────────────
 
-def _resolve_input(path_like: str | Path | None) -> Path:
-    """Résout l'argument utilisateur vers un Path brut situé dans data/raw."""
+def _resolve_input(path_like: str | Path | None, raw_dir: str | Path = RAW_DIR) -> Path:
+    """Résout l'argument utilisateur vers un Path brut situé dans `raw_dir`."""
+    raw_dir = Path(raw_dir)
     if path_like in (None, ""):
         # On prend le dernier importé
         if not LAST_FILE_PATH.exists():
             raise FileNotFoundError("Aucun fichier importé : exécute import_data.py d’abord.")
         base = LAST_FILE_PATH.read_text(encoding="utf-8").strip()
-        # cherche .csv puis .xlsx
-        for ext in (".csv", ".xlsx", ".xls"):
-            candidate = RAW_DIR / f"{base}{ext}"
+        # cherche .csv puis .xlsx puis .zip
+        for ext in RAW_EXTS:
+            candidate = raw_dir / f"{base}{ext}"
             if candidate.exists():
                 return candidate
-        raise FileNotFoundError(f"Dernier importé introuvable dans {RAW_DIR} : {base}.*")
+        raise FileNotFoundError(f"Dernier importé introuvable dans {raw_dir} : {base}.*")
 
     p = Path(path_like)
     if p.exists():  # chemin complet fourni
         return p
     # Sinon, l'utilisateur a probablement donné juste "data_34"
-    for ext in (".csv", ".xlsx", ".xls"):
-        candidate = RAW_DIR / f"{p.stem}{ext}"
+    for ext in RAW_EXTS:
+        candidate = raw_dir / f"{p.stem}{ext}"
         if candidate.exists():
             return candidate
     raise FileNotFoundError(f"Fichier non trouvé : {path_like}")
 
 
-def clean_file(file_path: Path) -> Path:
-    if file_path.suffix.lower() == ".csv":
-        enc = detect_encoding(file_path)
-        delim = detect_delimiter(file_path, enc)
-        df = pd.read_csv(file_path, encoding=enc, delimiter=delim)
-    elif file_path.suffix.lower() in {".xlsx", ".xls"}:
-        df = pd.read_excel(file_path)
-    else:
-        raise ValueError(f"Format non pris en charge : {file_path.suffix}")
-
-    print(f"✅ Chargé → {len(df)} lignes, {len(df.columns)} colonnes")
-    df = clean_dataframe(df)
-    print(f"✅ Nettoyé  → {len(df)} lignes, {len(df.columns)} colonnes")
-
-    cleaned_path = CLEANED_DIR / f"{file_path.stem}_cleaned.xlsx"
-    df.to_excel(cleaned_path, index=False)
-    print(f"🎉 Exporté  → {cleaned_path}")
-    return cleaned_path
+def clean_file(
+    file_path: Path,
+    *,
+    chunked: bool | None = None,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    fmt: str | None = None,
+    sort: str = SORT_POLICY,
+    sort_keys: list[str] | None = None,
+    use_cache: bool = True,
+    stats: dict | None = None,
+    cleaned_dir: str | Path = CLEANED_DIR,
+    progress: CleanProgressFn | None = None,
+    sheet: excel_reader.Sheet = 0,
+    usecols: list[str | int] | None = None,
+) -> Path:
+    """Nettoie `file_path` et retourne le chemin du fichier nettoyé.
+
+    `chunked=None` choisit le mode par blocs (`clean_file_chunked`) pour les
+    CSV/ZIP de plus de `CHUNKED_THRESHOLD_MB` Mo (classeurs : `EXCEL_CHUNKED_THRESHOLD_MB`) ;
+    True/False le force.
+    Classeurs : `sheet` (nom ou position) et `usecols` (noms ou positions)
+    choisissent la feuille et les colonnes lues ; l'en-tête est repéré sous
+    les éventuelles lignes de titre (`excel_reader`).
+    `fmt` : "parquet" (défaut, `CLEANED_FORMAT`), "feather", "csv" ou "xlsx".
+    `sort` / `sort_keys` : ordre des lignes (voir `SORT_POLICY`).
+    Avec `use_cache`, un brut déjà nettoyé avec les mêmes options et la même
+    `CLEANER_VERSION` renvoie directement le fichier existant (`clean_cache`).
+    `stats`, s'il est fourni, reçoit rows_in, rows_out, renamed et cached.
+    La sortie va dans `cleaned_dir` (espace de travail de la session…) ; deux
+    nettoyages vers le même fichier sont sérialisés par un verrou.
+    `progress(étape, pourcentage)` suit les étapes de `STAGES` ; il peut
+    interrompre le nettoyage en levant une exception (annulation d'un
+    travail de fond) : aucun fichier partiel n'est alors laissé.
+    """
+    stats = {} if stats is None else stats
+    report = progress or (lambda stage, percent: None)
+    report("lecture", 0)
+    # Contrôle express : une page HTML enregistrée en .csv ne mérite pas un nettoyage complet
+    with file_path.open("rb") as f:
+        try:
+            kind = check_payload(f.read(SNIFF_BYTES))
+        except PayloadError as e:
+            hint = f" – réimportez depuis {e.redirect}" if e.redirect else ""
+            raise PayloadError(f"{file_path.name} : {e}{hint}", redirect=e.redirect) from None
+
+    excel = file_path.suffix.lower() in EXCEL_EXTS
+    if chunked is None:
+        limit_mb = EXCEL_CHUNKED_THRESHOLD_MB if excel else CHUNKED_THRESHOLD_MB
+        chunked = file_path.stat().st_size > limit_mb * 1024 * 1024
+    chunked = chunked and (kind == "zip" or excel or file_path.suffix.lower() == ".csv")
+    fmt = _resolve_format(fmt)
+    sort_columns([], sort)  # politique inconnue → erreur avant toute lecture
+
+    out_path = output_path(file_path.stem, fmt, cleaned_dir)
+    with workspace.file_lock(out_path):
+        key = None
+        if use_cache:
+            options = {
+                "fmt": fmt,
+                "chunked": chunked,
+                "sort": sort,
+                "sort_keys": list(sort_keys or []) if sort == "keys" else None,
+                "columns": column_registry.get_registry().version,  # synonymes de colonnes
+                "stem": file_path.stem,  # la sortie porte le nom du brut
+                "out_dir": str(Path(cleaned_dir).resolve()),  # un espace de travail ne sert pas celui d'un autre
+                "sheet": sheet if excel else None,
+                "usecols": list(usecols) if excel and usecols else None,
+            }
+            key = clean_cache.cache_key(file_path, options, CLEANER_VERSION)
+            cached = clean_cache.get(key)
+            if cached:
+                stats.update(clean_cache.meta(key), cached=True)
+                report("écrit", 100)
+                print(f"⚡ Brut inchangé depuis le dernier nettoyage → {cached}")
+                return cached
+
+        if chunked:
+            cleaned_path = clean_file_chunked(
+                file_path, memory_mb=memory_mb, fmt=fmt, sort=sort, sort_keys=sort_keys, stats=stats,
+                cleaned_dir=cleaned_dir, progress=progress, sheet=sheet, usecols=usecols,
+            )
+        else:
+            if kind == "zip":
+                df = read_zip_csv(file_path)
+            elif file_path.suffix.lower() == ".csv":
+                df = pd.read_csv(file_path, **probe(file_path).read_csv_kwargs())
+            elif excel:
+                df = excel_reader.read_excel(file_path, sheet=sheet, usecols=usecols)
+            else:
+                raise ValueError(f"Format non pris en charge : {file_path.suffix}")
+
+            print(f"✅ Chargé → {len(df)} lignes, {len(df.columns)} colonnes")
+            report("chargé", 40)
+            stats["rows_in"] = len(df)
+            df = clean_dataframe(df, sort=sort, sort_keys=sort_keys)
+            stats["rows_out"] = len(df)
+            stats["renamed"] = df.attrs.get("renamed", {})
+            _report_renamed(stats["renamed"])
+            print(f"✅ Nettoyé  → {len(df)} lignes, {len(df.columns)} colonnes")
+            report("nettoyé", 70)
+            report("écriture", 75)
+
+            cleaned_path = write_cleaned(df, file_path.stem, fmt, cleaned_dir)
+            print(f"🎉 Exporté  → {cleaned_path}")
+            report("écrit", 100)
+
+        stats["cached"] = False
+        if key:
+            counts = {k: stats.get(k) for k in ("rows_in", "rows_out", "renamed")}
+            clean_cache.put(key, cleaned_path, meta=counts)
+        return cleaned_path
 
 # ──────────────────────────── MAIN ──────────────────────────────────
 
-def main(file_path: str | Path | None = None) -> Path:
-    """Interface publique pour le pipeline."""
+def main(
+    file_path: str | Path | None = None,
+    *,
+    chunked: bool | None = None,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    fmt: str | None = None,
+    sort: str = SORT_POLICY,
+    sort_keys: list[str] | None = None,
+    use_cache: bool = True,
+    raw_dir: str | Path = RAW_DIR,
+    cleaned_dir: str | Path = CLEANED_DIR,
+    progress: CleanProgressFn | None = None,
+    sheet: excel_reader.Sheet = 0,
+    usecols: list[str | int] | None = None,
+) -> Path:
+    """Interface publique pour le pipeline.
+
+    L'interface web passe le chemin du brut de la session et son dossier de
+    sortie (`workspace`) ; sans `file_path`, le dernier import noté dans
+    `data/last_imported.txt` est utilisé (usage CLI, un seul utilisateur).
+    """
     ensure_dirs()
-    raw_file = _resolve_input(file_path)
-    return clean_file(raw_file)
+    Path(cleaned_dir).mkdir(parents=True, exist_ok=True)
+    raw_file = _resolve_input(file_path, raw_dir)
+    return clean_file(
+        raw_file,
+        chunked=chunked,
+        memory_mb=memory_mb,
+        fmt=fmt,
+        sort=sort,
+        sort_keys=sort_keys,
+        use_cache=use_cache,
+        cleaned_dir=cleaned_dir,
+        progress=progress,
+        sheet=sheet,
+        usecols=usecols,
+    )
 
 # ────────────────────────── EXÉCUTION CLI ───────────────────────────
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""column_registry.py
+
+Registre des noms de colonnes canoniques (annee, mois, region, revenu…).
+
+Les synonymes viennent de `data/canonical_columns.json` :
+    {"annee": ["année", "an", "year"], "region": ["région", "reg"], ...}
+Pour ajouter un synonyme, on édite ce fichier : aucun code à toucher. Sans
+fichier, `DEFAULT_SYNONYMS` s'applique.
+
+Tous les synonymes sont normalisés une seule fois (minuscules, accents
+retirés, ponctuation → « _ ») dans un index :
+    • correspondance exacte ou sans accents : une lecture de dictionnaire ;
+    • sinon, recherche floue (difflib) bornée aux synonymes de longueur
+      compatible avec le seuil `FUZZY_CUTOFF`, et jamais pour les noms
+      plus longs que `FUZZY_MAX_LEN` ;
+    • chaque nom déjà résolu est mémorisé : les fichiers suivants qui
+      partagent les mêmes colonnes ne refont aucun calcul.
+
+`rename_columns(df)` renomme et note les décisions dans
+`df.attrs["renamed"]` ; `plan(columns)` détaille la méthode et le score.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import math
+import re
+import threading
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+CONFIG_PATH = Path("data/canonical_columns.json")
+DEFAULT_SYNONYMS: dict[str, list[str]] = {
+    "annee": ["annee", "année", "an", "year"],
+    "mois": ["mois", "month"],
+    "region": ["region", "région", "reg"],
+    "revenu": ["revenu", "income", "revenu_menage"],
+}
+FUZZY_CUTOFF = 0.8
+FUZZY_MAX_LEN = 40     # au-delà, un nom de colonne n'est comparé qu'exactement
+MEMO_SIZE = 10_000
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(name: str) -> str:
+    """« Année de référence » → « annee_de_reference »."""
+    folded = unicodedata.normalize("NFKD", str(name))
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub("_", folded.lower()).strip("_")
+
+
+class ColumnRegistry:
+    """Index de synonymes → nom canonique, avec mémoire des résolutions."""
+
+    def __init__(self, synonyms: dict[str, list[str]], *, cutoff: float = FUZZY_CUTOFF):
+        self.synonyms = {canon: list(variants) for canon, variants in synonyms.items()}
+        self.cutoff = cutoff
+        self.version = hashlib.sha256(
+            json.dumps([self.synonyms, cutoff], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+        self._exact: dict[str, str] = {}    # synonyme tel quel → canonique
+        self._folded: dict[str, str] = {}   # synonyme normalisé → canonique
+        for canon, variants in self.synonyms.items():
+            for variant in [canon, *variants]:
+                self._exact.setdefault(variant, canon)
+                self._folded.setdefault(normalize(variant), canon)
+        self._by_len: dict[int, list[str]] = {}
+        for key in self._folded:
+            self._by_len.setdefault(len(key), []).append(key)
+
+        self._memo: dict[str, tuple[str | None, str | None, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str | Path = CONFIG_PATH) -> "ColumnRegistry":
+        path = Path(path)
+        if not path.exists():
+            return cls(DEFAULT_SYNONYMS)
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    # ─────────────────────────── Résolution ───────────────────────────
+
+    def _candidates(self, key: str) -> list[str]:
+        """Synonymes dont la longueur permet d'atteindre le seuil de similarité."""
+        # ratio difflib ≤ 2·min(la, lb) / (la + lb)
+        low = math.ceil(len(key) * self.cutoff / (2 - self.cutoff))
+        high = math.floor(len(key) * (2 - self.cutoff) / self.cutoff)
+        return [k for n in range(low, high + 1) for k in self._by_len.get(n, ())]
+
+    def _lookup(self, column: str) -> tuple[str | None, str | None, float]:
+        if column in self._exact:
+            return self._exact[column], "exact", 1.0
+        key = normalize(column)
+        if key in self._folded:
+            return self._folded[key], "sans_accents", 1.0
+        if not key or len(key) > FUZZY_MAX_LEN:
+            return None, None, 0.0
+        best = difflib.get_close_matches(key, self._candidates(key), n=1, cutoff=self.cutoff)
+        if not best:
+            return None, None, 0.0
+        score = difflib.SequenceMatcher(None, key, best[0]).ratio()
+        return self._folded[best[0]], "approchant", round(score, 3)
+
+    def resolve(self, column: str) -> tuple[str | None, str | None, float]:
+        """(nom canonique ou None, méthode, score) pour un nom de colonne."""
+        with self._lock:
+            hit = self._memo.get(column)
+        if hit is not None:
+            return hit
+        hit = self._lookup(column)
+        with self._lock:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[column] = hit
+        return hit
+
+    def plan(self, columns: list[str]) -> list[dict]:
+        """Décisions de renommage pour `columns`.
+
+        Une colonne déjà canonique n'est jamais renommée, et deux colonnes ne
+        peuvent pas recevoir le même nom : la seconde garde le sien
+        (méthode « conflit »).
+        """
+        taken = {c for c in columns if c in self.synonyms}
+        decisions = []
+        for col in columns:
+            if col in self.synonyms:
+                continue
+            canon, how, score = self.resolve(col)
+            if canon is None:
+                continue
+            if canon in taken:
+                decisions.append({"column": col, "canonical": canon, "match": "conflit", "score": score})
+                continue
+            taken.add(canon)
+            decisions.append({"column": col, "canonical": canon, "match": how, "score": score})
+        return decisions
+
+    def rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Renomme les colonnes reconnues ; les décisions vont dans `df.attrs["renamed"]`."""
+        decisions = [d for d in self.plan(df.columns.to_list()) if d["match"] != "conflit"]
+        if not decisions:
+            return df
+        df = df.rename(columns={d["column"]: d["canonical"] for d in decisions})
+        df.attrs["renamed"] = {d["column"]: d["canonical"] for d in decisions}
+        return df
+
+# ─────────────────────────── Registre partagé ───────────────────────
+
+_registry: ColumnRegistry | None = None
+_registry_stamp: float | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ColumnRegistry:
+    """Registre du processus, relu si `CONFIG_PATH` a changé."""
+    global _registry, _registry_stamp
+    stamp = CONFIG_PATH.stat().st_mtime if CONFIG_PATH.exists() else None
+    with _registry_lock:
+        if _registry is None or stamp != _registry_stamp:
+            _registry = ColumnRegistry.from_file(CONFIG_PATH)
+            _registry_stamp = stamp
+        return _registry
+
+
+def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return get_registry().rename_columns(df)
@@ -0,0 +1,119 @@
+"""downsample.py
+
+Réduction du nombre de points avant le tracé, pour que le temps de rendu
+matplotlib reste borné quelle que soit la taille du tableau.
+
+    • courbes : LTTB (Largest-Triangle-Three-Buckets) — garde, dans chaque
+      tranche, le point qui forme le plus grand triangle avec ses voisins :
+      pics et creux sont conservés, contrairement à un simple sous-échantillon ;
+    • nuages de points : densité sur une grille — chaque case non vide
+      devient un point dont l'opacité suit le nombre d'observations ;
+    • axe X non numérique : un point sur k, à intervalle régulier.
+
+Toutes les fonctions rendent les positions à tracer et un dictionnaire
+`info` (points_in, points_out, budget, method) affiché dans l'interface.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+POINT_BUDGET = 5000   # points tracés au plus par série (0 ou None : pas de réduction)
+
+
+def _info(n_in: int, n_out: int, budget: int | None, method: str) -> dict:
+    return {"points_in": n_in, "points_out": n_out, "budget": budget, "method": method}
+
+
+def as_numeric(values: pd.Series) -> np.ndarray | None:
+    """Axe X en float64 (dates → nanosecondes) ; None si l'axe n'est pas ordonnable."""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        out = values.to_numpy("datetime64[ns]").astype("int64").astype("float64")
+        out[values.isna().to_numpy()] = np.nan  # NaT deviendrait un entier très négatif
+        return out
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return None
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices des `n_out` points retenus par LTTB (`x` croissant, sans NaN)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = x - x[0]  # aires invariantes par translation ; sommes cumulées plus précises (dates en ns)
+    # Tranches intérieures : le premier et le dernier point sont toujours gardés
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Moyenne de chaque tranche (calculée d'un bloc par sommes cumulées)
+    cx, cy = np.concatenate([[0.0], np.cumsum(x)]), np.concatenate([[0.0], np.cumsum(y)])
+    counts = np.maximum(edges[1:] - edges[:-1], 1)
+    mean_x = (cx[edges[1:]] - cx[edges[:-1]]) / counts
+    mean_y = (cy[edges[1:]] - cy[edges[:-1]]) / counts
+    mean_x = np.append(mean_x, x[-1])
+    mean_y = np.append(mean_y, y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        bx, by = x[lo:hi], y[lo:hi]
+        # aire (×2) du triangle (point retenu précédent, candidat, moyenne de la tranche suivante)
+        area = np.abs((x[a] - mean_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (mean_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def reduce_line(x: pd.Series, y: pd.Series, budget: int | None = POINT_BUDGET) -> tuple[pd.Series, pd.Series, dict]:
+    """Série (x déjà trié) réduite à `budget` points pour une courbe."""
+    n = len(x)
+    if not budget or n <= budget:
+        return x, y, _info(n, n, budget, "aucune")
+    xs = as_numeric(x)
+    if xs is None:
+        idx = np.linspace(0, n - 1, budget).astype(np.int64)
+        return x.iloc[idx], y.iloc[idx], _info(n, len(idx), budget, "pas régulier")
+    ys = y.to_numpy(dtype="float64", na_value=np.nan)
+    keep = ~(np.isnan(xs) | np.isnan(ys))
+    pos = np.flatnonzero(keep)
+    idx = pos[lttb(xs[keep], ys[keep], budget)]
+    return x.iloc[idx], y.iloc[idx], _info(n, len(idx), budget, "LTTB")
+
+
+def bin_scatter(x: pd.Series, y: pd.Series, budget: int | None = POINT_BUDGET) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+    """Nuage réduit à au plus `budget` cases : (x, y, effectifs, info).
+
+    Sans réduction (petit tableau, axe non numérique), les effectifs valent 1.
+    """
+    n = len(x)
+    xs, ys = as_numeric(x), as_numeric(y)
+    if not budget or n <= budget or xs is None or ys is None:
+        if budget and n > budget:  # axe catégoriel : sous-échantillon régulier
+            idx = np.linspace(0, n - 1, budget).astype(np.int64)
+            return x.iloc[idx].to_numpy(), y.iloc[idx].to_numpy(), np.ones(len(idx)), _info(n, len(idx), budget, "pas régulier")
+        return x.to_numpy(), y.to_numpy(), np.ones(n), _info(n, n, budget, "aucune")
+    keep = ~(np.isnan(xs) | np.isnan(ys))
+    if not keep.any():  # aucun point traçable : rien à regrouper
+        return np.empty(0), np.empty(0), np.empty(0), _info(n, 0, budget, "aucune")
+    xs, ys = xs[keep], ys[keep]
+    side = max(2, int(np.sqrt(budget)))
+    counts, ex, ey = np.histogram2d(xs, ys, bins=side)
+    ix, iy = np.nonzero(counts)
+    cx = (ex[ix] + ex[ix + 1]) / 2
+    cy = (ey[iy] + ey[iy + 1]) / 2
+    if pd.api.types.is_datetime64_any_dtype(x.dtype):
+        cx = cx.astype("int64").astype("datetime64[ns]")
+    if pd.api.types.is_datetime64_any_dtype(y.dtype):
+        cy = cy.astype("int64").astype("datetime64[ns]")
+    return cx, cy, counts[ix, iy], _info(n, len(ix), budget, "densité")
+
+
+def sample_rows(df: pd.DataFrame, budget: int | None = POINT_BUDGET) -> tuple[pd.DataFrame, dict]:
+    """Sous-échantillon régulier de lignes (nuage 3D…)."""
+    n = len(df)
+    if not budget or n <= budget:
+        return df, _info(n, n, budget, "aucune")
+    idx = np.linspace(0, n - 1, budget).astype(np.int64)
+    return df.iloc[idx], _info(n, len(idx), budget, "pas régulier")
@@ -1,11 +1,13 @@
-import csv
-import difflib
 import sys
 from pathlib import Path
 
 import pandas as pd
 import janitor  # pip install pyjanitor
-from chardet import detect
+
+import excel_reader
+from column_registry import rename_columns
+from workspace import atomic_write
+from file_probe import probe  # encodage, séparateur, décimale : sondage partagé avec clean_data
 
 # ------------------------------------------------------------------
 # Paramètres chemins (modifier ici si besoin)
@@ -18,49 +20,13 @@ OUTPUT_DIR = Path(
 ).resolve()
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# ------------------------------------------------------------------
-# Dictionnaire de noms de colonnes attendus (à étendre si besoin)
-# ------------------------------------------------------------------
-CANONICAL_COLS = {
-    "année": ["annee", "année", "an", "year"],
-    "mois": ["mois", "month"],
-    "région": ["region", "région", "reg"],
-    "revenu": ["revenu", "income", "revenu_menage"],
-}
-
-# ------------------------------------------------------------------
-# Helpers encodage & séparateur -------------------------------------------------
-# ------------------------------------------------------------------
-
-def detect_encoding(csv_path: Path, n_bytes: int = 10000) -> str:
-    """Détecte l’encodage probable d’un CSV."""
-    with open(csv_path, "rb") as f:
-        rawdata = f.read(n_bytes)
-    return detect(rawdata)["encoding"] or "utf-8"
-
-def detect_delimiter(csv_path: Path, encoding: str) -> str:
-    """Tente de deviner le délimiteur en ignorant les virgules numériques."""
-    with open(csv_path, encoding=encoding) as f:
-        sample = f.read(2048)
-    delimiter = csv.Sniffer().sniff(sample).delimiter
-    return delimiter
-
 # ------------------------------------------------------------------
 # Nettoyage --------------------------------------------------------------------
 # ------------------------------------------------------------------
 
 def fuzzy_rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Renomme les colonnes mal orthographiées via fuzzy‑matching."""
-    rename_map = {}
-    for canon, variants in CANONICAL_COLS.items():
-        for col in df.columns:
-            if col in variants:
-                rename_map[col] = canon
-            else:
-                best = difflib.get_close_matches(col, variants, n=1, cutoff=0.8)
-                if best:
-                    rename_map[col] = canon
-    return df.rename(columns=rename_map)
+    """Renomme les colonnes mal orthographiées (synonymes : data/canonical_columns.json)."""
+    return rename_columns(df)
 
 def clean_dataframe(df: pd.DataFrame, min_year: int | None = None) -> pd.DataFrame:
     """Pipeline de nettoyage façon Power Query."""
@@ -96,11 +62,9 @@ def main():
 
     # Chargement
     if path.suffix.lower() in {".xlsx", ".xls"}:
-        df = pd.read_excel(path)
+        df = excel_reader.read_excel(path)  # calamine si installé, sinon openpyxl en lecture seule
     elif path.suffix.lower() == ".csv":
-        enc = detect_encoding(path)
-        delim = detect_delimiter(path, enc)
-        df = pd.read_csv(path, encoding=enc, delimiter=delim)
+        df = pd.read_csv(path, **probe(path).read_csv_kwargs())
     else:
         sys.exit("❌ Type de fichier non pris en charge (.csv, .xlsx, .xls)")
 
@@ -112,7 +76,8 @@ def main():
 
     # Sauvegarde
     output_path = OUTPUT_DIR / f"{path.stem}_cleaned.xlsx"
-    df.to_excel(output_path, index=False)
+    with atomic_write(output_path) as tmp:  # jamais de .xlsx à moitié écrit
+        df.to_excel(tmp, index=False)
     print(f"🎉 Cleaned file saved to → {output_path}")
 
 if __name__ == "__main__":
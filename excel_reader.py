@@ -0,0 +1,260 @@
+"""excel_reader.py
+
+Lecture rapide des classeurs Excel (.xlsx, .xls), par blocs de lignes.
+
+`pd.read_excel(path)` passe chaque cellule de la feuille par openpyxl, styles
+compris, et rend tout le tableau d'un coup. Ici :
+    • moteur `calamine` (Rust, paquet `python-calamine`) s'il est installé,
+      plusieurs fois plus rapide ; sinon openpyxl en lecture seule
+      (`read_only=True, data_only=True` : valeurs seulement, ligne à ligne) ;
+      un .xls sans calamine passe par pandas (xlrd) ;
+    • `sheet` : feuille choisie par nom ou par position (0 : la première) ;
+    • `header="auto"` : la ligne d'en-tête est repérée parmi les
+      `HEADER_SCAN_ROWS` premières (les titres et notes placés au-dessus
+      du tableau, comme dans les exports StatCan, sont sautés) ; un entier
+      la donne explicitement, None : pas d'en-tête ;
+    • `usecols` : noms ou positions des colonnes à garder — les autres
+      n'entrent jamais dans un DataFrame ;
+    • `iter_chunks` rend des DataFrame de `chunksize` lignes, consommés par
+      le nettoyage par blocs de `clean_data` comme un CSV ; `read_excel`
+      les assemble pour le nettoyage en mémoire.
+
+    for chunk in excel_reader.iter_chunks("data/raw/data_7.xlsx", usecols=["geo", "valeur"]):
+        ...
+
+Dépendances : pip install openpyxl   (optionnel, recommandé : python-calamine)
+"""
+
+from __future__ import annotations
+
+import sys
+from itertools import chain, islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+    HAS_CALAMINE = True
+except ImportError:  # repli : openpyxl en lecture seule
+    HAS_CALAMINE = False
+
+CHUNK_ROWS = 50_000       # lignes par bloc rendu par `iter_chunks`
+HEADER_SCAN_ROWS = 30     # lignes examinées pour trouver l'en-tête
+HEADER_MIN_FILL = 0.6     # part minimale de cellules remplies (texte) d'une ligne d'en-tête
+
+Sheet = str | int
+
+# ─────────────────────────── Moteurs ──────────────────────────────
+
+def engine(path: str | Path) -> str:
+    """Moteur utilisé pour `path` : "calamine", "openpyxl" ou "xlrd"."""
+    if HAS_CALAMINE:
+        return "calamine"
+    return "xlrd" if Path(path).suffix.lower() == ".xls" else "openpyxl"
+
+
+def sheet_names(path: str | Path) -> list[str]:
+    """Noms des feuilles du classeur, dans l'ordre."""
+    kind = engine(path)
+    if kind == "calamine":
+        return list(CalamineWorkbook.from_path(str(path)).sheet_names)
+    if kind == "openpyxl":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+    return list(pd.ExcelFile(path).sheet_names)
+
+
+def _sheet_name(names: list[str], sheet: Sheet) -> str:
+    if isinstance(sheet, int):
+        if not -len(names) <= sheet < len(names):
+            raise ValueError(f"Feuille n° {sheet} absente ({len(names)} feuilles)")
+        return names[sheet]
+    if sheet not in names:
+        raise ValueError(f"Feuille « {sheet} » absente (feuilles : {', '.join(names)})")
+    return sheet
+
+
+def iter_rows(path: str | Path, sheet: Sheet = 0) -> Iterator[tuple]:
+    """Lignes brutes (tuples de valeurs Python, None pour une cellule vide) de la feuille."""
+    kind = engine(path)
+    if kind == "calamine":
+        wb = CalamineWorkbook.from_path(str(path))
+        ws = wb.get_sheet_by_name(_sheet_name(list(wb.sheet_names), sheet))
+        for row in ws.iter_rows():
+            yield tuple(None if v == "" else v for v in row)  # calamine : "" pour une cellule vide
+    elif kind == "openpyxl":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[_sheet_name(list(wb.sheetnames), sheet)]
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        df = pd.read_excel(path, sheet_name=sheet, header=None, dtype=object)
+        yield from df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def row_count(path: str | Path, sheet: Sheet = 0) -> int | None:
+    """Nombre de lignes de la feuille d'après ses dimensions déclarées (None si inconnu)."""
+    kind = engine(path)
+    if kind == "calamine":
+        wb = CalamineWorkbook.from_path(str(path))
+        return wb.get_sheet_by_name(_sheet_name(list(wb.sheet_names), sheet)).height
+    if kind == "openpyxl":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True)
+        try:
+            return wb[_sheet_name(list(wb.sheetnames), sheet)].max_row
+        finally:
+            wb.close()
+    return None
+
+# ─────────────────────────── En-tête ──────────────────────────────
+
+def _filled(row: tuple) -> int:
+    return sum(v is not None and str(v).strip() != "" for v in row)
+
+
+def detect_header(rows: Sequence[tuple]) -> int:
+    """Position de la ligne d'en-tête parmi `rows` (0 si rien de plus probable).
+
+    L'en-tête est la première ligne entièrement textuelle dont le nombre de
+    cellules remplies atteint `HEADER_MIN_FILL` de la ligne la plus remplie :
+    un titre ou une note (une seule cellule) ne la remplace pas.
+    """
+    widest = max((_filled(r) for r in rows), default=0)
+    for i, row in enumerate(rows):
+        values = [v for v in row if v is not None and str(v).strip() != ""]
+        if len(values) >= max(1, HEADER_MIN_FILL * widest) and all(isinstance(v, str) for v in values):
+            return i
+    return 0
+
+
+def _column_names(row: tuple) -> list[str]:
+    """Noms de colonnes d'une ligne d'en-tête ; vides et doublons nommés comme pandas."""
+    names, seen = [], {}
+    for i, v in enumerate(row):
+        name = str(v).strip() if v is not None and str(v).strip() else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _select(names: list[str], usecols: Sequence[str | int] | None) -> list[int]:
+    if usecols is None:
+        return list(range(len(names)))
+    idx = []
+    for col in usecols:
+        if isinstance(col, int):
+            if not 0 <= col < len(names):
+                raise ValueError(f"Colonne n° {col} absente ({len(names)} colonnes)")
+            idx.append(col)
+        elif col in names:
+            idx.append(names.index(col))
+        else:
+            raise ValueError(f"Colonne « {col} » absente de la feuille")
+    return idx
+
+# ─────────────────────────── Lecture ──────────────────────────────
+
+def _frame(rows: list[tuple], columns: list) -> pd.DataFrame:
+    """DataFrame d'un bloc ; une colonne de réels tous entiers redevient entière.
+
+    Excel ne stocke que des réels : calamine rend 2020.0 là où openpyxl (et
+    `pd.read_excel`) rendent 2020.
+    """
+    df = pd.DataFrame(rows, columns=columns)
+    for col in df.columns[(df.dtypes == "float64").to_numpy()]:
+        values = df[col].to_numpy()
+        if not np.isnan(values).any() and (np.mod(values, 1) == 0).all() and np.abs(values).max(initial=0) < 2**53:
+            df[col] = values.astype(np.int64)
+    return df
+
+
+def iter_chunks(
+    path: str | Path,
+    *,
+    sheet: Sheet = 0,
+    header: int | str | None = "auto",
+    usecols: Sequence[str | int] | None = None,
+    chunksize: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Feuille `sheet` de `path` en DataFrame successifs de `chunksize` lignes au plus.
+
+    Les lignes entièrement vides sont sautées ; les types sont déduits bloc
+    par bloc (comme `pd.read_csv(chunksize=…)`). Un en-tête sans aucune
+    ligne de données donne un seul bloc vide, qui porte les colonnes.
+    """
+    rows = iter_rows(path, sheet)
+    head = list(islice(rows, HEADER_SCAN_ROWS))
+    if header == "auto":
+        header = detect_header(head)
+    if header is None:
+        width = max((len(r) for r in head), default=0)
+        names = list(range(width))
+        body = head
+    else:
+        if header >= len(head):  # en-tête explicite au-delà des lignes déjà lues
+            head += list(islice(rows, header + 1 - len(head)))
+        if header >= len(head):
+            return
+        names = _column_names(head[header])
+        width = len(names)
+        body = head[header + 1:]
+    idx = _select(names, usecols)
+    columns = [names[i] for i in idx]
+    if not idx:
+        return
+    pick = itemgetter(*idx)
+    single = len(idx) == 1
+
+    def project(row: tuple) -> tuple:
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        values = pick(row)
+        return (values,) if single else values
+
+    batch: list[tuple] = []
+    yielded = False
+    for row in chain(body, rows):
+        values = project(row)
+        if all(v is None for v in values):
+            continue
+        batch.append(values)
+        if len(batch) >= chunksize:
+            yield _frame(batch, columns)
+            batch, yielded = [], True
+    if batch or not yielded:
+        yield _frame(batch, columns)
+
+
+def read_excel(
+    path: str | Path,
+    *,
+    sheet: Sheet = 0,
+    header: int | str | None = "auto",
+    usecols: Sequence[str | int] | None = None,
+) -> pd.DataFrame:
+    """Feuille entière en un DataFrame (mêmes options que `iter_chunks`).
+
+    Un seul bloc : les types sont déduits sur toute la colonne. Une feuille
+    réduite à son en-tête donne un tableau vide qui garde ses colonnes.
+    """
+    chunk = next(iter_chunks(path, sheet=sheet, header=header, usecols=usecols, chunksize=sys.maxsize), None)
+    return pd.DataFrame() if chunk is None else chunk
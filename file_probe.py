@@ -0,0 +1,224 @@
+"""file_probe.py
+
+Sondage unique d'un fichier CSV : encodage, séparateur, séparateur décimal,
+ligne d'en-tête et lignes de préambule à sauter.
+
+Le fichier n'est ouvert qu'une fois. Quelques blocs sont lus (début,
+milieu(x), fin) :
+    • encodage : BOM (UTF-8 / UTF-16), puis décodage UTF-8 strict des blocs ;
+      chardet n'est consulté que si ces voies rapides échouent ;
+    • séparateur : chaque candidat (`DELIMITERS`) est noté sur la régularité
+      du nombre de colonnes d'une ligne à l'autre, dans chaque bloc ;
+      contrairement à `csv.Sniffer`, une virgule décimale française
+      (« 12,5 » dans un fichier séparé par « ; ») ne le trompe pas ;
+    • décimale : « , » si les nombres à virgule dominent les nombres à point,
+      avec leur séparateur de milliers éventuel (espace, point…) ;
+    • en-tête : première ligne qui ressemble à une ligne du tableau (les
+      titres StatCan placés au-dessus sont sautés).
+
+Le résultat est mémorisé par (chemin, taille, mtime) : nettoyage, lecture
+par blocs et estimation de taille de bloc réutilisent le même sondage.
+
+    p = probe("data/raw/data_18.csv")
+    df = pd.read_csv("data/raw/data_18.csv", **p.read_csv_kwargs())
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import chardet
+
+DELIMITERS = (",", ";", "\t", "|")
+BLOCK_BYTES = 32 * 1024       # taille d'un bloc échantillonné
+SAMPLE_BLOCKS = 4             # début + milieux + fin
+CHARDET_BYTES = 10_000        # échantillon donné à chardet en dernier recours
+MAX_PREAMBLE = 20             # lignes de titre tolérées avant l'en-tête
+MAX_LINES = 200               # lignes analysées par bloc
+CACHE_SIZE = 256
+
+# Séparateur de milliers dans « 1 234,5 », « 1.234,5 », « 1,234.5 » (espaces insécables compris)
+_THOUSANDS = re.compile("\\d([ .,\u00a0\u202f])\\d{3}(?!\\d)")
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+@dataclass(frozen=True)
+class Probe:
+    encoding: str
+    delimiter: str
+    decimal: str = "."
+    thousands: str | None = None
+    header_row: int = 0   # n° (0-based) de la ligne d'en-tête dans le fichier
+    skiprows: int = 0     # lignes de préambule à sauter avant l'en-tête
+    columns: int = 0      # nombre de colonnes détecté
+
+    def read_csv_kwargs(self) -> dict:
+        """Arguments à passer tels quels à `pd.read_csv`."""
+        return {
+            "encoding": self.encoding,
+            "sep": self.delimiter,
+            "decimal": self.decimal,
+            # le lecteur C de pandas compare des octets : une espace insécable (2 octets en
+            # UTF-8) ne peut pas servir de séparateur de milliers, la colonne reste du texte
+            "thousands": self.thousands if self.thousands and self.thousands.isascii() else None,
+            "skiprows": self.skiprows or None,
+        }
+
+
+_cache: OrderedDict[tuple, Probe] = OrderedDict()
+_lock = threading.Lock()
+
+# ─────────────────────────── Lecture ──────────────────────────────
+
+def _read_blocks(path: Path, size: int) -> list[bytes]:
+    """Blocs échantillonnés, du début à la fin du fichier (un seul bloc si petit)."""
+    with path.open("rb") as f:
+        if size <= BLOCK_BYTES * SAMPLE_BLOCKS:
+            return [f.read()]
+        blocks = []
+        step = (size - BLOCK_BYTES) // (SAMPLE_BLOCKS - 1)
+        for i in range(SAMPLE_BLOCKS):
+            f.seek(i * step)
+            blocks.append(f.read(BLOCK_BYTES))
+        return blocks
+
+
+def _whole_lines(block: bytes, first: bool, last: bool) -> bytes:
+    """Retire les lignes coupées aux bords d'un bloc lu au milieu du fichier."""
+    if not first:
+        block = block[block.find(b"\n") + 1:]
+    if not last:
+        block = block[:block.rfind(b"\n") + 1]
+    return block
+
+# ─────────────────────────── Encodage ─────────────────────────────
+
+def _encoding_of(blocks: list[bytes], complete: bool = True) -> str:
+    head = blocks[0]
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    try:
+        for i, block in enumerate(blocks):
+            # bords d'un bloc : un caractère multi-octets peut être coupé
+            last = complete and i == len(blocks) - 1
+            _whole_lines(block, first=i == 0, last=last).decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    return chardet.detect(head[:CHARDET_BYTES])["encoding"] or "cp1252"
+
+# ─────────────────────────── Structure ────────────────────────────
+
+def _field_counts(lines: list[str], delimiter: str) -> list[int]:
+    return [len(row) for row in csv.reader(lines, delimiter=delimiter) if row]
+
+
+def _score(texts: list[list[str]], delimiter: str) -> tuple[float, int]:
+    """(régularité moyenne, nombre de colonnes) d'un séparateur candidat."""
+    consistency, widths = [], Counter()
+    for lines in texts:
+        counts = _field_counts(lines, delimiter)
+        if not counts:
+            continue
+        width, hits = Counter(counts).most_common(1)[0]
+        consistency.append(hits / len(counts) if width > 1 else 0.0)
+        widths[width] += hits
+    if not consistency:
+        return 0.0, 1
+    return sum(consistency) / len(consistency), widths.most_common(1)[0][0]
+
+
+def _numbers(lines: list[str], delimiter: str, decimal: str) -> list[str]:
+    """Cellules numériques à partie décimale `decimal` (recherche sur tout le texte)."""
+    d = re.escape(delimiter)
+    group = "[ .\u00a0\u202f]" if decimal == "," else "[ ,\u00a0\u202f]"
+    pattern = rf'(?:^|{d})"?(-?\d(?:\d|{group}(?=\d))*{re.escape(decimal)}\d+)"?(?={d}|$)'
+    return re.findall(pattern, "\n".join(lines), flags=re.M)
+
+
+def _decimal_of(lines: list[str], delimiter: str) -> tuple[str, str | None]:
+    """(séparateur décimal, séparateur de milliers ou None)."""
+    if delimiter == ",":
+        # une virgule décimale serait forcément entre guillemets : rare, on garde le point
+        return ".", None
+    comma, dot = _numbers(lines, delimiter, ","), _numbers(lines, delimiter, ".")
+    decimal, found = (",", comma) if len(comma) > len(dot) else (".", dot)
+    groups = Counter(m.group(1) for cell in found for m in _THOUSANDS.finditer(cell))
+    thousands = groups.most_common(1)[0][0] if groups else None
+    return decimal, thousands if thousands != decimal else None
+
+
+def _header_row(lines: list[str], delimiter: str, width: int) -> int:
+    """Première ligne qui ressemble à une ligne du tableau, parmi les `MAX_PREAMBLE` premières.
+
+    Un titre n'a qu'une ou deux cellules ; l'en-tête peut en avoir une de
+    moins que les données (séparateur final sur chaque ligne de données).
+    """
+    if width <= 1:
+        return 0
+    for i, row in enumerate(csv.reader(lines[:MAX_PREAMBLE + 1], delimiter=delimiter)):
+        if len(row) > max(1, width // 2):
+            return i
+    return 0
+
+
+def _probe_blocks(blocks: list[bytes], complete: bool = True) -> Probe:
+    """`complete=False` : le dernier bloc est coupé, sa dernière ligne est ignorée."""
+    encoding = _encoding_of(blocks, complete)
+    texts = []
+    for i, block in enumerate(blocks):
+        raw = _whole_lines(block, first=i == 0, last=complete and i == len(blocks) - 1)
+        text = raw.decode(encoding, errors="ignore")
+        if i == 0:
+            text = text.lstrip("\ufeff")
+        texts.append(text.splitlines()[:MAX_LINES])
+
+    scores = {d: _score(texts, d) for d in DELIMITERS}
+    delimiter = max(DELIMITERS, key=lambda d: scores[d])  # régularité, puis nb de colonnes
+    width = scores[delimiter][1]
+    header = _header_row(texts[0], delimiter, width)
+    body = [line for lines in texts for line in lines][header + 1:]
+    decimal, thousands = _decimal_of(body, delimiter)
+    return Probe(
+        encoding=encoding,
+        delimiter=delimiter,
+        decimal=decimal,
+        thousands=thousands,
+        header_row=header,
+        skiprows=header,
+        columns=width,
+    )
+
+# ─────────────────────────── API ──────────────────────────────────
+
+def probe(path: str | Path) -> Probe:
+    """Sondage de `path`, mémorisé tant que sa taille et sa date ne changent pas."""
+    path = Path(path)
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = _probe_blocks(_read_blocks(path, st.st_size))
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def probe_bytes(head: bytes) -> Probe:
+    """Sondage d'un début de flux non repositionnable (membre d'archive ZIP…)."""
+    return _probe_blocks([head], complete=False)
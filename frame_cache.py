@@ -0,0 +1,129 @@
+"""frame_cache.py
+
+Cache mémoire, partagé par tout le processus, des DataFrames lus depuis
+`data/cleaned/`.
+
+Streamlit réexécute tout le script à chaque interaction : sans cache, changer
+la couleur d'un graphe relit le fichier nettoyé. Ici, un fichier n'est lu
+qu'une fois tant qu'il ne change pas :
+    • clé = empreinte SHA-256 du contenu (mémorisée par chemin, taille et
+      mtime : un simple `stat` par réexécution) et colonnes demandées ;
+    • budget mémoire `BUDGET_MB`, éviction du moins récemment utilisé ;
+    • un verrou protège l'index (les sessions Streamlit sont des threads du
+      même processus) et un fichier demandé par deux sessions à la fois
+      n'est lu qu'une fois ;
+    • chaque appel reçoit une copie superficielle : avec le copy-on-write de
+      pandas, un appelant qui modifie « son » tableau ne touche pas celui
+      des autres sessions.
+
+    df = frame_cache.load(path, read_cleaned, columns=["annee", "valeur"])
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+import raw_store
+
+BUDGET_MB = 1024
+
+Loader = Callable[[Path, Optional[list[str]]], pd.DataFrame]
+
+_frames: OrderedDict[tuple, tuple[pd.DataFrame, int]] = OrderedDict()  # clé → (df, octets)
+_digests: dict[tuple, str] = {}        # (chemin, taille, mtime_ns) → sha256
+_loading: dict[tuple, threading.Lock] = {}
+_lock = threading.Lock()
+_budget = BUDGET_MB * 1024 * 1024
+_used = 0
+
+
+def configure(budget_mb: int) -> None:
+    """Change le budget mémoire (évince immédiatement si besoin)."""
+    global _budget
+    with _lock:
+        _budget = budget_mb * 1024 * 1024
+        _evict()
+
+
+def _digest(path: Path) -> str:
+    st = path.stat()
+    stamp = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _lock:
+        sha = _digests.get(stamp)
+    if sha is None:
+        sha = raw_store.hash_file(path)
+        with _lock:
+            for old in [k for k in _digests if k[0] == stamp[0]]:
+                del _digests[old]  # versions précédentes du même fichier
+            _digests[stamp] = sha
+    return sha
+
+
+def _evict() -> None:
+    global _used
+    while _used > _budget and _frames:
+        _, (_, size) = _frames.popitem(last=False)
+        _used -= size
+
+
+def _lookup(key: tuple) -> pd.DataFrame | None:
+    sha, columns = key
+    with _lock:
+        if key in _frames:
+            _frames.move_to_end(key)
+            return _frames[key][0]
+        full = _frames.get((sha, None))
+        # le tableau complet déjà en cache contient la sélection demandée
+        if columns is not None and full is not None and set(columns) <= set(full[0].columns):
+            _frames.move_to_end((sha, None))
+            return full[0][list(columns)]
+    return None
+
+
+def load(path: str | Path, loader: Loader, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """`loader(path, columns)`, servi depuis le cache tant que le fichier n'a pas changé."""
+    global _used
+    path = Path(path)
+    key = (_digest(path), tuple(columns) if columns is not None else None)
+
+    df = _lookup(key)
+    if df is None:
+        with _lock:
+            gate = _loading.setdefault(key, threading.Lock())
+        with gate:  # une seule lecture si plusieurs sessions demandent le même fichier
+            df = _lookup(key)
+            if df is None:
+                df = loader(path, columns)
+                df.attrs["source_sha256"] = key[0]  # identifie le jeu de données (cache d'agrégats…)
+                df.attrs["source_path"] = str(path)
+                size = int(df.memory_usage(deep=True).sum())
+                with _lock:
+                    if size <= _budget and key not in _frames:
+                        _frames[key] = (df, size)
+                        _used += size
+                        _evict()
+        with _lock:
+            _loading.pop(key, None)
+    return df.copy(deep=False)
+
+
+def stats() -> dict:
+    """État du cache : nombre de tableaux, mémoire utilisée et budget (Mo)."""
+    with _lock:
+        return {
+            "frames": len(_frames),
+            "used_mb": round(_used / (1024 * 1024), 1),
+            "budget_mb": round(_budget / (1024 * 1024), 1),
+        }
+
+
+def clear() -> None:
+    global _used
+    with _lock:
+        _frames.clear()
+        _used = 0
@@ -1,22 +1,348 @@
 # ────────────── import_data.py  – Version légère et compatible Streamlit ────────────────
+import hashlib
+import itertools
+import json
 import os
 import shutil
-import requests
+import time
+import zipfile
 from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
 from urllib.parse import urlparse
 
+import requests
+from requests.adapters import HTTPAdapter
+
+import raw_store
+import workspace
+from payload import (  # réexportés : l'API d'import reste inchangée
+    RAW_EXTS,
+    SNIFF_BYTES,
+    PayloadError,
+    check_payload,
+    sniff_payload,
+    statcan_csv_url,
+    statcan_zip_members,
+)
+
 RAW_DIR = Path("data/raw")
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 
+CHUNK_SIZE = 1024 * 1024  # 1 Mo par bloc : mémoire constante quelle que soit la taille
+MAX_RETRIES = 3           # reprises HTTP Range après une coupure réseau
+CONDITIONAL_HEADERS = {"if-none-match", "if-modified-since"}  # première requête seulement
+
+# progress(octets_reçus, octets_totaux | None, octets_par_seconde)
+ProgressFn = Callable[[int, int | None, float], None]
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Session HTTP keep-alive dont le pool accepte `pool_size` connexions par hôte."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 def is_url(string: str) -> bool:
     return string.startswith("http://") or string.startswith("https://")
 
-def add_one_file(source: str, *, final_name: str | None = None, interactive: bool = True) -> str | None:
-    """Ajoute un fichier dans `data/raw` depuis un chemin local ou une URL.
+def _store_zip_metadata(archive: Path) -> Path | None:
+    """Copie (en flux) le CSV de métadonnées à côté de l'archive, sans extraire les données."""
+    with zipfile.ZipFile(archive) as zf:
+        _, meta = statcan_zip_members(zf)
+        if meta is None:
+            return None
+        meta_path = archive.with_name(f"{archive.stem}_metadata.csv")
+        with zf.open(meta) as src, workspace.atomic_write(meta_path) as tmp, open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    return meta_path
+
+def _hash_prefix(path: Path) -> "hashlib._Hash":
+    """SHA-256 en cours sur le début déjà téléchargé (reprise Range)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+    return h
+
+def _part_meta(part: Path) -> Path:
+    return part.with_name(part.name + ".json")
+
+def _write_part_meta(part: Path, url: str, validators: dict[str, str | None]) -> None:
+    """Note l'URL et la version du fichier téléchargé dans `part` (pour une reprise)."""
+    with workspace.atomic_write(_part_meta(part)) as tmp:
+        tmp.write_text(json.dumps({"url": url, **validators}), encoding="utf-8")
+
+def _discard_part(part: Path) -> None:
+    part.unlink(missing_ok=True)
+    _part_meta(part).unlink(missing_ok=True)
+
+def _discard_staging(staging: Path | None) -> None:
+    """Efface le fichier de transit d'un import abandonné et son `.part` éventuel."""
+    if staging is not None:
+        staging.unlink(missing_ok=True)
+        _discard_part(staging.with_name(staging.name + ".part"))
+
+def _resumable(part: Path, url: str) -> tuple[int, str | None]:
+    """(octets déjà reçus, valeur `If-Range`) d'un `.part` reprenable ; sinon il est effacé.
+
+    Reprenable : même URL, et une version connue (ETag, à défaut Last-Modified)
+    pour que le serveur ne complète pas le début d'une autre version du fichier.
+    """
+    if not part.exists():
+        _part_meta(part).unlink(missing_ok=True)
+        return 0, None
+    try:
+        meta = json.loads(_part_meta(part).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        meta = {}
+    version = meta.get("etag") or meta.get("last_modified")
+    offset = part.stat().st_size
+    if meta.get("url") != url or not version or not offset:
+        _discard_part(part)
+        return 0, None
+    return offset, version
+
+def _total_size(response: requests.Response, offset: int) -> int | None:
+    """Taille totale annoncée par le serveur (Content-Range prioritaire)."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
+
+def download_url(
+    url: str,
+    dest: Path,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    timeout: float = 15,
+    max_retries: int = MAX_RETRIES,
+    progress: ProgressFn | None = None,
+    session: requests.Session | None = None,
+    headers: dict[str, str] | None = None,
+    validate: Callable[[bytes], object] | None = None,
+) -> dict:
+    """Télécharge `url` vers `dest` par blocs de `chunk_size` octets.
+
+    - Les octets sont écrits dans `<dest>.part` au fil de l'eau, puis le
+      fichier est renommé en `dest` une fois complet.
+    - L'URL et la version du fichier (ETag / Last-Modified) sont notées dans
+      `<dest>.part.json`. Si un `.part` existe déjà (coupure précédente), le
+      transfert reprend avec `Range` et `If-Range` : un serveur qui
+      l'ignore ou dont le fichier a changé (200) relance du début. Un `.part`
+      d'une autre URL, sans version connue ou refusé (416) est effacé.
+    - `session` permet de réutiliser les connexions d'un pool (voir `make_session`).
+    - `headers` accompagnent chaque requête (User-Agent, authentification…) ;
+      les conditions `If-None-Match` / `If-Modified-Since` ne servent qu'à
+      la première : sur une réponse 304, rien n'est écrit et `not_modified`
+      vaut True.
+    - `validate` reçoit le premier bloc d'un nouveau transfert (voir
+      `check_payload`) ; s'il lève une exception, le transfert est abandonné
+      avant d'écrire quoi que ce soit. Après une reprise, il reçoit le début
+      du fichier complet ; en cas de refus, le `.part` est effacé.
+    - Le SHA-256 est calculé au fil des blocs, sans relire le fichier.
+    - Retourne `{"path", "bytes", "seconds", "bytes_per_sec", "resumed",
+      "not_modified", "sha256", "etag", "last_modified"}`.
+    """
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    http = session or requests
+    started = time.perf_counter()
+    received = 0  # octets réellement transférés pendant cet appel
+    resumed = False
+    attempt = 0
+    validators: dict[str, str | None] = {"etag": None, "last_modified": None}
+    base_headers = {k: v for k, v in (headers or {}).items() if k.lower() not in CONDITIONAL_HEADERS}
+
+    while True:
+        offset, version = _resumable(part, url)
+        if offset:
+            req_headers = {**base_headers, "Range": f"bytes={offset}-", "If-Range": version}
+        else:
+            req_headers = dict(headers or {})
+        try:
+            with http.get(url, headers=req_headers, stream=True, timeout=timeout) as response:
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+                if not offset and response.status_code == 304:
+                    return {
+                        "path": str(dest),
+                        "bytes": 0,
+                        "seconds": time.perf_counter() - started,
+                        "bytes_per_sec": 0.0,
+                        "resumed": False,
+                        "not_modified": True,
+                        "sha256": None,
+                        **validators,
+                    }
+                served = {v for v in validators.values() if v}
+                if offset and (response.status_code == 416 or (
+                    response.status_code == 206 and served and version not in served
+                )):
+                    # plage refusée ou autre version du fichier : on repart de zéro
+                    print(f"⚠️ Reprise impossible ({response.status_code}) – téléchargement depuis le début")
+                    _discard_part(part)
+                    continue
+                response.raise_for_status()
+                if offset and response.status_code == 206:
+                    resumed = True
+                    mode = "ab"
+                    hasher = _hash_prefix(part)
+                else:
+                    offset, mode = 0, "wb"
+                    hasher = hashlib.sha256()
+                total = _total_size(response, offset)
+                done = offset
+                chunks = response.iter_content(chunk_size=max(chunk_size, SNIFF_BYTES))
+                if validate and not offset:
+                    first = next(chunks, b"")
+                    validate(first)
+                    chunks = itertools.chain([first], chunks)
+                if not offset:
+                    _write_part_meta(part, url, validators)
+                with open(part, mode) as f:
+                    for chunk in chunks:
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        done += len(chunk)
+                        received += len(chunk)
+                        if progress:
+                            elapsed = time.perf_counter() - started
+                            progress(done, total, received / elapsed if elapsed else 0.0)
+            if total is not None and done < total:
+                raise requests.ConnectionError(f"transfert incomplet ({done}/{total} octets)")
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            size = part.stat().st_size if part.exists() else 0
+            print(f"⚠️ Connexion interrompue ({e}) – reprise à l'octet {size} ({attempt}/{max_retries})")
+
+    if validate and resumed:
+        with open(part, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+        try:
+            validate(head)
+        except Exception:
+            _discard_part(part)
+            raise
+    os.replace(part, dest)
+    _part_meta(part).unlink(missing_ok=True)
+    seconds = time.perf_counter() - started
+    return {
+        "path": str(dest),
+        "bytes": dest.stat().st_size,
+        "seconds": seconds,
+        "bytes_per_sec": received / seconds if seconds else 0.0,
+        "resumed": resumed,
+        "not_modified": False,
+        "sha256": hasher.hexdigest(),
+        **validators,
+    }
+
+def _iter_blocks(fileobj: BinaryIO, chunk_size: int) -> Iterator[bytes | memoryview]:
+    """Blocs successifs de `fileobj` à partir de sa position courante.
+
+    Un tampon déjà en mémoire (`io.BytesIO`, `UploadedFile` de Streamlit) est
+    découpé en vues (`memoryview`), sans recopier ses octets.
+    """
+    if hasattr(fileobj, "getbuffer"):
+        start = fileobj.tell()
+        with fileobj.getbuffer() as view:
+            for i in range(start, len(view), chunk_size):
+                with view[i:i + chunk_size] as block:
+                    yield block
+            fileobj.seek(len(view))
+        return
+    yield from iter(lambda: fileobj.read(chunk_size), b"")
+
+def copy_stream(
+    fileobj: BinaryIO,
+    dest: Path,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    total: int | None = None,
+    progress: ProgressFn | None = None,
+    validate: Callable[[bytes], object] | None = None,
+) -> dict:
+    """Écrit `fileobj` dans `dest` en une passe, par blocs de `chunk_size` octets.
+
+    Pendant du téléchargement (`download_url`) pour un fichier déjà ouvert :
+    - `validate` reçoit les premiers octets (voir `check_payload`) avant toute
+      écriture ; son résultat est renvoyé dans `kind` ;
+    - le SHA-256 est calculé au fil des blocs, sans relire `dest` ;
+    - `progress` reçoit (octets copiés, `total`, octets/s) à chaque bloc ;
+    - `dest` n'apparaît qu'une fois complet (écriture atomique).
+    - Retourne `{"path", "bytes", "seconds", "bytes_per_sec", "sha256", "kind"}`.
+    """
+    dest = Path(dest)
+    started = time.perf_counter()
+    hasher = hashlib.sha256()
+    done = 0
+    kind = None
+    blocks = _iter_blocks(fileobj, max(chunk_size, SNIFF_BYTES))
+    with workspace.atomic_write(dest) as tmp, open(tmp, "wb") as f:
+        for block in blocks:
+            if validate and not done:
+                kind = validate(bytes(block[:SNIFF_BYTES]))
+            f.write(block)
+            hasher.update(block)
+            done += len(block)
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress(done, total, done / elapsed if elapsed else 0.0)
+        if validate and not done:
+            kind = validate(b"")  # fichier vide : refusé par `check_payload`
+    seconds = time.perf_counter() - started
+    return {
+        "path": str(dest),
+        "bytes": done,
+        "seconds": seconds,
+        "bytes_per_sec": done / seconds if seconds else 0.0,
+        "sha256": hasher.hexdigest(),
+        "kind": kind,
+    }
+
+def import_source(
+    source: str,
+    *,
+    final_name: str | None = None,
+    interactive: bool = True,
+    progress: ProgressFn | None = None,
+    session: requests.Session | None = None,
+    overwrite: bool = False,
+    raw_dir: str | Path = RAW_DIR,
+) -> dict | None:
+    """Ajoute un fichier dans `raw_dir` (`data/raw` par défaut) depuis un chemin local ou une URL.
 
     - `final_name` (sans extension) est obligatoire en mode non interactif.
     - Si `interactive=True` et `final_name=None`, on demande le nom en CLI.
-    - Retourne le chemin enregistré, ou None si l’ajout a échoué.
+    - Les URL sont téléchargées en flux (voir `download_url`) ; `progress`
+      reçoit (octets reçus, octets totaux, octets/s) à chaque bloc.
+    - Les premiers Ko sont examinés (`check_payload`) : une page HTML ou une
+      erreur est refusée avant toute écriture. Une page de tableau StatCan
+      (`tv.action?pid=`) est remplacée par l'URL de son CSV complet.
+    - Le contenu est rangé dans le magasin adressé par SHA-256 (`raw_store`) ;
+      `<raw_dir>/<final_name>.<ext>` n'en est qu'un alias.
+    - Deux imports du même nom dans le même dossier sont sérialisés (verrou
+      de fichier) ; l'interface web donne à chaque session son `raw_dir`.
+    - Si le nom existe déjà : une URL est revalidée (ETag / Last-Modified,
+      rien n'est téléchargé sur un 304) et un contenu identique est accepté
+      sans rien réécrire. Un contenu différent n'est enregistré qu'avec
+      `overwrite=True` (rafraîchissement).
+    - Les archives « tableau complet » StatCan (.zip) sont conservées telles
+      quelles : seul le CSV de métadonnées est copié dans
+      `<final_name>_metadata.csv`, le CSV de données est lu directement dans
+      l'archive par `clean_data`.
+    - Retourne `{"path", "status", "sha256", "bytes", "seconds",
+      "bytes_per_sec"}` (status : "nouveau", "mis_a_jour", "inchange" ou
+      "non_modifie"), ou None si l’ajout a échoué.
     """
     if not final_name:
         if interactive:
@@ -31,34 +357,230 @@ def add_one_file(source: str, *, final_name: str | None = None, interactive: boo
         print("❌ Nom de fichier invalide.")
         return None
 
-    # vérification si le nom est déjà pris
-    for ext in [".csv", ".xlsx", ".xls"]:
-        candidate = RAW_DIR / f"{final_name}{ext}"
-        if candidate.exists():
-            print(f"⚠️ Le fichier {candidate.name} existe déjà.")
-            return None
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    with workspace.file_lock(raw_dir / final_name):
+        return _import_locked(source, final_name, raw_dir, progress, session, overwrite)
+
+def ingest_stream(
+    fileobj: BinaryIO,
+    *,
+    final_name: str,
+    filename: str | None = None,
+    size: int | None = None,
+    progress: ProgressFn | None = None,
+    overwrite: bool = False,
+    raw_dir: str | Path = RAW_DIR,
+) -> dict | None:
+    """Ajoute dans `raw_dir` le contenu d'un fichier déjà ouvert (envoi web…).
+
+    Le flux est lu une seule fois : copié bloc par bloc dans la zone de
+    transit du magasin (même volume que les objets, donc rangé ensuite par
+    simple renommage), haché et examiné (`check_payload`) au passage. Pas de
+    fichier temporaire intermédiaire, pas de lecture complète en mémoire.
+    - `filename` fournit l'extension (défaut : `fileobj.name`, sinon .csv) ;
+      `size` (défaut : `fileobj.size`) sert au calcul de `progress`.
+    - Mêmes règles de nom, de verrou et de résultat que `import_source`.
+    """
+    final_name = final_name.strip().replace(" ", "_").lower()
+    if not final_name:
+        print("❌ Nom de fichier invalide.")
+        return None
+    filename = filename or getattr(fileobj, "name", None) or ""
+    size = size if size is not None else getattr(fileobj, "size", None)
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    with workspace.file_lock(raw_dir / final_name):
+        return _import_locked(fileobj, final_name, raw_dir, progress, None, overwrite,
+                              filename=filename, size=size)
 
-    # source URL ou fichier local
-    if is_url(source):
+def _import_locked(
+    source: str | BinaryIO,
+    final_name: str,
+    raw_dir: Path,
+    progress: ProgressFn | None,
+    session: requests.Session | None,
+    overwrite: bool,
+    *,
+    filename: str = "",
+    size: int | None = None,
+) -> dict | None:
+    """Corps de `import_source` / `ingest_stream`, sous le verrou du nom `final_name` dans `raw_dir`."""
+    stream = not isinstance(source, (str, os.PathLike))
+    remote = not stream and is_url(str(source))
+    # nom déjà pris ?
+    existing = next(
+        (raw_dir / f"{final_name}{ext}" for ext in RAW_EXTS if (raw_dir / f"{final_name}{ext}").exists()),
+        None,
+    )
+    started = time.perf_counter()
+    validators: dict[str, str | None] = {}
+
+    # flux ouvert, source URL ou fichier local
+    # un même nom importé dans deux dossiers ne partage pas son fichier de transit
+    slot = hashlib.sha1(str(raw_dir.resolve()).encode()).hexdigest()[:8]
+    if stream:
+        try:
+            ext = Path(filename).suffix.lower() or ".csv"
+            raw_store.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+            staging = raw_store.STAGING_DIR / f"{final_name}.{slot}.upload{ext}"
+            stats = copy_stream(source, staging, total=size, progress=progress, validate=check_payload)
+            if stats["kind"] == "zip":
+                ext = ".zip"
+            src, sha, move = staging, stats["sha256"], True
+            rate = stats["bytes_per_sec"]
+            source = filename or final_name  # pour les messages
+        except PayloadError as e:
+            hint = f" – importez plutôt {e.redirect}" if e.redirect else ""
+            print(f"❌ Fichier refusé : {e}{hint}")
+            return None
+        except Exception as e:
+            print(f"❌ Échec de la réception du fichier : {e}")
+            return None
+    elif remote:
+        staging = None
         try:
-            response = requests.get(source, timeout=15)
-            response.raise_for_status()
-            ext = Path(urlparse(source).path).suffix or ".csv"
-            dest = RAW_DIR / f"{final_name}{ext}"
-            with open(dest, "wb") as f:
-                f.write(response.content)
-            print(f"✅ Fichier téléchargé et enregistré sous {dest}")
-            return str(dest)
+            url = statcan_csv_url(source) or source
+            if url != source:
+                print(f"🔁 Page de tableau StatCan : téléchargement du CSV complet {url}")
+            raw_store.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+            headers = raw_store.conditional_headers(existing, source) if existing else {}
+            while True:
+                ext = Path(urlparse(url).path).suffix or ".csv"
+                # deux URL importées sous le même nom ne partagent pas leur `.part`
+                origin = hashlib.sha1(url.encode()).hexdigest()[:8]
+                staging = raw_store.STAGING_DIR / f"{final_name}.{slot}.{origin}{ext}"
+                try:
+                    stats = download_url(url, staging, progress=progress, session=session,
+                                         headers=headers, validate=check_payload)
+                    break
+                except PayloadError as e:
+                    if not e.redirect or e.redirect == url:
+                        raise
+                    print(f"🔁 {e} : page StatCan, téléchargement du CSV complet {e.redirect}")
+                    url = e.redirect
+            if stats["not_modified"]:
+                raw_store.touch(existing, etag=stats["etag"], last_modified=stats["last_modified"])
+                print(f"♻️ {existing.name} inchangé côté serveur (304) – téléchargement évité")
+                return {
+                    "path": str(existing),
+                    "status": "non_modifie",
+                    "sha256": raw_store.lookup(existing).get("sha256"),
+                    "bytes": 0,
+                    "seconds": stats["seconds"],
+                    "bytes_per_sec": 0.0,
+                }
+            if ext.lower() not in {".xlsx", ".xls", ".zip"} and zipfile.is_zipfile(staging):
+                ext = ".zip"  # URL sans extension → archive
+            src, sha, move = staging, stats["sha256"], True
+            rate = stats["bytes_per_sec"]
+            validators = {"etag": stats["etag"], "last_modified": stats["last_modified"]}
+            print(
+                f"✅ Fichier téléchargé : {source} "
+                f"({stats['bytes'] / 1e6:.1f} Mo, {stats['bytes_per_sec'] / 1e6:.2f} Mo/s)"
+            )
         except Exception as e:
+            _discard_staging(staging)
             print(f"❌ Échec du téléchargement depuis l'URL : {e}")
             return None
+        except BaseException:  # travail annulé (`jobs.Cancelled`)
+            _discard_staging(staging)
+            raise
     else:
         try:
             ext = Path(source).suffix or ".csv"
-            dest = RAW_DIR / f"{final_name}{ext}"
-            shutil.copy(source, dest)
-            print(f"✅ Copie locale effectuée sous {dest}")
-            return str(dest)
+            with open(source, "rb") as f:
+                kind = check_payload(f.read(SNIFF_BYTES))
+            if kind == "zip":
+                ext = ".zip"
+            src, sha, move = Path(source), raw_store.hash_file(source), False
+            rate = None
+        except PayloadError as e:
+            hint = f" – importez plutôt {e.redirect}" if e.redirect else ""
+            print(f"❌ Fichier refusé : {e}{hint}")
+            return None
         except Exception as e:
             print(f"❌ Échec de la copie locale : {e}")
             return None
+
+    dest = raw_dir / f"{final_name}{ext}"
+    if existing:
+        entry = raw_store.lookup(existing)
+        old_sha = entry["sha256"] if entry and "sha256" in entry else raw_store.hash_file(existing)
+        if old_sha == sha and existing == dest:
+            if move:
+                src.unlink(missing_ok=True)
+            raw_store.store_file(existing, existing, sha256=sha,
+                                 source=source if remote else None, **validators)
+            print(f"♻️ {existing.name} : contenu identique, rien à réécrire")
+            return {
+                "path": str(existing),
+                "status": "inchange",
+                "sha256": sha,
+                "bytes": existing.stat().st_size,
+                "seconds": time.perf_counter() - started,
+                "bytes_per_sec": 0.0,
+            }
+        if not overwrite:
+            if move:
+                src.unlink(missing_ok=True)
+            print(f"⚠️ Le fichier {existing.name} existe déjà.")
+            return None
+        if existing != dest:
+            raw_store.remove(existing)
+
+    try:
+        raw_store.store_file(src, dest, sha256=sha, move=move,
+                             source=source if remote else None, **validators)
+    except Exception as e:
+        if move:
+            src.unlink(missing_ok=True)
+        print(f"❌ Échec de l'enregistrement : {e}")
+        return None
+    print(f"✅ Fichier enregistré sous {dest}")
+
+    if dest.suffix.lower() == ".zip":
+        try:
+            meta_path = _store_zip_metadata(dest)
+        except (zipfile.BadZipFile, ValueError) as e:
+            print(f"❌ Archive ZIP invalide : {e}")
+            raw_store.remove(dest)
+            return None
+        if meta_path:
+            print(f"📎 Métadonnées enregistrées sous {meta_path}")
+
+    seconds = time.perf_counter() - started
+    size = dest.stat().st_size
+    return {
+        "path": str(dest),
+        "status": "mis_a_jour" if existing else "nouveau",
+        "sha256": sha,
+        "bytes": size,
+        "seconds": seconds,
+        "bytes_per_sec": rate if rate is not None else (size / seconds if seconds else 0.0),
+    }
+
+def add_one_file(
+    source: str,
+    *,
+    final_name: str | None = None,
+    interactive: bool = True,
+    progress: ProgressFn | None = None,
+    session: requests.Session | None = None,
+    overwrite: bool = False,
+    raw_dir: str | Path = RAW_DIR,
+) -> str | None:
+    """Ajoute un fichier dans `raw_dir` (voir `import_source`).
+
+    Retourne le chemin enregistré, ou None si l’ajout a échoué.
+    """
+    result = import_source(
+        source,
+        final_name=final_name,
+        interactive=interactive,
+        progress=progress,
+        session=session,
+        overwrite=overwrite,
+        raw_dir=raw_dir,
+    )
+    return result["path"] if result else None
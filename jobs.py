@@ -0,0 +1,178 @@
+"""jobs.py
+
+Travaux de fond (nettoyage, import par URL) pour l'interface web.
+
+Un nettoyage lancé dans le thread du script Streamlit bloque la session
+jusqu'à la fin, et continue même si l'onglet du navigateur est fermé.
+Ici, chaque travail :
+    • reçoit un identifiant et part dans un pool borné (`MAX_WORKERS`
+      travaux simultanés par serveur, `MAX_PENDING` en attente au plus :
+      au-delà, `submit` lève `QueueFull`) ;
+    • publie son avancement (étape, pourcentage) via la fonction
+      `progress(stage, percent)` qu'il reçoit ; l'interface relit l'état
+      avec `poll(job_id)` au lieu d'attendre ;
+    • peut être annulé : `cancel(job_id)` ; l'annulation prend effet au
+      prochain appel de `progress` (exception `Cancelled`) ;
+    • est annulé d'office si plus personne ne l'interroge depuis
+      `HEARTBEAT_TIMEOUT_S` (onglet fermé) ; les travaux terminés sont
+      oubliés après `KEEP_FINISHED_S`.
+
+    job = jobs.submit("nettoyage", clean_main, raw_path, progress=jobs.PROGRESS)
+    state = jobs.poll(job.id)      # {"status": "en_cours", "stage": "chargé", "percent": 30.0, …}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+MAX_WORKERS = 2
+MAX_PENDING = 8
+HEARTBEAT_TIMEOUT_S = 60
+KEEP_FINISHED_S = 3600
+REAP_EVERY_S = 5
+
+PROGRESS = object()  # marqueur : remplacé par la fonction d'avancement du travail
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "en_attente", "en_cours", "terminé", "échec", "annulé"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class Cancelled(BaseException):
+    """Annulation demandée ; BaseException pour traverser les `except Exception` du travail."""
+
+
+class QueueFull(RuntimeError):
+    """Trop de travaux en attente sur ce serveur."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = PENDING
+    stage: str = ""
+    percent: float = 0.0
+    result: Any = None
+    error: str | None = None
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+    heartbeat: float = field(default_factory=time.monotonic)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def report(self, stage: str, percent: float | None = None) -> None:
+        """Avancement du travail ; lève `Cancelled` si une annulation est demandée."""
+        if self._cancel.is_set():
+            raise Cancelled(self.id)
+        self.stage = stage
+        if percent is not None:
+            self.percent = max(0.0, min(100.0, float(percent)))
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id, "kind": self.kind, "status": self.status, "stage": self.stage,
+            "percent": self.percent, "result": self.result, "error": self.error,
+        }
+
+
+_jobs: dict[str, Job] = {}
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_reaper: threading.Thread | None = None
+
+# ─────────────────────────── Soumission ───────────────────────────
+
+def _start() -> ThreadPoolExecutor:
+    global _executor, _reaper
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+        _reaper = threading.Thread(target=_reap_forever, name="job-reaper", daemon=True)
+        _reaper.start()
+    return _executor
+
+
+def _run(job: Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+    if job._cancel.is_set():  # annulé avant d'avoir démarré
+        job.status, job.finished = CANCELLED, time.time()
+        return
+    job.status = RUNNING
+    try:
+        job.result = fn(*args, **kwargs)
+        job.status, job.percent = DONE, 100.0
+    except Cancelled:
+        job.status = CANCELLED
+    except Exception as e:
+        job.status, job.error = FAILED, f"{type(e).__name__}: {e}"
+    finally:
+        job.finished = time.time()
+
+
+def submit(kind: str, fn: Callable, *args, **kwargs) -> Job:
+    """Lance `fn(*args, **kwargs)` en arrière-plan et retourne le `Job`.
+
+    Tout argument égal à `PROGRESS` est remplacé par `job.report`.
+    """
+    with _lock:
+        waiting = sum(j.status == PENDING for j in _jobs.values())
+        if waiting >= MAX_PENDING:
+            raise QueueFull(f"{waiting} travaux déjà en attente – réessayez dans un instant")
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind)
+        _jobs[job.id] = job
+        executor = _start()
+    args = tuple(job.report if a is PROGRESS else a for a in args)
+    kwargs = {k: job.report if v is PROGRESS else v for k, v in kwargs.items()}
+    executor.submit(_run, job, fn, args, kwargs)
+    return job
+
+# ─────────────────────────── Suivi ────────────────────────────────
+
+def get(job_id: str) -> Job | None:
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def poll(job_id: str) -> dict | None:
+    """État du travail (et signe de vie de la session qui l'attend)."""
+    job = get(job_id)
+    if job is None:
+        return None
+    job.heartbeat = time.monotonic()
+    return job.snapshot()
+
+
+def cancel(job_id: str) -> bool:
+    """Demande l'annulation ; False si le travail est inconnu ou déjà fini."""
+    job = get(job_id)
+    if job is None or job.status in FINISHED:
+        return False
+    job._cancel.set()
+    return True
+
+
+def reap(now: float | None = None) -> None:
+    """Annule les travaux abandonnés et oublie les travaux finis depuis longtemps."""
+    now_mono = time.monotonic() if now is None else now
+    with _lock:
+        for job_id, job in list(_jobs.items()):
+            if job.status not in FINISHED and now_mono - job.heartbeat > HEARTBEAT_TIMEOUT_S:
+                job._cancel.set()
+            elif job.finished and time.time() - job.finished > KEEP_FINISHED_S:
+                del _jobs[job_id]
+
+
+def _reap_forever() -> None:
+    while True:
+        time.sleep(REAP_EVERY_S)
+        reap()
+
+
+def stats() -> dict:
+    with _lock:
+        counts: dict[str, int] = {}
+        for job in _jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+    return {"workers": MAX_WORKERS, **counts}
@@ -0,0 +1,111 @@
+"""payload.py
+
+Reconnaître un fichier de données brut d'après ses premiers octets, sans
+dépendance autre que la bibliothèque standard.
+
+Partagé par l'import (`import_data` : refuser une page HTML ou une erreur
+JSON avant d'écrire quoi que ce soit) et le nettoyage (`clean_data` :
+vérifier un brut, lire une archive StatCan) ; le nettoyage et les workers
+de `batch_clean` n'importent donc pas le téléchargeur (`requests`…).
+    • `sniff_payload(head)` : nature du contenu (zip, xlsx, xls, html,
+      json, empty, binary ou text) ;
+    • `check_payload(head)` : lève `PayloadError` pour un contenu refusé,
+      avec l'URL du CSV complet quand c'est une page de tableau StatCan ;
+    • `statcan_zip_members(zf)` : membres données / métadonnées d'une
+      archive « tableau complet » StatCan.
+
+    with open("data/raw/data_18.csv", "rb") as f:
+        kind = check_payload(f.read(SNIFF_BYTES))
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+RAW_EXTS = (".csv", ".xlsx", ".xls", ".zip")
+SNIFF_BYTES = 4096        # octets examinés pour reconnaître une page HTML ou une erreur
+REJECTED_KINDS = {"html", "json", "empty", "binary"}
+STATCAN_PAGE_RE = re.compile(rb"https?://[\w.]*statcan\.gc\.ca/t1/tbl1/(fr|en)/tv\.action\?pid=(\d{8,10})")
+
+
+class PayloadError(ValueError):
+    """Le contenu n'est pas un fichier de données (page HTML, erreur JSON…).
+
+    `redirect` contient, quand on sait la déduire, l'URL du vrai fichier.
+    """
+
+    def __init__(self, message: str, *, redirect: str | None = None):
+        super().__init__(message)
+        self.redirect = redirect
+
+
+def sniff_payload(head: bytes) -> str:
+    """Devine la nature d'un contenu d'après ses premiers octets.
+
+    Retourne "zip", "xlsx", "xls", "html", "json", "empty", "binary" ou
+    "text" (candidat CSV).
+    """
+    if head.startswith(b"PK\x03\x04"):
+        return "xlsx" if b"[Content_Types].xml" in head or b"xl/" in head else "zip"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return "xls"
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "text"  # UTF-16 avec BOM : les octets nuls sont normaux
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if not text:
+        return "empty"
+    if text.startswith((b"<!doctype html", b"<html", b"<?xml", b"<head", b"<body")) or b"<html" in text[:1024]:
+        return "html"
+    if text[:1] in (b"{", b"["):
+        return "json"
+    if b"\x00" in text:
+        return "binary"
+    return "text"
+
+
+def statcan_csv_url(url: str) -> str | None:
+    """URL du tableau complet (ZIP CSV) correspondant à une page StatCan `tv.action?pid=`."""
+    parsed = urlparse(url)
+    if "statcan.gc.ca" not in parsed.netloc or not parsed.path.endswith("tv.action"):
+        return None
+    m = re.search(r"(?:^|&)pid=(\d{8})", parsed.query)
+    if not m:
+        return None
+    lang = "fra" if "/fr/" in parsed.path else "eng"
+    return f"https://www150.statcan.gc.ca/n1/tbl/csv/{m.group(1)}-{lang}.zip"
+
+
+def check_payload(head: bytes) -> str:
+    """Lève `PayloadError` si `head` n'est pas un début de fichier de données.
+
+    Pour une page de tableau StatCan, l'erreur porte l'URL du CSV complet.
+    """
+    kind = sniff_payload(head[:SNIFF_BYTES])
+    if kind not in REJECTED_KINDS:
+        return kind
+    redirect = None
+    if kind == "html":
+        m = STATCAN_PAGE_RE.search(head)
+        if m:
+            lang, pid = m.group(1).decode(), m.group(2).decode()
+            redirect = statcan_csv_url(f"https://www150.statcan.gc.ca/t1/tbl1/{lang}/tv.action?pid={pid}")
+    raise PayloadError(f"contenu {kind.upper()} reçu au lieu d'un fichier de données", redirect=redirect)
+
+
+def statcan_zip_members(zf: zipfile.ZipFile) -> tuple[zipfile.ZipInfo, zipfile.ZipInfo | None]:
+    """Repère (données, métadonnées) dans une archive « tableau complet » StatCan.
+
+    Une archive StatCan contient `<pid>.csv` et `<pid>_MetaData.csv`
+    (`_MetaDonnees.csv` en français). Le membre données est le plus gros CSV
+    qui n'est pas un fichier de métadonnées.
+    """
+    csvs = [i for i in zf.infolist() if i.filename.lower().endswith(".csv") and not i.is_dir()]
+    metas = [i for i in csvs if "meta" in Path(i.filename).stem.lower()]
+    datas = [i for i in csvs if i not in metas]
+    if not datas:
+        raise ValueError("Archive ZIP sans fichier de données CSV.")
+    data = max(datas, key=lambda i: i.file_size)
+    return data, (metas[0] if metas else None)
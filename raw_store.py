@@ -0,0 +1,218 @@
+"""raw_store.py
+
+Stockage adressé par contenu (SHA-256) des fichiers bruts.
+
+Chaque contenu n'est écrit qu'une fois, sous
+`data/raw/objects/<2 premiers caractères>/<sha256>`. Les noms visibles
+(`data/raw/data_18.csv`, `data/raw/f.csv`, …) sont de simples liens physiques
+vers ces objets : dix noms pour un même export ne coûtent qu'une copie.
+Le reste du pipeline continue donc de lire `data/raw/<nom>.<ext>` sans rien
+savoir du stockage.
+
+Un index `index.json`, placé dans le dossier des alias, associe chaque nom à
+son empreinte, à sa source et aux validateurs HTTP (ETag / Last-Modified)
+de la dernière récupération, ce qui permet les rafraîchissements
+conditionnels (`If-None-Match` / `If-Modified-Since`).
+
+Usage CLI :
+    python raw_store.py --dedup   # convertit les fichiers existants de data/raw en alias
+    python raw_store.py --gc      # supprime les objets qu'aucun index (data/raw, espaces) ne référence
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import workspace
+
+RAW_DIR = Path("data/raw")
+OBJECTS_DIR = RAW_DIR / "objects"
+STAGING_DIR = OBJECTS_DIR / "tmp"  # téléchargements en cours, même volume que les objets
+INDEX_NAME = "index.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+# ─────────────────────────── Empreintes ───────────────────────────
+
+def hash_file(path: str | Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 hexadécimal d'un fichier, lu par blocs."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def object_path(sha256: str) -> Path:
+    return OBJECTS_DIR / sha256[:2] / sha256
+
+# ──────────────────────────── Index ───────────────────────────────
+
+def load_index(raw_dir: str | Path = RAW_DIR) -> dict[str, dict]:
+    path = Path(raw_dir) / INDEX_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_index(raw_dir: Path, index: dict[str, dict]) -> None:
+    path = raw_dir / INDEX_NAME
+    with workspace.atomic_write(path) as tmp:
+        tmp.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def lookup(alias: str | Path) -> dict | None:
+    """Entrée d'index d'un alias (`data/raw/<nom>.<ext>`), ou None."""
+    alias = Path(alias)
+    return load_index(alias.parent).get(alias.name)
+
+
+def conditional_headers(alias: str | Path, source: str) -> dict[str, str]:
+    """En-têtes de revalidation HTTP pour rafraîchir `alias` depuis `source`."""
+    entry = lookup(alias)
+    if not entry or entry.get("source") != source:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _update_entry(alias: Path, **fields) -> dict:
+    with workspace.file_lock(alias.parent / INDEX_NAME):  # index partagé entre sessions et processus
+        index = load_index(alias.parent)
+        entry = index.get(alias.name, {})
+        entry.update({k: v for k, v in fields.items() if v is not None})
+        entry["checked_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        index[alias.name] = entry
+        _save_index(alias.parent, index)
+    return entry
+
+# ──────────────────────────── Stockage ────────────────────────────
+
+def _link(obj: Path, alias: Path) -> None:
+    """Fait pointer `alias` sur `obj` (lien physique, copie si le FS refuse)."""
+    with workspace.atomic_write(alias) as tmp:
+        try:
+            os.link(obj, tmp)
+        except OSError:
+            shutil.copyfile(obj, tmp)
+
+
+def store_file(
+    src: str | Path,
+    alias: str | Path,
+    *,
+    sha256: str | None = None,
+    move: bool = False,
+    source: str | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> dict:
+    """Range `src` dans le magasin d'objets et expose-le sous `alias`.
+
+    - `sha256` évite de relire le fichier si l'empreinte est déjà connue.
+    - `move=True` déplace `src` (fichier temporaire) au lieu de le copier ;
+      si l'objet existe déjà, `src` est simplement supprimé.
+    - Retourne l'entrée d'index de l'alias.
+    """
+    src, alias = Path(src), Path(alias)
+    sha = sha256 or hash_file(src)
+    obj = object_path(sha)
+    if obj.exists():
+        if move and src != alias:
+            src.unlink(missing_ok=True)
+    else:
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        if move and src != alias:
+            os.replace(src, obj)
+        else:
+            with workspace.atomic_write(obj) as tmp:
+                shutil.copyfile(src, tmp)
+    if not (alias.exists() and os.path.samefile(alias, obj)):
+        _link(obj, alias)
+    return _update_entry(
+        alias,
+        sha256=sha,
+        size=obj.stat().st_size,
+        source=source,
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+
+def touch(alias: str | Path, *, etag: str | None = None, last_modified: str | None = None) -> dict:
+    """Enregistre une revalidation réussie sans changer le contenu de l'alias."""
+    return _update_entry(Path(alias), etag=etag, last_modified=last_modified)
+
+
+def remove(alias: str | Path) -> None:
+    """Supprime un alias (l'objet reste jusqu'au prochain `gc`)."""
+    alias = Path(alias)
+    alias.unlink(missing_ok=True)
+    with workspace.file_lock(alias.parent / INDEX_NAME):  # index partagé entre sessions et processus
+        index = load_index(alias.parent)
+        if index.pop(alias.name, None) is not None:
+            _save_index(alias.parent, index)
+
+# ───────────────────────── Maintenance ────────────────────────────
+
+def dedup(raw_dir: str | Path = RAW_DIR) -> dict:
+    """Convertit chaque fichier de `raw_dir` en alias d'un objet partagé."""
+    raw_dir = Path(raw_dir)
+    files = saved = 0
+    for path in sorted(raw_dir.iterdir()):
+        if not path.is_file() or path.name == INDEX_NAME or path.name.startswith("."):
+            continue
+        sha = hash_file(path)
+        obj = object_path(sha)
+        shared = obj.exists() and not os.path.samefile(path, obj)
+        size = path.stat().st_size
+        store_file(path, path, sha256=sha)
+        files += 1
+        saved += size if shared else 0
+    print(f"♻️ {files} fichiers indexés, {saved / 1e6:.1f} Mo de doublons partagés")
+    return {"files": files, "bytes_saved": saved}
+
+
+def index_dirs() -> list[Path]:
+    """Dossiers d'alias qui partagent le magasin : `data/raw` et le `raw/` de chaque espace de session."""
+    return [RAW_DIR, *sorted(workspace.WORKSPACES_DIR.glob("*/raw"))]
+
+
+def gc(raw_dirs: list[str | Path] | None = None) -> int:
+    """Supprime les objets qu'aucun index ne référence plus (tous ceux de `index_dirs` par défaut)."""
+    used = {
+        entry["sha256"]
+        for d in (raw_dirs or index_dirs())
+        for entry in load_index(d).values()
+        if "sha256" in entry
+    }
+    removed = 0
+    for obj in OBJECTS_DIR.glob("??/*"):
+        if obj.is_file() and obj.name not in used:
+            obj.unlink()
+            removed += 1
+    print(f"🧹 {removed} objets orphelins supprimés")
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Magasin adressé par contenu de data/raw")
+    parser.add_argument("--dedup", action="store_true", help="indexer et dédoublonner data/raw")
+    parser.add_argument("--gc", action="store_true", help="supprimer les objets non référencés")
+    args = parser.parse_args()
+    if args.dedup:
+        dedup()
+    if args.gc:
+        gc()
+    if not (args.dedup or args.gc):
+        parser.print_help()
@@ -0,0 +1,195 @@
+"""render_cache.py
+
+Images de graphiques déjà rendues, gardées en mémoire pour le processus.
+
+Chaque interaction Streamlit réexécute le script : sans cache, le même
+graphique est redessiné (matplotlib) et réencodé à chaque clic, et l'export
+300 dpi était préparé à chaque fois pour le bouton de téléchargement.
+Ici :
+    • un graphique est identifié par ses paramètres (`plot_key` : empreinte
+      du jeu de données, X, Y, Z, type, couleur, taille…) ;
+    • l'image d'écran (`SCREEN_DPI`) est rendue une fois par clé ; une
+      réexécution avec les mêmes paramètres ne construit même pas la figure ;
+    • les exports PNG / SVG / PDF haute définition ne sont produits que sur
+      demande, par un worker en arrière-plan (`export`), puis gardés ;
+    • budget mémoire `BUDGET_MB`, éviction du moins récemment utilisé ;
+    • `Plot.info` reçoit les détails du rendu notés par `build()` (réduction
+      de points…) ; ils sont gardés avec l'image d'écran et recopiés dans
+      le `Plot` de la session quand l'image vient du cache.
+
+La figure est construite par le thread appelant (pyplot n'est pas
+thread-safe) ; seul l'encodage, le plus coûteux, part au worker.
+
+    plot = Plot(plot_key(sha, x="annee", y="valeur", kind="Ligne"), build)
+    png = screen_png(plot)
+    fut = export(plot, "pdf")       # concurrent.futures.Future[bytes]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+BUDGET_MB = 64
+SCREEN_DPI = 100
+EXPORT_DPI = 300
+EXPORT_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "pdf": "application/pdf"}
+EXPORT_WORKERS = 1
+RENDER_VERSION = "1"     # à changer quand le style des graphiques change
+
+_images: OrderedDict[tuple, bytes] = OrderedDict()   # (clé, format, dpi) → octets
+_infos: dict[tuple, dict] = {}                       # même clé → `Plot.info` du rendu
+_pending: dict[tuple, Future] = {}
+_lock = threading.Lock()
+_budget = BUDGET_MB * 1024 * 1024
+_used = 0
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass(frozen=True)
+class Plot:
+    """Graphique identifié par `key` (None : pas de cache) et construit par `build()`.
+
+    `info` : dictionnaire propre à ce `Plot`, que `build()` remplit.
+    """
+    key: Optional[str]
+    build: Callable[[], Figure]
+    info: dict = field(default_factory=dict, compare=False)
+
+
+def plot_key(dataset: Optional[str], **params) -> Optional[str]:
+    """Empreinte des paramètres d'un graphique ; None si le jeu de données n'est pas identifié."""
+    if not dataset:
+        return None
+    payload = json.dumps([RENDER_VERSION, dataset, params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def configure(budget_mb: int) -> None:
+    global _budget
+    with _lock:
+        _budget = budget_mb * 1024 * 1024
+        _evict()
+
+# ─────────────────────────── Index ────────────────────────────────
+
+def _evict() -> None:
+    global _used
+    while _used > _budget and _images:
+        slot, data = _images.popitem(last=False)
+        _infos.pop(slot, None)
+        _used -= len(data)
+
+
+def _get(slot: tuple) -> bytes | None:
+    with _lock:
+        data = _images.get(slot)
+        if data is not None:
+            _images.move_to_end(slot)
+        return data
+
+
+def _put(slot: tuple, data: bytes, info: dict | None = None) -> None:
+    global _used
+    if slot[0] is None:
+        return
+    with _lock:
+        if slot in _images or len(data) > _budget:
+            return
+        _images[slot] = data
+        if info:
+            _infos[slot] = dict(info)
+        _used += len(data)
+        _evict()
+
+# ─────────────────────────── Rendu ────────────────────────────────
+
+def _encode(fig: Figure, fmt: str, dpi: int) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+def screen_png(plot: Plot, dpi: int = SCREEN_DPI) -> bytes:
+    """PNG d'écran de `plot`, rendu au premier appel seulement (`plot.info` rempli dans les deux cas)."""
+    slot = (plot.key, "png", dpi)
+    data = _get(slot)
+    if data is None:
+        fig = plot.build()
+        try:
+            data = _encode(fig, "png", dpi)
+        finally:
+            plt.close(fig)
+        _put(slot, data, plot.info)
+    else:
+        with _lock:
+            plot.info.update(_infos.get(slot, {}))
+    return data
+
+
+def cached(plot: Plot, fmt: str, dpi: int = EXPORT_DPI) -> bytes | None:
+    """Export déjà disponible, sans rien lancer."""
+    return _get((plot.key, fmt, dpi)) if plot.key else None
+
+
+def export(plot: Plot, fmt: str = "png", dpi: int = EXPORT_DPI) -> Future:
+    """Export `fmt` (png, svg, pdf) de `plot`, encodé en arrière-plan.
+
+    Deux demandes identiques (deux sessions, deux clics) partagent le même
+    travail ; un export déjà en cache est rendu immédiatement.
+    """
+    global _executor
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu : {fmt} (attendu : {', '.join(EXPORT_FORMATS)})")
+    slot = (plot.key, fmt, dpi)
+    data = _get(slot) if plot.key else None
+    if data is not None:
+        done: Future = Future()
+        done.set_result(data)
+        return done
+
+    with _lock:
+        if plot.key and slot in _pending:
+            return _pending[slot]
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+    fig = plot.build()
+    plt.close(fig)  # retirée de pyplot ; la figure reste utilisable par le worker
+
+    def job() -> bytes:
+        try:
+            data = _encode(fig, fmt, dpi)
+            _put(slot, data)
+            return data
+        finally:
+            with _lock:
+                _pending.pop(slot, None)
+
+    with _lock:
+        fut = _executor.submit(job)
+        if plot.key:
+            _pending[slot] = fut
+    return fut
+
+
+def stats() -> dict:
+    with _lock:
+        return {"images": len(_images), "pending": len(_pending),
+                "used_mb": round(_used / (1024 * 1024), 1), "budget_mb": round(_budget / (1024 * 1024), 1)}
+
+
+def clear() -> None:
+    global _used
+    with _lock:
+        _images.clear()
+        _infos.clear()
+        _used = 0
@@ -10,7 +10,7 @@
 # • Style console lisible (séparateurs, intitulés clairs)
 #
 #  ── Dépendances ────────────────────────────────────────────────────────────
-#     pip install pandas openpyxl matplotlib rich
+#     pip install pandas openpyxl matplotlib rich pyarrow
 #
 #  ── Usage ─────────────────────────────────────────────────────────────────
 #     python smart_plotter_v2.py
@@ -18,7 +18,6 @@
 #  Author: ChatGPT (o3) – 2025-07-02
 # ---------------------------------------------------------------------------
 
-import re
 import sys
 from pathlib import Path
 
@@ -30,6 +29,10 @@ from rich.prompt import Prompt
 from rich.console import Console
 from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (nécessaire pour 3D)
 
+import excel_reader
+from type_inference import split_columns
+from vizualisation import aggregate  # même couche d'agrégation que l'interface web
+
 # --------------------------------------------------------------------------- #
 # PARAMÈTRES
 # --------------------------------------------------------------------------- #
@@ -44,35 +47,17 @@ console = Console()
 # --------------------------------------------------------------------------- #
 # UTILITAIRES
 # --------------------------------------------------------------------------- #
-def is_number(token: str) -> bool:
-    """True si `token` est x | x.y | x,y  (pas x.y.z)."""
-    token = str(token).strip()
-    if len(re.findall(r"[.,]", token)) > 1:  # trop de séparateurs → probable coordonnée
-        return False
-    try:
-        float(token.replace(",", "."))
-        return True
-    except ValueError:
-        return False
-
-
 def classify_columns(df: pd.DataFrame):
-    """Retourne (numeric_cols, categorical_cols) selon le CONTENU."""
-    num_cols, cat_cols = [], []
-    for col in df.columns:
-        serie = df[col].dropna().astype(str)
-        if serie.empty:
-            cat_cols.append(col)
-            continue
-        ratio = serie.map(is_number).mean()
-        if ratio >= NUMERIC_THRESHOLD:
-            df[col] = (
-                serie.where(~serie.map(is_number), serie.str.replace(",", "."))
-                .astype(float, errors="ignore")
-            )
-            num_cols.append(col)
-        else:
-            cat_cols.append(col)
+    """Retourne (numeric_cols, categorical_cols) selon le CONTENU.
+
+    Décision sur un échantillon, colonne par colonne (`type_inference`) ;
+    les colonnes numériques écrites en texte (« 1 234,5 ») sont converties
+    sur place.
+    """
+    typed, num_cols, cat_cols = split_columns(df, threshold=NUMERIC_THRESHOLD)
+    for col in num_cols:
+        if typed[col].dtype != df[col].dtype:
+            df[col] = typed[col]
     return num_cols, cat_cols
 
 
@@ -103,7 +88,13 @@ def main() -> None:
         sys.exit(1)
 
     console.rule(f"Chargement du fichier [bold]{path.name}[/bold]")
-    df = pd.read_excel(path) if path.suffix.lower().endswith("x") else pd.read_csv(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        df = pd.read_parquet(path)
+    elif suffix == ".feather":
+        df = pd.read_feather(path)
+    else:
+        df = excel_reader.read_excel(path) if suffix.endswith("x") else pd.read_csv(path)
 
     # APERÇU
     console.rule("[bold]APERÇU DES DONNÉES[/bold]")
@@ -171,16 +162,19 @@ def main() -> None:
         df[x_col].value_counts().plot(kind="pie", autopct="%1.1f%%")
         plt.ylabel("")
     elif chart_type == "bar":
-        df.groupby(x_col)[y_col].mean().plot(kind="bar")
+        aggregate(df, x_col, y_col, "mean").plot(kind="bar")
         plt.ylabel(y_col)
     elif chart_type == "pie":
-        df.groupby(x_col)[y_col].sum().plot(kind="pie", autopct="%1.1f%%")
+        aggregate(df, x_col, y_col, "sum").plot(kind="pie", autopct="%1.1f%%")
         plt.ylabel("")
     elif chart_type == "scatter":
         plt.scatter(df[x_col], df[y_col])
         plt.xlabel(x_col)
         plt.ylabel(y_col)
     elif chart_type == "line":
+        # Le nettoyage note ses colonnes de tri : pas de retri si X est la première
+        if df.attrs.get("sorted_by", [])[:1] != [x_col]:
+            df = df.sort_values(x_col, kind="stable")
         plt.plot(df[x_col], df[y_col])
         plt.xlabel(x_col)
         plt.ylabel(y_col)
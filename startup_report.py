@@ -0,0 +1,137 @@
+"""startup_report.py
+
+Mesure du démarrage à froid de l'interface web, à suivre d'une version à
+l'autre :
+    • imports : les imports de premier niveau de `web_interface.py` (lus
+      dans le source) sont rejoués dans un processus neuf sous
+      `python -X importtime` ; le rapport donne le total et les paquets les
+      plus lourds (temps cumulé, sous-imports compris) ;
+    • premier affichage : première exécution complète du script par
+      `streamlit.testing` dans un processus neuf — ce que paie un nouveau
+      worker Streamlit avant d'afficher l'onglet Accueil.
+
+Chaque mesure est comparée à son budget ; le code de sortie vaut 1 si un
+budget est dépassé (utilisable en CI).
+
+Usage CLI :
+    python startup_report.py
+    python startup_report.py --budget-ms 800 --paint-budget-ms 2000 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path("web_interface.py")
+IMPORT_BUDGET_MS = 1500
+FIRST_PAINT_BUDGET_MS = 3000
+TOP = 10
+
+# ─────────────────────────── Imports ────────────────────────────
+
+def startup_imports(script: str | Path = SCRIPT) -> list[str]:
+    """Modules importés au premier niveau de `script` (ceux que paie chaque démarrage)."""
+    tree = ast.parse(Path(script).read_text(encoding="utf-8"))
+    modules: list[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module != "__future__":
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules: list[str]) -> list[dict]:
+    """Lignes de `-X importtime` (self_ms, cumulative_ms, module, depth) pour `modules`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise RuntimeError(f"Import impossible : {tail[0]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+# ─────────────────────────── Premier affichage ──────────────────
+
+_PAINT = """
+import json, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file({script!r}, default_timeout=60).run()
+t2 = time.perf_counter()
+print(json.dumps({{"harness_ms": (t1 - t0) * 1000, "first_run_ms": (t2 - t1) * 1000,
+                   "errors": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def first_paint(script: str | Path = SCRIPT) -> dict | None:
+    """Durée de la première exécution de `script` dans un processus neuf ; None sans streamlit."""
+    proc = subprocess.run([sys.executable, "-c", _PAINT.format(script=str(Path(script).resolve()))],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        if "No module named 'streamlit'" in proc.stderr:
+            return None
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+# ──────────────────────────── CLI ───────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Temps de démarrage à froid de l'interface web")
+    parser.add_argument("--script", default=str(SCRIPT), help="script Streamlit (défaut : web_interface.py)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"budget des imports de démarrage (défaut : {IMPORT_BUDGET_MS} ms)")
+    parser.add_argument("--paint-budget-ms", type=float, default=FIRST_PAINT_BUDGET_MS,
+                        help=f"budget du premier affichage (défaut : {FIRST_PAINT_BUDGET_MS} ms)")
+    parser.add_argument("--top", type=int, default=TOP, help="paquets les plus lourds à lister")
+    args = parser.parse_args(argv)
+
+    over = False
+    modules = startup_imports(args.script)
+    print(f"📦 Imports de démarrage de {args.script} : {', '.join(modules)}")
+    try:
+        rows = import_times(modules)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    total = sum(r["cumulative_ms"] for r in rows if r["depth"] == 0)
+    top = sorted((r for r in rows if r["depth"] == 0), key=lambda r: r["cumulative_ms"], reverse=True)
+    for r in top[:args.top]:
+        print(f"   {r['cumulative_ms']:9.1f} ms  {r['module']}")
+    over |= total > args.budget_ms
+    print(f"{'❌' if total > args.budget_ms else '✅'} Imports : {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    paint = first_paint(args.script)
+    if paint is None:
+        print("⚠️ streamlit absent : premier affichage non mesuré")
+    else:
+        ms = paint["first_run_ms"]
+        over |= ms > args.paint_budget_ms
+        print(f"{'❌' if ms > args.paint_budget_ms else '✅'} Premier affichage : {ms:.0f} ms "
+              f"(budget {args.paint_budget_ms:.0f} ms)")
+        for err in paint["errors"]:
+            print(f"   ⚠️ {err}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
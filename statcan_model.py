@@ -0,0 +1,251 @@
+"""statcan_model.py
+
+Modèle des tableaux StatCan « pour chargement de base de données ».
+
+Ces CSV sont au format long : une ligne par (période, géographie, membre de
+chaque dimension), avec les colonnes REF_DATE, GEO, DGUID, les dimensions
+propres au tableau, UOM, SCALAR_FACTOR, VECTOR, COORDINATE, VALUE, STATUS…
+(en français : PÉRIODE DE RÉFÉRENCE, GÉO, …, FACTEUR SCALAIRE, VALEUR).
+Tracés tels quels, ils mêlent toutes les séries du tableau. Ici :
+    • `detect(df)` reconnaît la disposition (noms après `clean_names`, dans
+      les deux langues) et sépare les colonnes de métadonnées des
+      dimensions du tableau ;
+    • `apply_scalar_factor(df)` ramène VALUE aux unités (VALUE × 10^SCALAR_ID,
+      « millions » → × 1 000 000), une seule fois, au nettoyage ;
+    • `StatCanTable` indexe les valeurs sur (GEO, dimensions…, REF_DATE)
+      — MultiIndex trié, une découpe est une recherche dichotomique — et
+      sert `series()` (une série datée) et `pivot()` (une colonne par GEO,
+      une ligne par date), mémorisées par découpe : tracer une série ne
+      parcourt jamais le tableau entier ;
+    • `for_frame(df)` garde le modèle d'un tableau de `frame_cache` tant que
+      le fichier ne change pas.
+
+    table = statcan_model.for_frame(df)
+    wide = table.pivot(["Canada", "Québec"], statistiques="Pourcentage de personnes à faible revenu")
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Rôle → noms possibles de la colonne après `clean_names` (anglais, français)
+ROLES = {
+    "ref_date": ("ref_date", "periode_de_reference"),
+    "geo": ("geo",),
+    "dguid": ("dguid",),
+    "uom": ("uom", "unite_de_mesure"),
+    "uom_id": ("uom_id", "identificateur_dunite_de_mesure", "identificateur_d_unite_de_mesure"),
+    "scalar_factor": ("scalar_factor", "facteur_scalaire"),
+    "scalar_id": ("scalar_id", "identificateur_scalaire"),
+    "vector": ("vector", "vecteur"),
+    "coordinate": ("coordinate", "coordonnees"),
+    "value": ("value", "valeur"),
+    "status": ("status", "statut"),
+    "symbol": ("symbol", "symbole"),
+    "terminated": ("terminated", "termine"),
+    "decimals": ("decimals", "decimales"),
+}
+REQUIRED = ("ref_date", "geo", "value")
+MARKERS = ("scalar_factor", "scalar_id", "vector", "coordinate", "uom")  # au moins un : format StatCan
+
+# Facteur scalaire en toutes lettres → puissance de dix (quand SCALAR_ID manque)
+SCALAR_POWERS = {
+    "units": 0, "unites": 0, "unités": 0, "tens": 1, "dizaines": 1, "hundreds": 2, "centaines": 2,
+    "thousands": 3, "milliers": 3, "tens of thousands": 4, "dizaines de milliers": 4,
+    "hundreds of thousands": 5, "centaines de milliers": 5, "millions": 6,
+    "tens of millions": 7, "dizaines de millions": 7, "hundreds of millions": 8,
+    "centaines de millions": 8, "billions": 9, "milliards": 9,
+}
+SCALED_ATTR = "statcan_scaled"   # df.attrs : VALUE déjà ramenée aux unités
+SLICE_CACHE_SIZE = 128
+TABLE_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Colonnes d'un tableau StatCan : rôle → nom, et dimensions propres au tableau."""
+    columns: dict[str, str]
+    dimensions: tuple[str, ...]
+
+    def col(self, role: str) -> Optional[str]:
+        """Nom de la colonne qui joue `role` (clé de `ROLES`), None si absente."""
+        return self.columns.get(role)
+
+    def __hash__(self) -> int:
+        return hash((tuple(sorted(self.columns.items())), self.dimensions))
+
+
+def detect(df: pd.DataFrame) -> Layout | None:
+    """Disposition StatCan de `df` (colonnes déjà passées par `clean_names`), ou None."""
+    names = set(df.columns)
+    columns = {}
+    for role, candidates in ROLES.items():
+        found = next((c for c in candidates if c in names), None)
+        if found:
+            columns[role] = found
+    if not all(r in columns for r in REQUIRED) or not any(r in columns for r in MARKERS):
+        return None
+    known = set(columns.values())
+    dims = tuple(c for c in df.columns if c not in known)
+    return Layout(columns, dims)
+
+# ─────────────────────────── Nettoyage ────────────────────────────
+
+def _powers(df: pd.DataFrame, layout: Layout) -> np.ndarray | None:
+    """Puissance de dix de chaque ligne (SCALAR_ID, sinon le libellé SCALAR_FACTOR)."""
+    if layout.col("scalar_id"):
+        ids = pd.to_numeric(df[layout.col("scalar_id")], errors="coerce")
+        if ids.notna().all():
+            return ids.to_numpy(dtype="float64")
+    if layout.col("scalar_factor"):
+        labels = df[layout.col("scalar_factor")].astype(str).str.strip().str.lower()
+        powers = labels.map(SCALAR_POWERS)
+        if powers.notna().all():
+            return powers.to_numpy(dtype="float64")
+    return None
+
+
+def apply_scalar_factor(df: pd.DataFrame, layout: Layout | None = None) -> pd.DataFrame:
+    """VALUE ramenée aux unités (× 10^SCALAR_ID) ; sans effet hors format StatCan ou si déjà fait.
+
+    SCALAR_ID passe à 0 et SCALAR_FACTOR à « unités » / « units », pour que
+    le fichier nettoyé reste cohérent ; `df.attrs[SCALED_ATTR]` le note.
+    """
+    layout = layout or detect(df)
+    if layout is None or df.attrs.get(SCALED_ATTR):
+        return df
+    powers = _powers(df, layout)
+    if powers is None:
+        return df
+    if powers.any():
+        value, scalar_id, factor = layout.col("value"), layout.col("scalar_id"), layout.col("scalar_factor")
+        values = pd.to_numeric(df[value], errors="coerce").to_numpy(dtype="float64")
+        df[value] = values * np.power(10.0, powers)
+        if scalar_id:
+            df[scalar_id] = 0
+        if factor:
+            df[factor] = "unités" if factor == "facteur_scalaire" else "units"
+    df.attrs[SCALED_ATTR] = True
+    return df
+
+# ─────────────────────────── Modèle ───────────────────────────────
+
+class StatCanTable:
+    """Valeurs d'un tableau StatCan indexées par (GEO, dimensions…, REF_DATE)."""
+
+    def __init__(self, df: pd.DataFrame, layout: Layout):
+        self.layout = layout
+        self.geo, self.ref_date = layout.col("geo"), layout.col("ref_date")
+        self.dimensions = list(layout.dimensions)
+        keys = [self.geo, *self.dimensions, self.ref_date]
+        # un seul passage sur le tableau : groupby trie les clés et rend un MultiIndex trié
+        # (plusieurs lignes pour une même clé : la dernière, dans l'ordre du fichier)
+        self.values: pd.Series = (
+            df.groupby(keys, observed=True, sort=True)[layout.col("value")].last()
+        )
+        # membres dans l'ordre du fichier : StatCan place le total de chaque dimension en premier
+        self.members = {c: list(pd.unique(df[c].dropna())) for c in [self.geo, *self.dimensions]}
+        self.unit = str(df[layout.col("uom")].iloc[0]) if layout.col("uom") and len(df) else ""
+        self._slices: OrderedDict[tuple, pd.Series | pd.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def geos(self) -> list:
+        return self.members[self.geo]
+
+    @property
+    def default_geo(self):
+        """« Canada » s'il est présent (le nettoyage trie GEO par ordre alphabétique), sinon la première."""
+        return next((g for g in self.geos if str(g) == "Canada"), self.geos[0] if self.geos else None)
+
+    def varying(self) -> list[str]:
+        """Dimensions qui ont plus d'un membre (les seules à choisir)."""
+        return [d for d in self.dimensions if len(self.members[d]) > 1]
+
+    def _selection(self, members: dict) -> tuple:
+        """Membre retenu pour chaque dimension : celui demandé, sinon le premier du fichier."""
+        unknown = set(members) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Dimensions inconnues : {', '.join(sorted(unknown))} "
+                             f"(attendu : {', '.join(self.dimensions)})")
+        return tuple(members.get(d, self.members[d][0] if self.members[d] else None)
+                     for d in self.dimensions)
+
+    def _cached(self, key: tuple, compute):
+        with self._lock:
+            if key in self._slices:
+                self._slices.move_to_end(key)
+                return self._slices[key]
+        out = compute()
+        with self._lock:
+            self._slices[key] = out
+            while len(self._slices) > SLICE_CACHE_SIZE:
+                self._slices.popitem(last=False)
+        return out
+
+    def _series(self, geo, selection: tuple) -> pd.Series:
+        try:
+            s = self.values.loc[(geo, *selection)]
+        except KeyError:
+            return pd.Series(dtype="float64", name=geo)
+        s.index = s.index.astype(object) if isinstance(s.index, pd.CategoricalIndex) else s.index
+        return s.rename(geo)
+
+    def series(self, geo=None, **members) -> pd.Series:
+        """Série datée de `geo` (défaut : `default_geo`) pour les membres donnés."""
+        geo = self.default_geo if geo is None else geo
+        selection = self._selection(members)
+        return self._cached(("series", geo, selection), lambda: self._series(geo, selection))
+
+    def pivot(self, geos: Sequence | None = None, **members) -> pd.DataFrame:
+        """Une colonne par GEO (défaut : toutes), une ligne par REF_DATE."""
+        geos = tuple(self.geos if geos is None else geos)
+        selection = self._selection(members)
+
+        def compute() -> pd.DataFrame:
+            parts = [self.series(g, **dict(zip(self.dimensions, selection))) for g in geos]
+            wide = pd.concat(parts, axis=1) if parts else pd.DataFrame()
+            wide.index.name = self.ref_date
+            return wide.sort_index()
+
+        return self._cached(("pivot", geos, selection), compute)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rows": len(self.values), "slices": len(self._slices)}
+
+
+_tables: OrderedDict[tuple, StatCanTable] = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def for_frame(df: pd.DataFrame) -> StatCanTable | None:
+    """Modèle StatCan de `df`, ou None ; gardé par empreinte du fichier (`frame_cache`)."""
+    layout = detect(df)
+    if layout is None:
+        return None
+    source = df.attrs.get("source_sha256")
+    key = (source, layout) if source else None
+    if key:
+        with _tables_lock:
+            if key in _tables:
+                _tables.move_to_end(key)
+                return _tables[key]
+    table = StatCanTable(df, layout)
+    if key:
+        with _tables_lock:
+            _tables[key] = table
+            while len(_tables) > TABLE_CACHE_SIZE:
+                _tables.popitem(last=False)
+    return table
+
+
+def clear() -> None:
+    with _tables_lock:
+        _tables.clear()
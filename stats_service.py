@@ -0,0 +1,160 @@
+"""stats_service.py
+
+Statistiques descriptives (n, moyenne, médiane, écart-type, variance, min,
+max, quartiles) de toutes les colonnes numériques d'un tableau nettoyé.
+
+Le panneau latéral les affiche à chaque réexécution Streamlit : au lieu de
+refaire `df[y].agg([...])` (la médiane trie toute la colonne), elles sont
+    • calculées une fois, pour toutes les colonnes numériques d'un coup
+      (un tableau float64 à deux dimensions, réductions numpy par axe) ;
+    • enregistrées à côté du fichier nettoyé (`<fichier>.stats.json`),
+      avec l'empreinte SHA-256 du fichier : un fichier re-nettoyé invalide
+      le résumé ;
+    • gardées en mémoire pour le processus, pour les `MEMO_SIZE` derniers
+      fichiers (éviction du moins récemment utilisé).
+
+Au-delà de `APPROX_ROWS` lignes, médiane et quartiles sont estimés sur un
+échantillon régulier de `QUANTILE_SAMPLE` lignes (les autres statistiques
+restent exactes) ; `approx=True` / `False` force l'un ou l'autre.
+
+    summary = stats_service.describe(df)     # df chargé par frame_cache
+    summary["valeur"]["median"]
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import workspace
+
+STATS_VERSION = "1"
+STATS = ("count", "mean", "median", "std", "var", "min", "max", "q25", "q75")
+APPROX_ROWS = 2_000_000     # au-delà : quantiles estimés sur un échantillon
+QUANTILE_SAMPLE = 200_000
+MEMO_SIZE = 64              # fichiers dont le résumé reste en mémoire
+
+_memo: OrderedDict[str, dict[str, dict]] = OrderedDict()   # sha256 du fichier → {colonne: statistiques}
+_lock = threading.Lock()
+
+
+def numeric_columns(df: pd.DataFrame) -> list[str]:
+    """Colonnes numériques (booléens exclus)."""
+    return [
+        c for c in df.columns
+        if pd.api.types.is_numeric_dtype(df[c].dtype) and not pd.api.types.is_bool_dtype(df[c].dtype)
+    ]
+
+# ─────────────────────────── Calcul ───────────────────────────────
+
+def summarize(df: pd.DataFrame, columns: list[str] | None = None, *, approx: bool | None = None) -> dict[str, dict]:
+    """{colonne: {statistique: valeur}} pour `columns` (défaut : toutes les numériques)."""
+    columns = numeric_columns(df) if columns is None else columns
+    if not columns:
+        return {}
+    if df.empty:
+        return {c: {k: 0 if k == "count" else None for k in STATS} | {"approx": False} for c in columns}
+    # ordre Fortran : chaque colonne contiguë en mémoire, les réductions par axe 0 restent séquentielles
+    values = np.empty((len(df), len(columns)), dtype="float64", order="F")
+    for i, col in enumerate(columns):
+        values[:, i] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    n = len(values)
+    approx = n > APPROX_ROWS if approx is None else approx
+    sample = values[:: max(1, n // QUANTILE_SAMPLE)] if approx else values
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # colonne vide : NaN attendu
+        count = (~np.isnan(values)).sum(axis=0)
+        mean = np.nanmean(values, axis=0)
+        var = np.nanvar(values, axis=0, ddof=1)
+        lo, hi = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        # quantiles : une partition (pas un tri) des valeurs présentes de chaque colonne
+        # (`np.nanquantile` sur deux dimensions repasse par une boucle Python ligne à ligne)
+        q25, median, q75 = np.full((3, len(columns)), np.nan)
+        for i in range(len(columns)):
+            col = sample[:, i]
+            col = col[~np.isnan(col)]
+            if len(col):
+                q25[i], median[i], q75[i] = np.quantile(col, [0.25, 0.5, 0.75])
+
+    out = {}
+    for i, col in enumerate(columns):
+        row = {"count": count[i], "mean": mean[i], "median": median[i], "std": np.sqrt(var[i]),
+               "var": var[i], "min": lo[i], "max": hi[i], "q25": q25[i], "q75": q75[i]}
+        out[col] = {k: None if np.isnan(v) else float(v) for k, v in row.items()}
+        out[col]["count"] = int(count[i])
+        out[col]["approx"] = bool(approx)
+    return out
+
+# ─────────────────────────── Persistance ──────────────────────────
+
+def stats_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.stats.json")
+
+
+def _read(path: Path, sha: str) -> dict[str, dict]:
+    try:
+        saved = json.loads(stats_path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if saved.get("sha256") != sha or saved.get("version") != STATS_VERSION:
+        return {}  # fichier re-nettoyé depuis, ou format de résumé changé
+    return saved.get("columns", {})
+
+
+def _write(path: Path, sha: str, columns: dict[str, dict]) -> None:
+    target = stats_path(path)
+    payload = {"sha256": sha, "version": STATS_VERSION, "columns": columns}
+    try:
+        with workspace.atomic_write(target) as tmp:
+            tmp.write_text(json.dumps(payload, indent=1, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:  # dossier en lecture seule : le résumé reste en mémoire
+        print(f"⚠️ Statistiques non enregistrées ({target.name}) : {e}")
+
+# ─────────────────────────── API ──────────────────────────────────
+
+def describe(df: pd.DataFrame, *, approx: bool | None = None) -> pd.DataFrame:
+    """Statistiques des colonnes numériques de `df` (une colonne par variable).
+
+    Un tableau chargé par `frame_cache` porte l'empreinte et le chemin de
+    son fichier (`df.attrs`) : le résumé est alors relu ou mémorisé, et
+    seules les colonnes encore inconnues sont calculées.
+    """
+    columns = numeric_columns(df)
+    sha, source = df.attrs.get("source_sha256"), df.attrs.get("source_path")
+    if not sha:
+        return _as_frame(summarize(df, columns, approx=approx), columns)
+
+    with _lock:
+        known = dict(_memo.get(sha, {}))
+        if sha in _memo:
+            _memo.move_to_end(sha)
+    if source and not set(columns) <= known.keys():
+        known.update(_read(Path(source), sha))
+    missing = [c for c in columns if c not in known]
+    if missing:
+        known.update(summarize(df, missing, approx=approx))
+        if source:
+            _write(Path(source), sha, known)
+    with _lock:
+        _memo[sha] = known
+        _memo.move_to_end(sha)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return _as_frame(known, columns)
+
+
+def _as_frame(summary: dict[str, dict], columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({c: summary[c] for c in columns}, index=list(STATS), dtype="float64")
+
+
+def clear() -> None:
+    with _lock:
+        _memo.clear()
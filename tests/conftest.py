@@ -0,0 +1,6 @@
+"""Les modules du dépôt sont à la racine : on la rend importable depuis tests/."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
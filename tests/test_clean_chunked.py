@@ -0,0 +1,68 @@
+"""Nettoyage par blocs : le fichier écrit est lisible dans chaque format de sortie."""
+
+import pandas as pd
+import pytest
+
+import clean_data
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    path = raw / "data_1.csv"
+    rows = [
+        {"REF_DATE": 2000 + i % 20, "GEO": f"Région {i % 7}", "VALUE": i * 1.5}
+        for i in range(5000)
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv", "xlsx"])
+def test_chunked_output_reads_back(raw_csv, tmp_path, fmt):
+    cleaned = tmp_path / "cleaned"
+    cleaned.mkdir()
+    stats = {}
+    out = clean_data.clean_file_chunked(raw_csv, chunksize=700, fmt=fmt, cleaned_dir=cleaned, stats=stats)
+
+    assert out == cleaned / f"data_1_cleaned.{fmt}"
+    readers = {
+        "parquet": pd.read_parquet, "feather": pd.read_feather,
+        "csv": pd.read_csv, "xlsx": pd.read_excel,
+    }
+    df = readers[fmt](out)
+    assert len(df) == stats["rows_out"] == 5000
+    assert list(df.columns) == ["ref_date", "geo", "value"]
+    assert df["value"].sum() == pytest.approx(sum(i * 1.5 for i in range(5000)))
+    # aucun fichier temporaire laissé à côté de la sortie
+    assert [p.name for p in cleaned.iterdir()] == [out.name]
+
+
+def test_row_hash_collision_keeps_distinct_rows(monkeypatch):
+    # empreinte principale forcée à 0 : seule la seconde empreinte distingue les lignes
+    real = clean_data._RowHashSet.fingerprints
+
+    def colliding(self, chunk):
+        main, check = real(self, chunk)
+        return main * 0, check
+
+    monkeypatch.setattr(clean_data._RowHashSet, "fingerprints", colliding)
+    seen = clean_data._RowHashSet()
+    first = pd.DataFrame({"geo": ["Québec", "Ontario"], "value": [1.0, 2.0]})
+    second = pd.DataFrame({"geo": ["Ontario", "Alberta", "Alberta"], "value": [2.0, 3.0, 3.0]})
+    assert seen.keep_new(first).to_dict("list") == {"geo": ["Québec", "Ontario"], "value": [1.0, 2.0]}
+    assert seen.keep_new(second).to_dict("list") == {"geo": ["Alberta"], "value": [3.0]}
+
+
+def test_sorted_merge_matches_full_sort(tmp_path):
+    # types mêlés d'un bloc à l'autre (année numérique ou texte) et NaN en dernier
+    raw = tmp_path / "mixed.csv"
+    years = [str(2000 + i % 9) if i % 500 else "n.d." for i in range(6000)]
+    values = [None if i % 37 == 0 else (i * 7919) % 1000 / 10 for i in range(6000)]
+    pd.DataFrame({"REF_DATE": years, "GEO": [f"G{i % 5}" for i in range(6000)], "VALUE": values}).to_csv(raw, index=False)
+    out = clean_data.clean_file_chunked(raw, chunksize=1000, fmt="csv", cleaned_dir=tmp_path,
+                                        sort="keys", sort_keys=["geo", "value"])
+    df = pd.read_csv(out)
+    expected = df.sort_values(["geo", "value"], kind="stable", na_position="last").reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected)
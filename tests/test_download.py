@@ -0,0 +1,143 @@
+"""Reprise des téléchargements interrompus (`import_data.download_url`), serveur simulé."""
+
+import hashlib
+
+import pytest
+import requests
+
+import import_data
+
+BODY = bytes(range(256)) * 64  # 16 Kio
+URL = "https://example.org/data.csv"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+class FakeServer:
+    """Sert `body` avec l'ETag `etag` ; `ranges` : "ok", "ignore" (200) ou "refuse" (416)."""
+
+    def __init__(self, body=BODY, etag='"v1"', ranges="ok"):
+        self.body, self.etag, self.ranges = body, etag, ranges
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        full = FakeResponse(200, self.body, {"ETag": self.etag, "Content-Length": str(len(self.body))})
+        if "Range" not in headers or self.ranges == "ignore":
+            return full
+        start = int(headers["Range"].removeprefix("bytes=").rstrip("-"))
+        if self.ranges == "refuse" or start >= len(self.body):
+            return FakeResponse(416, headers={"Content-Range": f"bytes */{len(self.body)}"})
+        if headers.get("If-Range") != self.etag:
+            return full  # autre version : le serveur renvoie tout le fichier
+        rest = self.body[start:]
+        return FakeResponse(206, rest, {
+            "ETag": self.etag,
+            "Content-Length": str(len(rest)),
+            "Content-Range": f"bytes {start}-{len(self.body) - 1}/{len(self.body)}",
+        })
+
+
+def _interrupted(dest, received, etag='"v1"', url=URL):
+    """Laisse un `.part` de `received` octets, comme après une coupure."""
+    part = dest.with_name(dest.name + ".part")
+    part.write_bytes(BODY[:received])
+    import_data._write_part_meta(part, url, {"etag": etag, "last_modified": None})
+    return part
+
+
+def _check_complete(result, dest, body=BODY):
+    assert dest.read_bytes() == body
+    assert result["bytes"] == len(body)
+    assert result["sha256"] == hashlib.sha256(body).hexdigest()
+    assert not dest.with_name(dest.name + ".part").exists()
+    assert not dest.with_name(dest.name + ".part.json").exists()
+
+
+def test_resume_same_url_and_etag(tmp_path):
+    dest = tmp_path / "data.csv"
+    _interrupted(dest, 5000)
+    server = FakeServer()
+    result = import_data.download_url(
+        URL, dest, session=server,
+        headers={"User-Agent": "test", "If-None-Match": '"v0"'},
+    )
+    _check_complete(result, dest)
+    assert result["resumed"]
+    [sent] = server.requests
+    assert sent["Range"] == "bytes=5000-" and sent["If-Range"] == '"v1"'
+    assert sent["User-Agent"] == "test"
+    assert "If-None-Match" not in sent  # condition réservée à la première requête
+
+
+def test_changed_etag_restarts_from_scratch(tmp_path):
+    dest = tmp_path / "data.csv"
+    _interrupted(dest, 5000, etag='"v1"')
+    new_body = BODY[::-1]
+    server = FakeServer(body=new_body, etag='"v2"')
+    result = import_data.download_url(URL, dest, session=server)
+    _check_complete(result, dest, new_body)
+    assert not result["resumed"] and result["etag"] == '"v2"'
+
+
+def test_other_url_is_not_resumed(tmp_path):
+    dest = tmp_path / "data.csv"
+    _interrupted(dest, 5000, url="https://example.org/other.csv")
+    server = FakeServer()
+    result = import_data.download_url(URL, dest, session=server)
+    _check_complete(result, dest)
+    assert "Range" not in server.requests[0]
+
+
+def test_refused_range_restarts_from_scratch(tmp_path):
+    dest = tmp_path / "data.csv"
+    _interrupted(dest, 5000)
+    server = FakeServer(ranges="refuse")
+    result = import_data.download_url(URL, dest, session=server)
+    _check_complete(result, dest)
+    assert not result["resumed"]
+    assert [("Range" in h) for h in server.requests] == [True, False]
+
+
+def test_server_ignoring_range_restarts_from_scratch(tmp_path):
+    dest = tmp_path / "data.csv"
+    _interrupted(dest, 5000)
+    server = FakeServer(ranges="ignore")
+    result = import_data.download_url(URL, dest, session=server)
+    _check_complete(result, dest)  # pas de début dupliqué
+    assert not result["resumed"]
+
+
+def test_resumed_file_is_validated_from_its_start(tmp_path):
+    dest = tmp_path / "data.csv"
+    part = _interrupted(dest, 5000)
+    seen = []
+
+    def refuse(head):
+        seen.append(head)
+        raise import_data.PayloadError("page HTML")
+
+    with pytest.raises(import_data.PayloadError):
+        import_data.download_url(URL, dest, session=FakeServer(), validate=refuse)
+    assert seen[0] == BODY[:import_data.SNIFF_BYTES]
+    assert not part.exists() and not dest.exists()
@@ -0,0 +1,31 @@
+"""Lecture des classeurs : en-tête repéré sous les titres, colonnes conservées."""
+
+import pytest
+
+import excel_reader
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _workbook(path, rows):
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+    return path
+
+
+def test_header_only_sheet_keeps_columns(tmp_path):
+    path = _workbook(tmp_path / "vide.xlsx", [["Tableau 1 : revenu"], [], ["geo", "valeur"]])
+    df = excel_reader.read_excel(path)
+    assert df.empty and list(df.columns) == ["geo", "valeur"]
+    assert list(excel_reader.read_excel(path, usecols=["valeur"]).columns) == ["valeur"]
+
+
+def test_chunks_skip_title_rows(tmp_path):
+    rows = [["Tableau 1 : revenu"], ["geo", "annee", "valeur"]] + [["Québec", 2000 + i, i / 2] for i in range(25)]
+    path = _workbook(tmp_path / "data.xlsx", rows)
+    chunks = list(excel_reader.iter_chunks(path, chunksize=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert list(chunks[0].columns) == ["geo", "annee", "valeur"]
+    assert chunks[-1]["annee"].tolist() == [2020, 2021, 2022, 2023, 2024]
@@ -0,0 +1,68 @@
+"""Cache des tableaux nettoyés : éviction LRU, invalidation, copies superficielles."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import frame_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    frame_cache.clear()
+    yield
+    frame_cache.configure(frame_cache.BUDGET_MB)
+    frame_cache.clear()
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path, columns):
+        self.calls.append(path.name)
+        return pd.read_parquet(path, columns=columns)
+
+
+def _write(path, seed, rows=60_000):  # ~0,5 Mo en mémoire
+    pd.DataFrame({"v": np.random.default_rng(seed).random(rows)}).to_parquet(path)
+    return path
+
+
+def test_least_recently_used_frame_is_evicted(tmp_path):
+    a, b, c = (_write(tmp_path / f"{n}.parquet", i) for i, n in enumerate("abc"))
+    frame_cache.configure(1)  # deux tableaux tiennent, pas trois
+    loader = CountingLoader()
+    frame_cache.load(a, loader)
+    frame_cache.load(b, loader)
+    frame_cache.load(a, loader)  # a redevient le plus récent
+    frame_cache.load(c, loader)  # évince b
+    assert frame_cache.stats()["frames"] == 2
+    frame_cache.load(a, loader)
+    frame_cache.load(b, loader)
+    assert loader.calls == ["a.parquet", "b.parquet", "c.parquet", "b.parquet"]
+
+
+def test_changed_file_is_read_again(tmp_path):
+    path = _write(tmp_path / "data.parquet", 0)
+    loader = CountingLoader()
+    first = frame_cache.load(path, loader)
+    assert frame_cache.load(path, loader)["v"].equals(first["v"])
+    _write(path, 1, rows=1000)  # nouveau contenu : nouvelle empreinte
+    second = frame_cache.load(path, loader)
+    assert loader.calls == ["data.parquet", "data.parquet"]
+    assert len(second) == 1000
+    assert second.attrs["source_sha256"] != first.attrs["source_sha256"]
+
+
+def test_callers_get_shallow_copies(tmp_path):
+    path = _write(tmp_path / "data.parquet", 0)
+    loader = CountingLoader()
+    mine = frame_cache.load(path, loader)
+    original = mine.loc[0, "v"]
+    mine.loc[0, "v"] = -1.0
+    mine["extra"] = 1
+    theirs = frame_cache.load(path, loader)
+    assert theirs.loc[0, "v"] == original
+    assert "extra" not in theirs.columns
+    assert loader.calls == ["data.parquet"]
@@ -0,0 +1,77 @@
+"""Travaux de fond : file bornée, annulation, travaux abandonnés."""
+
+import threading
+import time
+
+import pytest
+
+import jobs
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "délai dépassé"
+        time.sleep(0.01)
+
+
+def _blocked(release: threading.Event):
+    release.wait(10)
+    return "fini"
+
+
+def _looping(progress):
+    while True:  # ne s'arrête que par annulation
+        progress("en cours", None)
+        time.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def _forget_jobs():
+    yield
+    with jobs._lock:
+        jobs._jobs.clear()
+
+
+def test_submit_raises_queue_full_at_max_pending():
+    release = threading.Event()
+    try:
+        running = [jobs.submit("test", _blocked, release) for _ in range(jobs.MAX_WORKERS)]
+        _wait(lambda: all(j.status == jobs.RUNNING for j in running))
+        waiting = [jobs.submit("test", _blocked, release) for _ in range(jobs.MAX_PENDING)]
+        assert all(j.status == jobs.PENDING for j in waiting)
+        with pytest.raises(jobs.QueueFull):
+            jobs.submit("test", _blocked, release)
+    finally:
+        release.set()
+    _wait(lambda: all(j.status == jobs.DONE for j in running + waiting))
+    assert jobs.poll(running[0].id)["result"] == "fini"
+
+
+def test_report_raises_cancelled_once_cancel_requested():
+    job = jobs.Job(id="x", kind="test", status=jobs.RUNNING)
+    job.report("lecture", 10)
+    job._cancel.set()
+    with pytest.raises(jobs.Cancelled):
+        job.report("chargé", 30)
+    assert (job.stage, job.percent) == ("lecture", 10.0)
+
+
+def test_cancel_stops_job_at_next_progress():
+    job = jobs.submit("test", _looping, jobs.PROGRESS)
+    _wait(lambda: job.stage == "en cours")
+    assert jobs.cancel(job.id)
+    _wait(lambda: job.status == jobs.CANCELLED)
+    assert not jobs.cancel(job.id)  # déjà fini
+
+
+def test_reap_cancels_abandoned_and_forgets_old_jobs():
+    job = jobs.submit("test", _looping, jobs.PROGRESS)
+    _wait(lambda: job.status == jobs.RUNNING)
+    job.heartbeat = time.monotonic() - jobs.HEARTBEAT_TIMEOUT_S - 1  # onglet fermé
+    jobs.reap()
+    _wait(lambda: job.status == jobs.CANCELLED)
+
+    job.finished = time.time() - jobs.KEEP_FINISHED_S - 1
+    jobs.reap()
+    assert jobs.get(job.id) is None
@@ -0,0 +1,26 @@
+"""Magasin adressé par contenu : `gc` garde les objets des espaces de session."""
+
+import raw_store
+import workspace
+
+
+def test_gc_keeps_objects_indexed_by_workspaces(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # RAW_DIR, OBJECTS_DIR et WORKSPACES_DIR sont relatifs
+    raw_store.RAW_DIR.mkdir(parents=True)
+    shared, session_only, orphan = (tmp_path / n for n in ("shared.csv", "session.csv", "orphan.csv"))
+    shared.write_text("a,b\n1,2\n")
+    session_only.write_text("a,b\n3,4\n")
+    orphan.write_text("a,b\n5,6\n")
+
+    raw_store.store_file(shared, raw_store.RAW_DIR / "shared.csv")
+    ws = workspace.Workspace.create("session")
+    raw_store.store_file(shared, ws.raw_dir / "shared.csv")
+    kept = raw_store.store_file(session_only, ws.raw_dir / "session.csv")
+    dropped = raw_store.store_file(orphan, raw_store.RAW_DIR / "orphan.csv")
+    raw_store.remove(raw_store.RAW_DIR / "orphan.csv")
+
+    assert raw_store.gc() == 1
+    assert raw_store.object_path(kept["sha256"]).exists()
+    assert raw_store.object_path(raw_store.hash_file(shared)).exists()
+    assert not raw_store.object_path(dropped["sha256"]).exists()
+    assert (ws.raw_dir / "session.csv").read_text() == "a,b\n3,4\n"
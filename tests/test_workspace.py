@@ -0,0 +1,105 @@
+"""Écritures atomiques et verrous de fichiers, entre processus."""
+
+import multiprocessing as mp
+import os
+import time
+
+import pytest
+
+import workspace
+
+
+def _count(path, lock_target, n):
+    # lecture – pause – écriture : sans verrou, deux processus perdent des incréments
+    for _ in range(n):
+        with workspace.file_lock(lock_target):
+            value = int(path.read_text())
+            time.sleep(0.001)
+            path.write_text(str(value + 1))
+
+
+def _die_holding(lock_target, ready):
+    with workspace.file_lock(lock_target):
+        ready.set()
+        os._exit(0)  # pas de libération : le système doit lever le verrou
+
+
+def _hold(lock_target, ready, release):
+    with workspace.file_lock(lock_target):
+        ready.set()
+        release.wait(10)
+
+
+def test_file_lock_serializes_processes(tmp_path):
+    counter = tmp_path / "counter.txt"
+    counter.write_text("0")
+    procs = [mp.Process(target=_count, args=(counter, tmp_path / "index.json", 25)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    assert counter.read_text() == "100"
+    assert not workspace.lock_path(tmp_path / "index.json").exists()
+
+
+def test_lock_of_dead_process_is_reclaimed(tmp_path):
+    target = tmp_path / "data.parquet"
+    ready = mp.Event()
+    p = mp.Process(target=_die_holding, args=(target, ready))
+    p.start()
+    assert ready.wait(10)
+    p.join(10)
+    # le fichier de verrou est resté, avec le pid du mort, mais plus personne ne le tient
+    assert workspace.lock_path(target).read_text() == str(p.pid)
+    with workspace.file_lock(target, timeout=2):
+        pass
+
+
+def test_contended_reclaim_keeps_exclusion(tmp_path):
+    # plusieurs processus trouvent en même temps le verrou d'un mort : un seul doit le prendre
+    target = tmp_path / "index.json"
+    counter = tmp_path / "counter.txt"
+    counter.write_text("0")
+    for _ in range(5):
+        ready = mp.Event()
+        dead = mp.Process(target=_die_holding, args=(target, ready))
+        dead.start()
+        dead.join(10)
+        procs = [mp.Process(target=_count, args=(counter, target, 3)) for _ in range(6)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+            assert p.exitcode == 0
+    assert counter.read_text() == str(5 * 6 * 3)
+
+
+def test_file_lock_times_out_while_held(tmp_path):
+    target = tmp_path / "data.parquet"
+    ready, release = mp.Event(), mp.Event()
+    p = mp.Process(target=_hold, args=(target, ready, release))
+    p.start()
+    try:
+        assert ready.wait(10)
+        with pytest.raises(TimeoutError):
+            with workspace.file_lock(target, timeout=0.2):
+                pass
+    finally:
+        release.set()
+        p.join(10)
+
+
+def test_atomic_write_keeps_target_when_body_raises(tmp_path):
+    target = tmp_path / "data_cleaned.csv"
+    target.write_text("ancien")
+    with pytest.raises(RuntimeError):
+        with workspace.atomic_write(target) as tmp:
+            tmp.write_text("nouveau, à moitié")
+            raise RuntimeError("échec en cours d'écriture")
+    assert target.read_text() == "ancien"
+    assert [p.name for p in tmp_path.iterdir()] == [target.name]
+
+    with workspace.atomic_write(target) as tmp:
+        tmp.write_text("nouveau")
+    assert target.read_text() == "nouveau"
@@ -103,6 +103,7 @@ You can now switch to the **Import** tab to load your data.
     "cleaning": ("Nettoyage en cours…", "Cleaning in progress…"),
     "clean_done": ("✅ Nettoyage terminé :", "✅ Cleaning done:"),
     "download_clean": ("📥 Télécharger le fichier nettoyé", "📥 Download cleaned file"),
+    "btn_export_xlsx": ("📄 Préparer la version Excel", "📄 Prepare the Excel version"),
     "go_viz": ("ℹ️ Passez à l’onglet **Visualisation**.", "ℹ️ Go to the **Visualization** tab."),
     "viz_header": ("📊 Visualisation des données", "📊 Data visualization"),
     "warn_clean_first": ("⛔ Nettoyez d’abord un fichier.", "⛔ Clean a file first."),
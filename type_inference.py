@@ -0,0 +1,117 @@
+"""type_inference.py
+
+Détection des colonnes numériques d'après leur CONTENU, colonne par colonne
+et sans boucle Python sur les cellules.
+
+Une colonne de texte (ou catégorielle) est jugée sur un échantillon régulier
+de `SAMPLE_ROWS` valeurs non vides, comparé d'un bloc (`str.fullmatch`) à
+deux conventions d'écriture :
+    • française : virgule décimale, milliers séparés par une espace
+      (ordinaire, insécable ou fine) — « 1 234,5 » ;
+    • anglaise  : point décimal, milliers séparés par une virgule —
+      « 1,234.5 ».
+La convention qui reconnaît le plus de valeurs l'emporte (à égalité, la
+française : « 1,234 » se lit 1,234). Si au moins `NUMERIC_THRESHOLD` des
+valeurs échantillonnées sont des nombres, la colonne entière est convertie
+en une passe (`str.replace` puis `pd.to_numeric`) ; une cellule non
+numérique devient NaN. Une colonne catégorielle n'est convertie que sur
+ses catégories.
+
+    df, numeric, other = type_inference.split_columns(df)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_THRESHOLD = 0.80    # ≥ 80 % de vrais nombres → numérique
+SAMPLE_ROWS = 5_000         # valeurs examinées pour décider
+
+_SPACES = " \u00a0\u202f"   # espace, insécable, fine insécable
+_EXP = r"(?:[eE][+-]?\d+)?"
+_FRENCH = re.compile(rf"[+-]?(?:\d{{1,3}}(?:[{_SPACES}]\d{{3}})+|\d+)(?:,\d+)?{_EXP}")
+_ENGLISH = re.compile(rf"[+-]?(?:\d{{1,3}}(?:,\d{{3}})+|\d+)(?:\.\d+)?{_EXP}")
+
+
+@dataclass(frozen=True)
+class NumberFormat:
+    decimal: str
+    thousands: str      # caractères de groupement possibles
+    ratio: float        # part des valeurs échantillonnées reconnues
+
+
+_CONVENTIONS = ((",", _SPACES, _FRENCH), (".", ",", _ENGLISH))  # la française d'abord : gagne les égalités
+
+
+def _sample(values: pd.Series, size: int) -> pd.Series:
+    """Échantillon régulier (début, milieu, fin du fichier) de valeurs non vides."""
+    values = values.dropna()
+    if len(values) > size:
+        values = values.iloc[np.linspace(0, len(values) - 1, size).astype(np.int64)]
+    return values.astype(str).str.strip()
+
+
+def number_format(s: pd.Series, *, sample: int = SAMPLE_ROWS,
+                  threshold: float = NUMERIC_THRESHOLD) -> NumberFormat | None:
+    """Convention d'écriture des nombres de `s`, ou None si la colonne n'est pas numérique."""
+    if pd.api.types.is_bool_dtype(s.dtype) or pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return NumberFormat(".", "", 1.0)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = pd.Series(s.cat.categories)
+    values = _sample(s, sample)
+    values = values[values != ""]
+    if values.empty:
+        return None
+    best = None
+    for decimal, thousands, pattern in _CONVENTIONS:
+        ratio = float(values.str.fullmatch(pattern).mean())
+        if best is None or ratio > best.ratio:
+            best = NumberFormat(decimal, thousands, ratio)
+    return best if best.ratio >= threshold else None
+
+
+def to_numeric(s: pd.Series, fmt: NumberFormat) -> pd.Series:
+    """`s` convertie d'un bloc selon `fmt` ; une cellule illisible devient NaN."""
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # seules les catégories sont converties, puis redistribuées par les codes
+        cats = to_numeric(pd.Series(s.cat.categories), fmt).to_numpy(dtype="float64", na_value=np.nan)
+        codes = s.cat.codes.to_numpy()
+        return pd.Series(np.where(codes >= 0, cats[codes], np.nan), index=s.index, name=s.name)
+    text = s.astype(str).where(s.notna()).str.strip()
+    # la colonne est déjà reconnue numérique : les séparateurs de milliers sont retirés
+    # partout, par remplacements simples (une regex avec contexte est ~30× plus lente)
+    for ch in fmt.thousands:
+        text = text.str.replace(ch, "", regex=False)
+    if fmt.decimal != ".":
+        text = text.str.replace(fmt.decimal, ".", regex=False)
+    try:
+        return text.astype("float64")  # cas courant : toutes les cellules sont lisibles
+    except (TypeError, ValueError):
+        return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def split_columns(df: pd.DataFrame, *, sample: int = SAMPLE_ROWS,
+                  threshold: float = NUMERIC_THRESHOLD) -> tuple[pd.DataFrame, list[str], list[str]]:
+    """(tableau aux colonnes numériques converties, colonnes numériques, autres colonnes)."""
+    numeric, other, converted = [], [], {}
+    for col in df.columns:
+        fmt = number_format(df[col], sample=sample, threshold=threshold)
+        if fmt is None:
+            other.append(col)
+            continue
+        numeric.append(col)
+        if not pd.api.types.is_numeric_dtype(df[col].dtype):
+            converted[col] = to_numeric(df[col], fmt)
+    if converted:
+        df = df.copy(deep=False)
+        for col, values in converted.items():
+            df[col] = values
+    return df, numeric, other
@@ -6,21 +6,39 @@ Visualisation interactive – version améliorée 🎨
 • Choix dynamique du type de graphique
 • Palette de couleurs ou thème prédéfini
 • Statistiques descriptives complètes
-• Téléchargement du graphique (géré par web_interface)
-• Stockage de la dernière figure via get_last_figure()
+• Téléchargement du graphique (géré par web_interface, rendu à la demande)
+• `plot_data` retourne le `Plot` affiché (figure reconstruite à la demande, rien de global)
 
 ⚠️  Tous les textes français d’origine sont conservés à l’identique.
 """
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib as mpl
-from matplotlib.ticker import FuncFormatter
+from matplotlib.ticker import FuncFormatter, MaxNLocator
 
-plt.style.use("seaborn-v0_8-darkgrid")
+import excel_reader
+import frame_cache
+import render_cache
+import statcan_model
+import stats_service
+import type_inference
+from downsample import POINT_BUDGET, bin_scatter, reduce_line, sample_rows
+
+_styled = False
+
+def _apply_style() -> None:
+    """Thème des graphiques, appliqué au premier tracé plutôt qu'à l'import du module."""
+    global _styled
+    if not _styled:
+        plt.style.use("seaborn-v0_8-darkgrid")
+        _styled = True
 
 try:
     import streamlit as st
@@ -43,6 +61,14 @@ T = {
     "stats_header": ("### 📊 Statistiques descriptives", "### 📊 Descriptive statistics"),
     "warn_no_numeric": ("Aucune colonne numérique à tracer.", "No numeric column to plot."),
     "show_df": ("Afficher un aperçu du tableau", "Show a preview of the dataframe"),
+    "point_budget": ("Points tracés au plus (0 = tous)", "Max plotted points (0 = all)"),
+    "agg": ("Agrégation des barres", "Bar aggregation"),
+    "series": ("Série (couleur)", "Series (colour)"),
+    "statcan_mode": ("Tableau StatCan : tracer par série", "StatCan table: plot by series"),
+    "statcan_geo": ("Géographies", "Geographies"),
+    "statcan_kind": ("Type de graphique", "Chart type"),
+    "reduced": ("{out:,} points tracés sur {n:,} ({ratio:.1%}) – {method}",
+                "{out:,} points drawn out of {n:,} ({ratio:.1%}) – {method}"),
 }
 
 def _t(key):
@@ -51,25 +77,87 @@ def _t(key):
     return T[key][1] if isinstance(T[key], tuple) else T[key]
 
 CLEANED_DIR = Path("data/cleaned")
-_last_fig = None
+FIGSIZE = (9, 5)
 
-def get_last_figure():
-    return _last_fig
+# Ordre de préférence : formats colonnes d'abord, .xlsx seulement pour les anciens fichiers
+CLEANED_EXTS = (".parquet", ".feather", ".csv", ".xlsx")
 
 def list_cleaned_files():
-    return sorted(p for p in CLEANED_DIR.glob("*_cleaned.*") if p.suffix in {".csv", ".xlsx"})
-
-def load_cleaned_file(stem: str) -> Optional[pd.DataFrame]:
-    for ext in (".xlsx", ".csv"):
-        fp = CLEANED_DIR / f"{stem}_cleaned{ext}"
+    return sorted(p for p in CLEANED_DIR.glob("*_cleaned.*") if p.suffix in CLEANED_EXTS)
+
+def read_cleaned(fp: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """Lit un fichier nettoyé ; `columns` limite la lecture à ces colonnes."""
+    if fp.suffix == ".parquet":
+        return pd.read_parquet(fp, columns=columns)
+    if fp.suffix == ".feather":
+        return pd.read_feather(fp, columns=columns)
+    if fp.suffix == ".xlsx":
+        return excel_reader.read_excel(fp, header=0, usecols=columns)
+    return pd.read_csv(fp, usecols=columns)
+
+def _read_typed(fp: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """`read_cleaned`, colonnes numériques écrites en texte déjà converties (gardé tel quel en cache)."""
+    return type_inference.split_columns(read_cleaned(fp, columns))[0]
+
+def load_cleaned_file(stem: str, columns: Optional[list[str]] = None,
+                      cleaned_dir: Path = CLEANED_DIR) -> Optional[pd.DataFrame]:
+    """Tableau nettoyé `stem` de `cleaned_dir`, gardé en mémoire (`frame_cache`) tant que le fichier ne change pas."""
+    for ext in CLEANED_EXTS:
+        fp = Path(cleaned_dir) / f"{stem}_cleaned{ext}"
         if fp.exists():
-            return pd.read_excel(fp) if ext == ".xlsx" else pd.read_csv(fp)
+            return frame_cache.load(fp, _read_typed, columns)
     if _IN_STREAMLIT:
         st.error(f"Fichier nettoyé introuvable : {stem}")
     return None
 
+# ─────────────────────────── Agrégation ───────────────────────────
+
+AGG_FUNCS = {"sum": ("somme", "sum"), "mean": ("moyenne", "mean"),
+             "median": ("médiane", "median"), "last": ("dernière valeur", "last value")}
+AGG_DEFAULT = "mean"
+AGG_CACHE_SIZE = 64
+MAX_SERIES = 12          # séries (couleurs) tracées au plus : les plus grandes en valeur absolue
+
+_agg_cache: OrderedDict[tuple, pd.Series | pd.DataFrame] = OrderedDict()
+_agg_lock = threading.Lock()
+
+def aggregate(df: pd.DataFrame, x_col: str, y_col: str, agg: str = AGG_DEFAULT,
+              series: Optional[str] = None):
+    """`y_col` agrégé par `x_col` (et par `series` en colonnes) : sum, mean, median ou last.
+
+    Retourne une Series indexée par X, ou un DataFrame (une colonne par
+    valeur de `series`). Le résultat est mémorisé par (jeu de données, x, y,
+    agg, série) quand le tableau vient de `frame_cache` ; « last » suit
+    l'ordre des lignes (le tri du nettoyage).
+    """
+    if agg not in AGG_FUNCS:
+        raise ValueError(f"Agrégation inconnue : {agg} (attendu : {', '.join(AGG_FUNCS)})")
+    source = df.attrs.get("source_sha256")
+    key = (source, x_col, y_col, agg, series, str(df[y_col].dtype)) if source else None
+    if key:
+        with _agg_lock:
+            if key in _agg_cache:
+                _agg_cache.move_to_end(key)
+                return _agg_cache[key]
+
+    by = [x_col] if not series or series == x_col else [x_col, series]
+    grouped = df.groupby(by, observed=True, sort=True)[y_col]
+    out = grouped.last() if agg == "last" else grouped.agg(agg)
+    if len(by) == 2:
+        out = out.unstack(series)
+        if out.shape[1] > MAX_SERIES:
+            top = out.abs().sum().nlargest(MAX_SERIES).index
+            out = out[top]
+
+    if key:
+        with _agg_lock:
+            _agg_cache[key] = out
+            while len(_agg_cache) > AGG_CACHE_SIZE:
+                _agg_cache.popitem(last=False)
+    return out
+
 def plot_data(df: pd.DataFrame):
-    numeric_cols = df.select_dtypes("number").columns.tolist()
+    df, numeric_cols, _ = type_inference.split_columns(df)  # même détection que smart_plotter
     if not numeric_cols:
         if _IN_STREAMLIT:
             st.warning(_t("warn_no_numeric"))
@@ -84,11 +172,16 @@ def plot_data(df: pd.DataFrame):
 def _fmt_thousands(x, _):
     return f"{int(x):,}".replace(",", " ")
 
-def _plot_streamlit(df: pd.DataFrame, numeric_cols):
-    global _last_fig
-
+def _plot_streamlit(df: pd.DataFrame, numeric_cols) -> render_cache.Plot:
+    """Panneau latéral et graphique ; retourne le `Plot` (exports à la demande par `web_interface`)."""
     st.sidebar.header(_t("sidebar_header"))
 
+    # Tableau StatCan au format long : une série par GEO pour les membres choisis,
+    # plutôt que toutes les lignes du tableau mêlées (`statcan_model`)
+    table = statcan_model.for_frame(df)
+    if table is not None and st.sidebar.checkbox(_t("statcan_mode"), value=True):
+        return _plot_statcan(df, table)
+
     x_col = st.sidebar.selectbox(_t("x_col"), df.columns, index=0)
     y_col = st.sidebar.selectbox(_t("y_col"), numeric_cols, index=0)
 
@@ -110,18 +203,77 @@ def _plot_streamlit(df: pd.DataFrame, numeric_cols):
     stats_en = {"count": "count", "mean": "mean", "median": "median", "std": "std-dev", "var": "variance", "min": "min", "max": "max"}
     mapper = stats_fr if st.session_state.lang == "Français" else stats_en
 
-    stats = df[y_col].agg(list(mapper.keys())).round(3).rename(index=mapper)
+    # résumé calculé une fois par fichier pour toutes les colonnes numériques (`stats_service`)
+    stats = stats_service.describe(df).loc[list(mapper), y_col].round(3).rename(index=mapper)
     st.sidebar.table(stats.to_frame(name=y_col))
 
+    budget = st.sidebar.number_input(_t("point_budget"), min_value=0, value=POINT_BUDGET, step=1000)
+
     kind_key = kinds_fr[kinds.index(kind)] if st.session_state.lang != "Français" else kind
-    fig = _make_plot(df, x_col, y_col, z_col if kind_key == "3D" else None, kind_key, color_pick)
-    _last_fig = fig
-    st.pyplot(fig, use_container_width=True)
+    agg, series = AGG_DEFAULT, None
+    if kind_key == "Barres":
+        lang = 0 if st.session_state.lang == "Français" else 1
+        agg = st.sidebar.selectbox(_t("agg"), list(AGG_FUNCS), index=list(AGG_FUNCS).index(AGG_DEFAULT),
+                                   format_func=lambda a: AGG_FUNCS[a][lang])
+        dims = [c for c in df.columns if c not in numeric_cols and c != x_col]
+        series_sel = st.sidebar.selectbox(_t("series"), [_t("none")] + dims, index=0)
+        series = None if series_sel == _t("none") else series_sel
+
+    z_plot = z_col if kind_key == "3D" else None
+    key = render_cache.plot_key(
+        df.attrs.get("source_sha256"), x=x_col, y=y_col, z=z_plot, kind=kind_key, color=color_pick,
+        budget=budget, agg=agg, series=series, size=FIGSIZE,
+    )
+    reduction: dict = {}  # propre à ce rendu ; recopié du cache avec l'image
+
+    def build():
+        reduction.clear()
+        return _make_plot(df, x_col, y_col, z_plot, kind_key, color_pick,
+                          budget=budget, info=reduction, agg=agg, series=series)
+
+    # image d'écran en cache : une réexécution aux mêmes paramètres ne redessine rien
+    plot = render_cache.Plot(key, build, reduction)
+    png = render_cache.screen_png(plot)
+    if reduction and reduction["points_out"] < reduction["points_in"]:
+        st.sidebar.caption(_t("reduced").format(
+            out=reduction["points_out"], n=reduction["points_in"],
+            ratio=reduction["points_out"] / reduction["points_in"], method=reduction["method"],
+        ))
+    st.image(png, use_container_width=True)
 
     if st.checkbox(_t("show_df")):
         st.dataframe(df.head())
 
-    return fig
+    return plot
+
+def _plot_statcan(df: pd.DataFrame, table: statcan_model.StatCanTable) -> render_cache.Plot:
+    """Panneau StatCan : membres des dimensions, GEO à comparer ; tracé de `table.pivot`."""
+    geos = st.sidebar.multiselect(_t("statcan_geo"), table.geos, default=[table.default_geo])
+    members = {d: st.sidebar.selectbox(d, table.members[d]) for d in table.varying()}
+    kinds = ["Ligne", "Barres"] if st.session_state.lang == "Français" else ["Line", "Bar"]
+    kind = st.sidebar.radio(_t("statcan_kind"), kinds)
+    kind_key = "Ligne" if kind == kinds[0] else "Barres"
+    color_pick = st.sidebar.color_picker(_t("main_colour"), "#1f77b4")
+
+    title = " – ".join(str(m) for m in members.values()) or str(table.layout.col("value"))
+    ylabel = f"{table.layout.col('value')} ({table.unit})" if table.unit else table.layout.col("value")
+    key = render_cache.plot_key(
+        df.attrs.get("source_sha256"), statcan=True, geos=[str(g) for g in geos],
+        members={k: str(v) for k, v in members.items()}, kind=kind_key, color=color_pick, size=FIGSIZE,
+    )
+
+    def build():
+        wide = table.pivot(geos, **members)  # découpe mémorisée : aucun parcours du tableau
+        return _make_series_plot(wide, kind_key, color_pick, title=title, ylabel=ylabel)
+
+    plot = render_cache.Plot(key, build)
+    png = render_cache.screen_png(plot)
+    st.image(png, use_container_width=True)
+
+    if st.checkbox(_t("show_df")):
+        st.dataframe(table.pivot(geos, **members))
+
+    return plot
 
 def _plot_console(df: pd.DataFrame, numeric_cols):
     import rich
@@ -145,8 +297,20 @@ def _plot_console(df: pd.DataFrame, numeric_cols):
     fig = _make_plot(df, x_col, y_col, None, "Ligne", "#1f77b4")
     plt.show()
 
-def _make_plot(df, x_col, y_col, z_col, kind, color):
-    mpl.rcParams.update({"font.size": 11, "axes.grid": True, "grid.alpha": 0.4, "figure.figsize": (9, 5)})
+def _in_x_order(df: pd.DataFrame, x_col: str) -> pd.DataFrame:
+    """Lignes dans l'ordre de `x_col`, sans retrier si le nettoyage l'a déjà fait."""
+    if df.attrs.get("sorted_by", [])[:1] == [x_col]:
+        return df
+    return df.sort_values(x_col, kind="stable")
+
+def _make_plot(df, x_col, y_col, z_col, kind, color, *, budget=POINT_BUDGET, info=None,
+               agg=AGG_DEFAULT, series=None):
+    """Figure matplotlib ; au-delà de `budget` points, les séries sont réduites
+    (`downsample`) et `info`, s'il est fourni, reçoit le détail de la réduction.
+    Les barres tracent `aggregate(df, x_col, y_col, agg, series)`, une barre par X."""
+    info = {} if info is None else info
+    _apply_style()
+    mpl.rcParams.update({"font.size": 11, "axes.grid": True, "grid.alpha": 0.4, "figure.figsize": FIGSIZE})
 
     if kind == "3D" and z_col:
         data3d = (
@@ -154,6 +318,8 @@ def _make_plot(df, x_col, y_col, z_col, kind, color):
             .apply(pd.to_numeric, errors="coerce")
             .dropna()
         )
+        data3d, reduced = sample_rows(data3d, budget)
+        info.update(reduced)
         if data3d.empty:
             return plt.figure()
 
@@ -175,14 +341,23 @@ def _make_plot(df, x_col, y_col, z_col, kind, color):
     fig, ax = plt.subplots()
 
     if kind == "Ligne":
-        ax.plot(df[x_col], df[y_col], marker="o", color=color)
+        ordered = _in_x_order(df, x_col)
+        xs, ys, reduced = reduce_line(ordered[x_col], ordered[y_col], budget)
+        info.update(reduced)
+        # marqueurs seulement quand les points restent lisibles
+        ax.plot(xs, ys, marker="o" if len(xs) <= 500 else None, color=color)
     elif kind == "Nuage de points":
-        ax.scatter(df[x_col], df[y_col], color=color)
+        xs, ys, counts, reduced = bin_scatter(df[x_col], df[y_col], budget)
+        info.update(reduced)
+        if reduced["method"] == "densité" and len(counts):
+            alpha = 0.15 + 0.85 * np.log1p(counts) / np.log1p(counts.max())
+            ax.scatter(xs, ys, color=color, alpha=alpha, s=12)
+        else:
+            ax.scatter(xs, ys, color=color)
     elif kind == "Histogramme":
         ax.hist(df[y_col], bins=20, color=color)
     elif kind == "Barres":
-        ax.bar(df[x_col].astype(str), df[y_col], color=color)
-        plt.xticks(rotation=45, ha="right")
+        _draw_bars(ax, aggregate(df, x_col, y_col, agg, series), color)
 
     ax.set_title(f"{y_col} vs {x_col}")
     ax.set_xlabel(x_col)
@@ -191,6 +366,48 @@ def _make_plot(df, x_col, y_col, z_col, kind, color):
     plt.tight_layout()
     return fig
 
+def _draw_bars(ax, grouped, color):
+    """Une barre par X ; groupes côte à côte quand `grouped` est un DataFrame (une colonne par série)."""
+    labels = grouped.index.astype(str)  # seulement les X distincts
+    if isinstance(grouped, pd.DataFrame):
+        width = 0.8 / max(1, grouped.shape[1])
+        pos = np.arange(len(grouped))
+        for i, name in enumerate(grouped.columns):
+            ax.bar(pos + i * width, grouped[name].to_numpy(), width=width, label=str(name),
+                   color=color if i == 0 else f"C{i}")
+        ax.set_xticks(pos + width * (grouped.shape[1] - 1) / 2, labels)
+        ax.legend(fontsize=8)
+    else:
+        ax.bar(labels, grouped.to_numpy(), color=color)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+
+def _make_series_plot(wide: pd.DataFrame, kind, color, *, title="", ylabel=""):
+    """Figure d'un tableau large (une colonne par série, une ligne par date) : lignes ou barres groupées."""
+    _apply_style()
+    mpl.rcParams.update({"font.size": 11, "axes.grid": True, "grid.alpha": 0.4, "figure.figsize": FIGSIZE})
+    fig, ax = plt.subplots()
+    if wide.empty:
+        pass
+    elif kind == "Barres":
+        _draw_bars(ax, wide if wide.shape[1] > 1 else wide.iloc[:, 0], color)
+    else:
+        ordered = pd.api.types.is_numeric_dtype(wide.index) or pd.api.types.is_datetime64_any_dtype(wide.index)
+        xs = wide.index if ordered else wide.index.astype(str)
+        for i, name in enumerate(wide.columns):
+            ax.plot(xs, wide[name].to_numpy(), marker="o" if len(wide) <= 500 else None,
+                    label=str(name), color=color if i == 0 else f"C{i}")
+        if pd.api.types.is_integer_dtype(wide.index):
+            ax.xaxis.set_major_locator(MaxNLocator(integer=True))  # années : pas de 2022.5
+        if wide.shape[1] > 1:
+            ax.legend(fontsize=8)
+    ax.set_title(title)
+    ax.set_xlabel(wide.index.name or "")
+    ax.set_ylabel(ylabel)
+    if not wide.empty and np.nanmax(np.abs(wide.to_numpy(dtype="float64"))) >= 1000:
+        ax.yaxis.set_major_formatter(FuncFormatter(_fmt_thousands))  # pas pour des pourcentages
+    plt.tight_layout()
+    return fig
+
 if __name__ == "__main__":
     files = list_cleaned_files()
     if not files:
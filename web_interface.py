@@ -11,20 +11,24 @@ affiche simplement l’une ou l’autre version.
 
 from __future__ import annotations
 
-import os, re, tempfile
-from io import BytesIO
+import re
 from pathlib import Path
+from typing import Callable
 from translations import TRANSLATE
 
 import streamlit as st
 
-from import_data import add_one_file
-from clean_data import main as clean_main
-from vizualisation import plot_data, load_cleaned_file
+import jobs
+from workspace import Workspace, prune
+
+# Import, nettoyage et visualisation (pandas, pyjanitor, requests, matplotlib…) ne sont
+# chargés qu'au premier usage, dans l'onglet concerné : un nouveau worker Streamlit affiche
+# l'accueil sans les payer. Mesure : `python startup_report.py`.
 
 # ───────────────────────── Helpers ─────────────────────────
 SLUG_RE = re.compile(r"[^a-z0-9]+")
 slugify = lambda txt: SLUG_RE.sub("_", txt.lower()).strip("_")
+JOB_POLL_S = 0.5  # intervalle de rafraîchissement de l'avancement d'un travail de fond
 
 # ─────────────────── Sélecteur de langue ───────────────────
 # Langue par défaut (Français)
@@ -147,6 +151,7 @@ You can now switch to the **Import** tab to load your data.
     "file_imported": ("✅ Fichier importé :", "✅ File imported:"),
     "download_raw": ("📥 Télécharger le fichier importé", "📥 Download imported file"),
     "go_clean": ("ℹ️ Passez à l’onglet **Nettoyage**.", "ℹ️ Go to the **Cleaning** tab."),
+    "downloading": ("Téléchargement…", "Downloading…"),
 
     # Nettoyage
     "clean_header": ("🧽 Nettoyage automatique du fichier", "🧽 Automatic file cleaning"),
@@ -155,13 +160,24 @@ You can now switch to the **Import** tab to load your data.
     "cleaning": ("Nettoyage en cours…", "Cleaning in progress…"),
     "clean_done": ("✅ Nettoyage terminé :", "✅ Cleaning done:"),
     "download_clean": ("📥 Télécharger le fichier nettoyé", "📥 Download cleaned file"),
+    "btn_export_xlsx": ("📄 Préparer la version Excel", "📄 Prepare the Excel version"),
     "go_viz": ("ℹ️ Passez à l’onglet **Visualisation**.", "ℹ️ Go to the **Visualization** tab."),
 
+    # Travaux en arrière-plan
+    "btn_cancel": ("✖️ Annuler", "✖️ Cancel"),
+    "job_queued": ("⏳ En attente d’un emplacement libre…", "⏳ Waiting for a free slot…"),
+    "job_cancelled": ("⏹️ Opération annulée.", "⏹️ Operation cancelled."),
+    "job_failed": ("🚫 Échec :", "🚫 Failed:"),
+    "job_busy": ("⏳ Serveur occupé, réessayez dans un instant.", "⏳ Server busy, please try again shortly."),
+
     # Visualisation
     "viz_header": ("📊 Visualisation des données", "📊 Data visualization"),
     "warn_clean_first": ("⛔ Nettoyez d’abord un fichier.", "⛔ Clean a file first."),
     "sidebar_graph": ("📌 Paramètres du graphique", "📌 Graph parameters"),
     "btn_viz_dl": ("📸 Télécharger le graphique", "📸 Download chart"),
+    "export_fmt": ("Format du graphique", "Chart format"),
+    "btn_viz_export": ("🖨️ Préparer le graphique (haute définition)", "🖨️ Prepare the chart (high resolution)"),
+    "exporting": ("Préparation du graphique…", "Preparing the chart…"),
     "err_load_clean": ("🚫 Impossible de charger le fichier nettoyé.", "🚫 Can't load cleaned file."),
     "err_clean_missing": ("🚫 Fichier nettoyé introuvable.", "🚫 Cleaned file not found."),
     "back_import": (
@@ -187,6 +203,94 @@ st.session_state.setdefault("step", 0)
 step = st.session_state.step
 st.session_state.setdefault("imported_name", "")
 st.session_state.setdefault("cleaned_name", "")
+st.session_state.setdefault("xlsx_name", "")
+
+# Espace de travail propre à la session : imports et fichiers nettoyés ne sont
+# jamais partagés avec une autre session, les chemins sont passés explicitement.
+if "workspace" not in st.session_state:
+    prune()  # espaces abandonnés depuis plus d'un jour
+    st.session_state.workspace = Workspace.create()
+ws: Workspace = st.session_state.workspace.ensure()
+
+# ─────────────────── Travaux en arrière-plan ───────────────────
+# Nettoyage et import par URL partent dans le pool de `jobs` : le script rend la main
+# tout de suite, seul le fragment d'avancement est réexécuté toutes les JOB_POLL_S s.
+
+def _import_url_job(url: str, name: str, raw_dir: Path, progress: Callable) -> str | None:
+    from import_data import add_one_file
+
+    def _bytes(done: int, total: int | None, rate: float) -> None:
+        progress(f"{done / 1e6:.1f} Mo – {rate / 1e6:.2f} Mo/s", 100 * done / total if total else None)
+
+    return add_one_file(url, final_name=name, progress=_bytes, raw_dir=raw_dir)
+
+
+def _clean_job(raw_path: Path, cleaned_dir: Path, progress: Callable) -> Path:
+    from clean_data import main as clean_main
+
+    return clean_main(raw_path, raw_dir=raw_path.parent, cleaned_dir=cleaned_dir, progress=progress)
+
+
+def _start_job(slot: str, kind: str, fn: Callable, *args) -> None:
+    try:
+        st.session_state[slot] = jobs.submit(kind, fn, *args, jobs.PROGRESS).id
+    except jobs.QueueFull:
+        st.session_state[f"{slot}_msg"] = ("warning", _("job_busy"))
+
+
+@st.fragment(run_every=JOB_POLL_S)
+def _follow_job(slot: str, label: str, on_done: Callable) -> None:
+    """Avancement du travail noté dans `session_state[slot]` ; `on_done(résultat)` à la fin."""
+    state = jobs.poll(st.session_state[slot])  # chaque lecture prouve que l'onglet est ouvert
+    if state is not None and state["status"] in (jobs.PENDING, jobs.RUNNING):
+        text = _("job_queued") if state["status"] == jobs.PENDING else f"{label} {state['stage']}"
+        st.progress(state["percent"] / 100, text=text)
+        if st.button(_("btn_cancel"), key=f"cancel_{slot}"):
+            jobs.cancel(state["id"])
+        return
+    st.session_state[slot] = None
+    if state is None or state["status"] == jobs.CANCELLED:
+        st.session_state[f"{slot}_msg"] = ("info", _("job_cancelled"))
+    elif state["status"] == jobs.FAILED:
+        st.session_state[f"{slot}_msg"] = ("error", f"{_('job_failed')} {state['error']}")
+    else:
+        on_done(state["result"])
+    st.rerun()
+
+
+def _job_message(slot: str) -> None:
+    """Message laissé par le dernier travail de `slot` (annulation, échec), affiché une fois."""
+    msg = st.session_state.pop(f"{slot}_msg", None)
+    if msg:
+        getattr(st, msg[0])(msg[1])
+
+
+def _imported(saved: str | None) -> None:
+    if saved:
+        st.session_state.imported_name = Path(saved).name
+        st.session_state.step = 1
+    else:
+        st.session_state["import_job_msg"] = ("error", _("err_import"))
+
+
+def _cleaned(cleaned_path: Path) -> None:
+    st.session_state.cleaned_name = Path(cleaned_path).name
+    st.session_state.xlsx_name = ""
+    st.session_state.step = 2
+
+
+@st.fragment(run_every=JOB_POLL_S)
+def _follow_export() -> None:
+    """Attend l'export lancé par `render_cache.export` sans bloquer le script ; relance la page une fois prêt."""
+    export = st.session_state.export_job
+    if export is None or export[1].done():
+        st.rerun()
+    st.info(_("exporting"))
+
+
+st.session_state.setdefault("import_job", None)
+st.session_state.setdefault("clean_job", None)
+st.session_state.setdefault("export_job", None)  # ((clé du graphique, format), Future[bytes])
 
 # ─────────────────── Tabs ───────────────────
 TAB_LABELS = [_("tab_home"), _("tab_guide"), _("tab_import"), _("tab_clean"), _("tab_viz")]
@@ -231,21 +335,19 @@ with tab_import:
     src_type = st.radio(_("data_source"), [_("src_local"), _("src_url")], horizontal=True)
 
     if src_type == _("src_local"):
-        uploaded = st.file_uploader(_("upload_file"), type=["csv", "xlsx", "xls"], help="200 Mo max")
+        uploaded = st.file_uploader(_("upload_file"), type=["csv", "xlsx", "xls", "zip"], help="200 Mo max")
         fname = st.text_input(_("custom_name"))
         if uploaded and st.button(_("btn_import")):
             internal = slugify(fname) or slugify(Path(uploaded.name).stem)
             if not internal:
                 st.warning(_("warn_valid_name"))
             else:
-                suffix = Path(uploaded.name).suffix or ".csv"
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(uploaded.read())
-                    tmp_path = tmp.name
-                saved = add_one_file(tmp_path, final_name=internal)
-                os.unlink(tmp_path)
+                from import_data import ingest_stream
+
+                # le fichier envoyé est versé bloc par bloc dans le magasin, sans copie temporaire
+                saved = ingest_stream(uploaded, final_name=internal, raw_dir=ws.raw_dir)
                 if saved:
-                    st.session_state.imported_name = Path(saved).name
+                    st.session_state.imported_name = Path(saved["path"]).name
                     st.session_state.step = 1
                     st.rerun()
                 else:
@@ -254,19 +356,17 @@ with tab_import:
     else:
         url = st.text_input(_("url_label"))
         fname = st.text_input(_("custom_name"))
-        if st.button(_("btn_import_url")) and url:
+        if st.session_state.import_job:
+            _follow_job("import_job", _("downloading"), _imported)
+        elif st.button(_("btn_import_url")) and url:
             internal = slugify(fname) or slugify(Path(url.split("?")[0]).stem)
-            saved = add_one_file(url, final_name=internal)
-            if saved:
-                st.session_state.imported_name = Path(saved).name
-                st.session_state.step = 1
-                st.rerun()
-            else:
-                st.error(_("err_import"))
+            _start_job("import_job", "import", _import_url_job, url, internal, ws.raw_dir)
+            st.rerun()
+        _job_message("import_job")
 
     if st.session_state.imported_name:
         st.success(f"{_('file_imported')} {st.session_state.imported_name}")
-        st.download_button(_("download_raw"), open(f"data/raw/{st.session_state.imported_name}", "rb"), file_name=st.session_state.imported_name)
+        st.download_button(_("download_raw"), open(ws.raw_dir / st.session_state.imported_name, "rb"), file_name=st.session_state.imported_name)
         st.info(_("go_clean"))
 
 # ╭──── Nettoyage ───╮
@@ -275,16 +375,23 @@ with tab_clean:
     if step < 1:
         st.warning(_("warn_import_first"))
     else:
-        if st.button(_("btn_clean")):
-            with st.spinner(_("cleaning")):
-                cleaned_path = clean_main()
-            st.session_state.cleaned_name = Path(cleaned_path).name
-            st.session_state.step = 2
+        if st.session_state.clean_job:
+            _follow_job("clean_job", _("cleaning"), _cleaned)
+        elif st.button(_("btn_clean")):
+            _start_job("clean_job", "nettoyage", _clean_job,
+                       ws.raw_dir / st.session_state.imported_name, ws.cleaned_dir)
             st.rerun()
+        _job_message("clean_job")
 
         if st.session_state.cleaned_name:
             st.success(f"{_('clean_done')} {st.session_state.cleaned_name}")
-            st.download_button(_("download_clean"), open(f"data/cleaned/{st.session_state.cleaned_name}", "rb"), file_name=st.session_state.cleaned_name)
+            # Le .xlsx n'est généré que sur demande : le stockage interne reste en Parquet
+            if st.button(_("btn_export_xlsx")):
+                from clean_data import export_excel
+
+                st.session_state.xlsx_name = export_excel(ws.cleaned_dir / st.session_state.cleaned_name).name
+            if st.session_state.xlsx_name:
+                st.download_button(_("download_clean"), open(ws.cleaned_dir / st.session_state.xlsx_name, "rb"), file_name=st.session_state.xlsx_name)
             st.info(_("go_viz"))
 
 # ╭──── Visualisation ───╮
@@ -293,17 +400,37 @@ with tab_viz:
     if step < 2:
         st.warning(_("warn_clean_first"))
     else:
-        cleaned_path = Path("data/cleaned") / st.session_state.cleaned_name
+        cleaned_path = ws.cleaned_dir / st.session_state.cleaned_name
         if cleaned_path.exists():
+            import render_cache
+            from vizualisation import plot_data, load_cleaned_file
+
             st.session_state["__in_streamlit"] = True
-            df = load_cleaned_file(cleaned_path.stem.replace("_cleaned", ""))
+            df = load_cleaned_file(cleaned_path.stem.replace("_cleaned", ""), cleaned_dir=ws.cleaned_dir)
             if df is not None:
                 st.sidebar.info(_("sidebar_graph"))
-                fig = plot_data(df)
-                if fig is not None:
-                    buf = BytesIO()
-                    fig.savefig(buf, format="png", dpi=300)
-                    st.download_button(_("btn_viz_dl"), data=buf.getvalue(), file_name="graphique.png", mime="image/png")
+                plot = plot_data(df)
+                if plot is not None:
+                    # Export 300 dpi seulement sur demande, encodé en arrière-plan puis gardé en cache
+                    fmt = st.selectbox(_("export_fmt"), list(render_cache.EXPORT_FORMATS), format_func=str.upper)
+                    data = render_cache.cached(plot, fmt)
+                    export = st.session_state.export_job
+                    if export is not None and (export[0] != (plot.key, fmt) or export[1].done()):
+                        st.session_state.export_job = None  # autre graphique / format, ou export prêt
+                        if export[0] == (plot.key, fmt) and data is None:
+                            try:
+                                data = export[1].result()
+                            except Exception as e:
+                                st.error(f"{_('job_failed')} {e}")
+                    if data is None:
+                        if st.session_state.export_job is not None:
+                            _follow_export()
+                        elif st.button(_("btn_viz_export")):
+                            st.session_state.export_job = ((plot.key, fmt), render_cache.export(plot, fmt))
+                            st.rerun()
+                    if data is not None:
+                        st.download_button(_("btn_viz_dl"), data=data, file_name=f"graphique.{fmt}",
+                                           mime=render_cache.EXPORT_FORMATS[fmt])
             else:
                 st.error(_("err_load_clean"))
         else:
@@ -0,0 +1,201 @@
+"""workspace.py
+
+Espaces de travail isolés, écritures atomiques et verrous de fichiers.
+
+Plusieurs sessions Streamlit (ou un lot `batch_clean` et l'interface)
+travaillent en même temps sur le même serveur :
+    • chaque session reçoit son propre dossier
+      `data/workspaces/<id>/{raw,cleaned}` : deux utilisateurs qui importent
+      un fichier du même nom ne se marchent plus dessus, et le chemin du
+      brut est passé explicitement au nettoyage ;
+    • `atomic_write(path)` fait écrire dans un fichier temporaire voisin,
+      renommé d'un coup (`os.replace`) une fois complet : un lecteur voit
+      l'ancienne version ou la nouvelle, jamais un fichier à moitié écrit ;
+    • `file_lock(path)` sérialise les écrivains d'un même nom partagé,
+      entre threads et entre processus (verrou système sur le fichier
+      `.<nom>.lock`, levé d'office si son propriétaire meurt).
+
+Le magasin d'objets de `raw_store` reste commun : un même contenu importé
+dans deux espaces n'est stocké qu'une fois.
+
+    ws = Workspace.create()
+    with atomic_write(ws.cleaned_dir / "data_18_cleaned.parquet") as tmp:
+        df.to_parquet(tmp)
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+WORKSPACES_DIR = Path("data/workspaces")
+WORKSPACE_TTL_S = 24 * 3600   # un espace inutilisé depuis plus longtemps est supprimé par `prune`
+LOCK_POLL_S = 0.01
+
+_thread_locks: dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+# ─────────────────────────── Espaces ──────────────────────────────
+
+@dataclass(frozen=True)
+class Workspace:
+    root: Path
+
+    @property
+    def raw_dir(self) -> Path:
+        return self.root / "raw"
+
+    @property
+    def cleaned_dir(self) -> Path:
+        return self.root / "cleaned"
+
+    @classmethod
+    def create(cls, name: str | None = None, base: str | Path = WORKSPACES_DIR) -> "Workspace":
+        """Espace `name` (nouvel identifiant aléatoire par défaut), dossiers créés."""
+        ws = cls(Path(base) / (name or uuid.uuid4().hex[:16]))
+        ws.ensure()
+        return ws
+
+    def ensure(self) -> "Workspace":
+        """Crée les dossiers s'ils manquent et note l'utilisation (pour `prune`)."""
+        for d in (self.raw_dir, self.cleaned_dir):
+            d.mkdir(parents=True, exist_ok=True)
+        os.utime(self.root)
+        return self
+
+
+def prune(base: str | Path = WORKSPACES_DIR, ttl_s: float = WORKSPACE_TTL_S) -> int:
+    """Supprime les espaces inutilisés depuis `ttl_s` secondes ; retourne leur nombre."""
+    base = Path(base)
+    if not base.is_dir():
+        return 0
+    removed = 0
+    limit = time.time() - ttl_s
+    for root in base.iterdir():
+        try:
+            if root.is_dir() and root.stat().st_mtime < limit:
+                shutil.rmtree(root, ignore_errors=True)
+                removed += 1
+        except FileNotFoundError:
+            continue  # supprimé en parallèle
+    return removed
+
+# ─────────────────────────── Écritures ────────────────────────────
+
+def temp_path(path: str | Path) -> Path:
+    """Fichier temporaire voisin de `path`, propre au processus et au thread.
+
+    L'extension est conservée (pandas choisit le moteur Excel d'après elle).
+    """
+    path = Path(path)
+    token = f"{os.getpid()}.{threading.get_ident()}"
+    return path.with_name(f".{path.stem}.{token}.tmp{path.suffix}")
+
+
+@contextmanager
+def atomic_write(path: str | Path) -> Iterator[Path]:
+    """Donne un chemin temporaire à remplir ; `path` n'est remplacé qu'en cas de succès."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+# ─────────────────────────── Verrous ──────────────────────────────
+
+def lock_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.lock")
+
+
+def _try_lock(fd: int) -> bool:
+    """Verrou exclusif non bloquant sur `fd`, levé par le système à la mort du processus."""
+    try:
+        if os.name == "nt":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:  # BlockingIOError (POSIX), PermissionError (Windows)
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _same_file(fd: int, path: Path) -> bool:
+    """Le fichier verrouillé est-il toujours celui qui porte le nom `path` ?
+
+    Un propriétaire supprime le fichier en libérant le verrou : un autre
+    processus a pu verrouiller l'ancien fichier, désormais sans nom.
+    """
+    if os.name == "nt":  # un fichier ouvert ne peut pas y être supprimé
+        return True
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    own = os.fstat(fd)
+    return (st.st_dev, st.st_ino) == (own.st_dev, own.st_ino)
+
+
+@contextmanager
+def file_lock(path: str | Path, *, timeout: float | None = None):
+    """Verrou exclusif sur `path`, valable entre threads et entre processus.
+
+    Le verrou est posé par le système (`fcntl.flock`, `msvcrt.locking` sous
+    Windows) sur le fichier `.<nom>.lock` voisin, qui contient le pid du
+    propriétaire pour information : le système le lève si le processus
+    meurt, aucun verrou abandonné n'est donc à « reprendre ». `timeout`
+    (secondes) : TimeoutError si le verrou n'est pas obtenu à temps ; None
+    attend indéfiniment.
+    """
+    lock = lock_path(path)
+    with _registry_lock:
+        thread_lock = _thread_locks.setdefault(str(lock.resolve()), threading.Lock())
+    if not thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+        raise TimeoutError(f"Verrou occupé : {lock}")
+    try:
+        lock.parent.mkdir(parents=True, exist_ok=True)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            fd = os.open(lock, os.O_CREAT | os.O_RDWR)
+            if _try_lock(fd):
+                if _same_file(fd, lock):
+                    break
+                _unlock(fd)  # fichier supprimé entre-temps : on recommence sur le nouveau
+            os.close(fd)
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Verrou occupé : {lock}")
+            time.sleep(LOCK_POLL_S)
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            yield lock
+        finally:
+            if os.name != "nt":
+                lock.unlink(missing_ok=True)  # encore verrouillé : personne ne l'a repris
+            _unlock(fd)
+            os.close(fd)
+    finally:
+        thread_lock.release()